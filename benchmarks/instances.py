@@ -0,0 +1,90 @@
+# -*- coding:utf-8 -*-
+
+"""
+    Benchmark instances: random Euclidean instances and TSPLIB files.
+
+    Distances follow TSPLIB conventions (see ``or_testbed.entities.metrics``), rounded to integers so results can be compared with published optima.
+    Coordinate based instances are either compiled into a dense matrix or, if ``lazy``, kept as coordinates whose distances are computed when needed.
+"""
+
+import random
+from or_testbed.entities.metrics import metrics
+from .tsp import TSPInstance, TSPCoordinateInstance
+
+
+def from_coordinates(name, coordinates, metric='EUC_2D', lazy=False):
+    """
+        Builds a TSP instance from a list of node coordinates.
+    """
+    if lazy:
+        return TSPCoordinateInstance(name, coordinates, metric)
+    distance = metrics[metric]
+    return TSPInstance(name, [[distance(a, b) for b in coordinates] for a in coordinates])
+
+
+def random_euclidean(size, seed=0, side=1000, lazy=False):
+    """
+        Random instance with ``size`` nodes uniformly placed in a square, the same seed always gives the same instance.
+    """
+    rng = random.Random(seed)
+    coordinates = [(rng.uniform(0, side), rng.uniform(0, side)) for _ in range(size)]
+    return from_coordinates('random{}-{}'.format(size, seed), coordinates, lazy=lazy)
+
+
+def _read_tsplib(path):
+    """
+        Splits a TSPLIB file into its specification (a dict of keywords) and the tokens of each data section.
+    """
+    spec, sections, current = {}, {}, None
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line == 'EOF':
+                continue
+            keyword = line.split(':', 1)[0].strip().upper()
+            if keyword.endswith('_SECTION'):
+                current = sections.setdefault(keyword, [])
+            elif ':' in line and not line[0].isdigit() and not line[0] == '-':
+                spec[keyword] = line.split(':', 1)[1].strip()
+                current = None
+            elif current is not None:
+                current.extend(line.split())
+    return spec, sections
+
+
+def _explicit_rows(size, weights, layout):
+    matrix = [[0] * size for _ in range(size)]
+    if layout == 'FULL_MATRIX':
+        cells = ((i, j) for i in range(size) for j in range(size))
+    elif layout == 'UPPER_ROW':
+        cells = ((i, j) for i in range(size) for j in range(i + 1, size))
+    elif layout == 'LOWER_DIAG_ROW':
+        cells = ((i, j) for i in range(size) for j in range(i + 1))
+    elif layout == 'UPPER_DIAG_ROW':
+        cells = ((i, j) for i in range(size) for j in range(i, size))
+    else:
+        raise ValueError('Unsupported EDGE_WEIGHT_FORMAT: {}'.format(layout))
+
+    for (i, j), weight in zip(cells, weights):
+        matrix[i][j] = matrix[j][i] = float(weight)
+    return matrix
+
+
+def load_tsplib(path, lazy=False):
+    """
+        Loads a symmetric TSPLIB instance, either with node coordinates (EUC_2D, CEIL_2D, ATT, GEO) or with explicit edge weights.
+    """
+    spec, sections = _read_tsplib(path)
+    name = spec.get('NAME', path)
+    size = int(spec['DIMENSION'])
+    weight_type = spec.get('EDGE_WEIGHT_TYPE', 'EUC_2D').upper()
+
+    if weight_type == 'EXPLICIT':
+        layout = spec.get('EDGE_WEIGHT_FORMAT', 'FULL_MATRIX').upper()
+        return TSPInstance(name, _explicit_rows(size, sections['EDGE_WEIGHT_SECTION'], layout))
+
+    if weight_type not in metrics:
+        raise ValueError('Unsupported EDGE_WEIGHT_TYPE: {}'.format(weight_type))
+    tokens = sections['NODE_COORD_SECTION']
+    coordinates = [(float(tokens[i + 1]), float(tokens[i + 2])) for i in range(0, 3 * size, 3)]
+    return from_coordinates(name, coordinates, weight_type, lazy)
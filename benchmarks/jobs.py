@@ -0,0 +1,46 @@
+# -*- coding:utf-8 -*-
+
+"""
+    Builders of benchmark jobs for the execution service (see ``or_testbed.service``), so benchmark cases can be solved by a running service::
+
+        python -m or_testbed.service --workers 4 --preload benchmarks.jobs --builders benchmarks.jobs:build_solver \\
+            --loaders benchmarks.jobs:random_instance benchmarks.jobs:tsplib_instance
+
+    with jobs like::
+
+        {"builder": "benchmarks.jobs:build_solver", "instance": {"loader": "benchmarks.jobs:random_instance", "kwargs": {"size": 200}},
+         "params": {"solver": "multistart-tabu", "starts": 8}, "seed": 12345}
+"""
+
+from . import instances
+from .run import SOLVERS, _make_solver, parse_args
+
+
+def random_instance(size, seed=0, lazy=False):
+    """
+        Instance loader of random Euclidean instances.
+    """
+    return instances.random_euclidean(size, seed=seed, lazy=lazy)
+
+
+def tsplib_instance(path, lazy=False):
+    """
+        Instance loader of TSPLIB files.
+    """
+    return instances.load_tsplib(path, lazy=lazy)
+
+
+def build_solver(instance, seed, solver='simanneal', **params):
+    """
+        Builds a benchmark solver. Parameters are the options of ``benchmarks.run`` (with underscores), and take its defaults.
+    """
+    if solver not in SOLVERS:
+        raise ValueError('Unknown solver {}'.format(solver))
+    args = parse_args([])
+    for name, value in params.items():
+        if not hasattr(args, name):
+            raise ValueError('Unknown parameter {}'.format(name))
+        setattr(args, name, value)
+    if seed is not None:
+        args.seed = seed
+    return _make_solver(solver, instance, args)
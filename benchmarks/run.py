@@ -0,0 +1,199 @@
+# -*- coding:utf-8 -*-
+
+"""
+    Benchmark runner.
+
+    Runs GRASP, Simulated Annealing and Tabu Search (single and multistart) and parallel tempering over generated and TSPLIB instances, with fixed seeds, and reports the results as JSON.
+    Each case runs in a fresh process, so peak memory is measured on its own and no state leaks from one case to the next.
+
+    Usage (from the repository root)::
+
+        python -m benchmarks.run --sizes 50 200 1000 --tsplib path/to/berlin52.tsp --output results.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import or_testbed.solvers.grasp as grasp
+from or_testbed.solvers.pathrelinking import PathRelinking
+import or_testbed.solvers.simanneal as simanneal
+import or_testbed.solvers.tabusearch as tabusearch
+from . import instances
+from .tsp import TSPSolution, TSPGraspMove, SwapCitiesMove, GranularSwapMove
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+SOLVERS = ['grasp', 'simanneal', 'tabu', 'multistart-grasp', 'multistart-simanneal', 'multistart-tabu', 'tempering']
+
+
+def _initial_solution(instance, seed):
+    """
+        Greedy solution (GRASP with alpha 0) where trajectory solvers start from. The seed breaks ties.
+    """
+    solver = grasp.GraspConstruct(instance, alpha=0.0, solution_factory=TSPSolution.as_factory(), grasp_move=TSPGraspMove, debug=False, rng=seed)
+    return solver.solve().solution
+
+
+def _make_solver(name, instance, args):
+    common = {'instance': instance, 'debug': False, 'instrument': True}
+    if args.granular:
+        instance.granularity = args.granular
+        swap_move = GranularSwapMove
+    else:
+        swap_move = SwapCitiesMove
+    if name == 'tempering':
+        # One replica per start, each one running as many steps as a simulated annealing chain
+        steps = int(math.ceil(math.log(args.min_temp / args.max_temp) / math.log(args.cooling)))
+        temperatures = simanneal.ParallelTempering.geometric_temperatures(args.max_temp, args.min_temp, args.starts)
+        return simanneal.ParallelTempering(initial_solution=_initial_solution(instance, args.seed), available_movs=[swap_move], movs_weight=[1], temperatures=temperatures,
+                                           rounds=max(1, steps // args.exchange_steps), steps=args.exchange_steps, workers=args.workers, rng=args.seed, **common)
+    if name.endswith('grasp'):
+        factory = grasp.GraspConstruct.as_factory(solution_factory=TSPSolution.as_factory(), grasp_move=TSPGraspMove, alpha=args.alpha,
+                                                  incremental=args.incremental, **common)
+        multistart = grasp.ReactiveGraspConstruct if args.reactive else grasp.MultiStartGraspConstruct
+    elif name.endswith('simanneal'):
+        factory = simanneal.SimAnneal.as_factory(initial_solution=_initial_solution(instance, args.seed), available_movs=[swap_move], movs_weight=[1],
+                                                 max_temp=args.max_temp, min_temp=args.min_temp, alpha=args.cooling, **common)
+        multistart = simanneal.MultiStartSimAnneal
+    else:
+        factory = tabusearch.TabuSearch.as_factory(initial_solution=_initial_solution(instance, args.seed), available_movs=[swap_move], movs_weight=[1],
+                                                   iters=args.tabu_iters, tabu_tenure=args.tabu_tenure, candidate_selection=args.selection, **common)
+        multistart = tabusearch.MultiStartTabuSearch
+
+    if not name.startswith('multistart'):
+        return factory(rng=args.seed)
+    solver = multistart(args.starts, factory, debug=False)
+    solver.instrument = True
+    solver.workers = args.workers
+    solver.rng = random.Random(args.seed)
+    if args.relink:
+        solver.relinking = PathRelinking(instance, swap_move, pool_size=args.relink)
+    return solver
+
+
+def _peak_memory_kb():
+    if resource is None:
+        return None
+    # Multistart workers are children of the case process
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_case(case):
+    """
+        Runs a single benchmark case, this is what each child process does.
+
+    :param case: Dict with the instance to load, the solver and the arguments.
+    :return: Dict with the results.
+    """
+    args = argparse.Namespace(**case['args'])
+    if case['tsplib']:
+        instance = instances.load_tsplib(case['tsplib'], lazy=args.lazy)
+    else:
+        instance = instances.random_euclidean(case['size'], seed=case['instance_seed'], lazy=args.lazy)
+    if args.shared and not args.lazy:
+        # Workers attach to the matrix instead of receiving a copy
+        instance.share()
+
+    solver = _make_solver(case['solver'], instance, args)
+    task = solver.solve()
+
+    counters = task.stats.counters
+    evaluations = counters.get('fitness_evaluations', 0) + counters.get('sampled_candidates', 0)
+    return {
+        'instance': instance.name,
+        'size': instance.size,
+        'solver': case['solver'],
+        'seed': args.seed,
+        'objective': float(task.solution.objective) if task.is_feasible else None,
+        'feasible': task.is_feasible,
+        'time': task.time,
+        'time_to_best': task.stats.marks.get('best', 0.0),
+        'evaluations': evaluations,
+        'evaluations_per_second': evaluations / task.time if task.time > 0 else None,
+        'peak_memory_kb': _peak_memory_kb(),
+        'stats': task.stats.to_dict(),
+        # Lookups of this process only, multistart workers fill their own caches
+        'distance_cache': instance.cache_info() if hasattr(instance, 'cache_info') else None,
+        'alpha_uses': dict(zip(solver.alphas, solver.uses)) if isinstance(solver, grasp.ReactiveGraspConstruct) else None,
+    }
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='OR-Testbed TSP benchmarks.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[50, 200, 1000], help='Sizes of the generated random Euclidean instances (50 to 5000 nodes).')
+    parser.add_argument('--instance-seed', type=int, default=0, help='Seed of the generated instances.')
+    parser.add_argument('--tsplib', nargs='*', default=[], help='TSPLIB files to load.')
+    parser.add_argument('--granular', type=int, default=None, metavar='K', help='Restrict swaps to each city and its K nearest neighbors.')
+    parser.add_argument('--lazy', action='store_true', help='Compute distances from coordinates when needed instead of building the distance matrix.')
+    parser.add_argument('--shared', action='store_true', help='Keep the distance matrix in shared memory, so worker processes attach to it instead of copying it.')
+    parser.add_argument('--solvers', nargs='*', default=SOLVERS, choices=SOLVERS)
+    parser.add_argument('--relink', type=int, default=None, metavar='POOL', help='Relink the solutions of multistart solvers, keeping an elite pool of POOL tours.')
+    parser.add_argument('--seed', type=int, default=12345, help='Seed of the solvers, multistart solvers derive the seed of every start from it.')
+    parser.add_argument('--starts', type=int, default=5, help='Starts of multistart solvers.')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes of multistart solvers.')
+    parser.add_argument('--incremental', action='store_true', help='Keep GRASP candidates between insertions instead of rebuilding them.')
+    parser.add_argument('--reactive', action='store_true', help='Run multistart GRASP as reactive GRASP, which adapts alpha instead of using --alpha.')
+    parser.add_argument('--alpha', type=float, default=0.2, help='GRASP alpha.')
+    parser.add_argument('--max-temp', type=float, default=100.0)
+    parser.add_argument('--min-temp', type=float, default=0.01)
+    parser.add_argument('--cooling', type=float, default=0.999)
+    parser.add_argument('--exchange-steps', type=int, default=100, help='Steps of parallel tempering replicas between exchanges.')
+    parser.add_argument('--tabu-iters', type=int, default=20)
+    parser.add_argument('--tabu-tenure', type=int, default=10)
+    parser.add_argument('--selection', default='best', help='Candidate selection strategy of tabu search.')
+    parser.add_argument('--output', default=None, help='File to write the JSON report to, standard output by default.')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    solver_args = {k: v for k, v in vars(args).items() if k not in ('sizes', 'tsplib', 'solvers', 'output')}
+    cases = [{'size': size, 'tsplib': None, 'instance_seed': args.instance_seed, 'solver': solver, 'args': solver_args} for size in args.sizes for solver in args.solvers]
+    cases += [{'size': None, 'tsplib': path, 'instance_seed': None, 'solver': solver, 'args': solver_args} for path in args.tsplib for solver in args.solvers]
+
+    results = []
+    for case in cases:
+        # A fresh process per case, so peak memory belongs to that case only
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(run_case, case).result()
+        print('{instance} {solver}: objective {objective}, {time:.3f}s'.format(**result), file=sys.stderr)
+        results.append(result)
+
+    report = {
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'arguments': vars(args),
+        'results': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+# -*- coding:utf-8 -*-
+
+"""
+    TSP definition used by the benchmarks.
+
+    Unlike the examples, cities are integer indices over a MatrixInstance (or a CoordinateInstance) and solutions are permutations, so every candidate is evaluated
+    incrementally.
+    Swaps are also evaluated in batch with NumPy when it is available.
+"""
+
+import itertools
+import or_testbed.entities.instance as base_instance
+import or_testbed.entities.permutation as base_permutation
+import or_testbed.entities.candidate as base_candidate
+import or_testbed.entities.move as base_move
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TSPInstance(base_instance.MatrixInstance):
+    """
+        The salesman starts (and finishes) in the first city.
+    """
+    initial_city = 0
+
+
+class TSPCoordinateInstance(base_instance.CoordinateInstance):
+    """
+        Same as TSPInstance, but distances are computed from the coordinates of the cities when needed.
+    """
+    initial_city = 0
+
+
+class TSPSolution(base_permutation.PermutationSolution):
+    def __init__(self, initial_city=TSPInstance.initial_city):
+        super().__init__([initial_city])
+
+    def is_feasible(self, in_instance):
+        predicates = [
+            len(self.sequence) == in_instance.size,
+            set(self.sequence) == set(range(in_instance.size)),
+            self.sequence[0] == in_instance.initial_city,
+        ]
+        return all(predicates)
+
+    def calculate_objective(self, in_instance):
+        # Each city is paired with the previous one, like in the examples
+        sequence = self.sequence
+        return sum(in_instance.distance(a, b) for a, b in zip(sequence, sequence[-1:] + sequence[:-1]))
+
+
+class TSPGraspCandidate(base_candidate.Candidate):
+    def __init__(self, city):
+        self.city = city
+
+    def fitness(self, solution, instance):
+        return instance.distance(solution.sequence[-1], self.city)
+
+    def delta(self, solution, instance):
+        first, last = solution.sequence[0], solution.sequence[-1]
+        retval = instance.distance(self.city, last) + instance.distance(first, self.city)
+        if len(solution) > 1:
+            retval -= instance.distance(first, last)
+        return retval
+
+
+class TSPGraspMove(base_move.Move):
+    @staticmethod
+    def make_neighborhood(solution, instance):
+        return [TSPGraspCandidate(city=c) for c in range(instance.size) if c not in solution]
+
+    @staticmethod
+    def apply(in_candidate, in_solution):
+        in_solution.append(in_candidate.city)
+        return in_solution
+
+    @staticmethod
+    def update_neighborhood(candidates, applied, solution, instance):
+        # The new city is no longer available, and every cost depends on the last city visited
+        return [applied], None
+
+
+def swap_delta(sequence, p, q, instance):
+    """
+        Objective difference of swapping the cities in positions ``p`` and ``q``. Only the edges touching them change.
+    """
+    n = len(sequence)
+    edges = {(i % n, (i - 1) % n) for c in (p, q) for i in (c, c + 1)}
+    swapped = {p: sequence[q], q: sequence[p]}
+
+    retval = 0
+    for a, b in edges:
+        retval += instance.distance(swapped.get(a, sequence[a]), swapped.get(b, sequence[b])) - instance.distance(sequence[a], sequence[b])
+    return retval
+
+
+class SwapCitiesCandidate(base_candidate.Candidate):
+    tabu_attributes = ('city1', 'city2')
+
+    def __init__(self, city1, city2):
+        self.city1 = city1
+        self.city2 = city2
+
+    def fitness(self, solution, instance):
+        return -self.delta(solution, instance)
+
+    def delta(self, solution, instance):
+        return swap_delta(solution.sequence, solution.position(self.city1), solution.position(self.city2), instance)
+
+
+# Pairs of cities to swap, as NumPy arrays, for each instance size
+_swap_pairs = {}
+
+
+def _pairs(size):
+    if size not in _swap_pairs:
+        first, second = numpy.triu_indices(size, k=1)
+        # Initial city never moves
+        keep = first != TSPInstance.initial_city
+        _swap_pairs[size] = (first[keep], second[keep])
+    return _swap_pairs[size]
+
+
+def _swap_fitness(solution, instance, first, second):
+    """
+        Fitness of swapping every pair of cities ``(first[i], second[i])``, computed with NumPy.
+    """
+    sequence = numpy.asarray(solution.sequence)
+    n = len(sequence)
+    positions = numpy.empty(n, dtype=numpy.intp)
+    positions[sequence] = numpy.arange(n)
+
+    def dist(i, j):
+        # Distance between the cities visited in positions i and j
+        return instance.distances(sequence[i % n], sequence[j % n])
+
+    p = numpy.minimum(positions[first], positions[second])
+    q = numpy.maximum(positions[first], positions[second])
+
+    # Adjacent positions share one edge, that only gets reversed.
+    adjacent = q == p + 1
+    before = dist(p, p - 1) + dist(q, q - 1) + dist(q + 1, q) + numpy.where(adjacent, 0, dist(p + 1, p))
+    after = dist(q, p - 1) + dist(p, q - 1) + dist(q + 1, p) + numpy.where(adjacent, 0, dist(p + 1, q))
+    after = numpy.where(adjacent, dist(q, p - 1) + dist(p, q) + dist(q + 1, p), after)
+    return before - after
+
+
+class SwapCitiesMove(base_move.Move):
+    @staticmethod
+    def make_neighborhood(solution, instance):
+        swaps = itertools.combinations(range(1, instance.size), 2)
+        return (SwapCitiesCandidate(city1=a, city2=b) for a, b in swaps)
+
+    @staticmethod
+    def relink_neighborhood(solution, guide, instance):
+        # Swapping a city with the one the guide visits in its position puts the latter in place
+        return [SwapCitiesCandidate(city1=a, city2=b) for a, b in zip(solution.sequence, guide.sequence) if a != b]
+
+    @staticmethod
+    def sample_candidate(solution, instance, rng):
+        p, q = rng.sample(range(1, len(solution)), 2)
+        return SwapCitiesCandidate(city1=solution.sequence[p], city2=solution.sequence[q])
+
+    @staticmethod
+    def batch_fitness(solution, instance):
+        if numpy is None:
+            return None
+        first, second = _pairs(len(solution))
+        return _swap_fitness(solution, instance, first, second)
+
+    @staticmethod
+    def batch_candidate(solution, instance, index):
+        first, second = _pairs(instance.size)
+        return SwapCitiesCandidate(city1=int(first[index]), city2=int(second[index]))
+
+    @staticmethod
+    def apply(in_candidate, in_solution):
+        in_solution.swap_elements(in_candidate.city1, in_candidate.city2)
+        return in_solution
+
+
+class GranularSwapMove(SwapCitiesMove):
+    """
+        Swaps restricted to pairs of near cities: one of them must be among the ``instance.granularity`` nearest neighbors of the other.
+        Neighborhoods have O(n·k) candidates instead of O(n²).
+    """
+    @staticmethod
+    def swaps(instance):
+        return instance.neighbor_lists(instance.granularity).pairs(exclude=(instance.initial_city,))
+
+    @staticmethod
+    def make_neighborhood(solution, instance):
+        first, second = GranularSwapMove.swaps(instance)
+        return (SwapCitiesCandidate(city1=int(a), city2=int(b)) for a, b in zip(first, second))
+
+    @staticmethod
+    def sample_candidate(solution, instance, rng):
+        first, second = GranularSwapMove.swaps(instance)
+        index = rng.randrange(len(first))
+        return SwapCitiesCandidate(city1=int(first[index]), city2=int(second[index]))
+
+    @staticmethod
+    def batch_fitness(solution, instance):
+        if numpy is None:
+            return None
+        first, second = GranularSwapMove.swaps(instance)
+        return _swap_fitness(solution, instance, first, second)
+
+    @staticmethod
+    def batch_candidate(solution, instance, index):
+        first, second = GranularSwapMove.swaps(instance)
+        return SwapCitiesCandidate(city1=int(first[index]), city2=int(second[index]))
@@ -5,24 +5,61 @@
 
 """
 
-import or_testbed.entities.solution as base_solution
+import or_testbed.entities.permutation as base_permutation
 import or_testbed.entities.instance as base_instance
 import or_testbed.entities.candidate as base_candidate
 import or_testbed.entities.move as base_move
 import itertools
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TSPInstance(base_instance.Instance):
     def __init__(self, name, data, initial_city):
         super().__init__(name, data)
         self.initial_city = initial_city
+        self._arrays = None
+
+    @base_instance.Instance.data.setter
+    def data(self, in_data):
+        self._data = in_data
+        self._arrays = None
 
+    def swap_arrays(self):
+        """
+            NumPy view of the instance used to evaluate swaps in batch: the index of every city, the distance matrix between them and the pairs of cities
+            (as indices) that SwapCitiesMove swaps. They are built once per instance instead of once per neighborhood.
+        """
+        if self._arrays is None:
+            labels = list(self.data.keys())
+            index = {label: i for i, label in enumerate(labels)}
+            matrix = numpy.array([[self.data[a].get(b, 0) for b in labels] for a in labels])
+            pairs = numpy.array([(index[a], index[b]) for a, b in SwapCitiesMove.swaps(self)], dtype=numpy.intp).reshape(-1, 2)
+            self._arrays = index, matrix, pairs
+        return self._arrays
 
-class TSPSolution(base_solution.Solution):
+
+class TSPSolution(base_permutation.PermutationSolution):
     def __init__(self, initial_city):
-        super().__init__()
+        super().__init__([initial_city])
         self.initial_city = initial_city
-        self.cities = [initial_city]
+
+    @property
+    def cities(self):
+        return self.sequence
+
+    @cities.setter
+    def cities(self, in_cities):
+        self.set_sequence(in_cities)
+
+    def to_dict(self):
+        """
+            Keeps the format of plain TSP solutions: the tour is stored as ``cities``.
+        """
+        return {'objective': self.objective, 'initial_city': self.initial_city, 'cities': list(self.cities)}
 
     def is_feasible(self, in_instance):
         """
@@ -47,24 +84,34 @@ class SwapCitiesCandidate(base_candidate.Candidate):
         This candidate is related to thw swapping cities move, basically it stores the cities to swap.
     """
 
+    tabu_attributes = ('city1', 'city2')
+
     def __init__(self, city1, city2):
         self.city1 = city1
         self.city2 = city2
 
     def fitness(self, solution, instance):
         """
-            Here fitness is calculated by making the actual move, then reverting it. Kind of a hack I know.
+            Fitness is the improvement of the objective value, that is, the opposite of its delta.
         """
-        c1 = solution.cities.index(self.city1)
-        c2 = solution.cities.index(self.city2)
+        return -self.delta(solution, instance)
 
-        obj_before = solution.objective
-
-        solution.cities[c1], solution.cities[c2] = solution.cities[c2], solution.cities[c1]
-        obj_after = solution.calculate_objective(instance)
-        solution.cities[c2], solution.cities[c1] = solution.cities[c1], solution.cities[c2]
-
-        retval = obj_before - obj_after
+    def delta(self, solution, instance):
+        """
+            Swapping two cities only changes the edges that touch them, so there is no need to compute the whole trip again.
+        """
+        cities = solution.cities
+        n = len(cities)
+        c1 = solution.position(self.city1)
+        c2 = solution.position(self.city2)
+
+        # Edges are stored as (position, previous position), just like in calculate_objective
+        edges = {(i % n, (i - 1) % n) for c in (c1, c2) for i in (c, c + 1)}
+        swapped = {c1: self.city2, c2: self.city1}
+
+        retval = 0
+        for a, b in edges:
+            retval += instance.data[swapped.get(a, cities[a])][swapped.get(b, cities[b])] - instance.data[cities[a]][cities[b]]
         return retval
 
 
@@ -75,20 +122,61 @@ class SwapCitiesMove(base_move.Move):
     """
 
     @staticmethod
-    def make_neighborhood(solution, instance):
+    def swaps(instance):
         # Cartesian Product
         swaps = itertools.combinations(instance.data.keys(), 2)
         # Filter to avoid moving initial city
-        swaps = filter(lambda x: x[0] != instance.initial_city and x[1] != instance.initial_city, swaps)
-        # Return list of candidates
-        return [SwapCitiesCandidate(city1=s[0], city2=s[1]) for s in swaps]
+        return filter(lambda x: x[0] != instance.initial_city and x[1] != instance.initial_city, swaps)
 
     @staticmethod
-    def apply(in_candidate, in_solution):
-        first_city = in_solution.cities.index(in_candidate.city1)
-        second_city = in_solution.cities.index(in_candidate.city2)
+    def make_neighborhood(solution, instance):
+        # Return candidates lazily, they are built only when the selection strategy asks for them
+        return (SwapCitiesCandidate(city1=s[0], city2=s[1]) for s in SwapCitiesMove.swaps(instance))
+
+    @staticmethod
+    def relink_neighborhood(solution, guide, instance):
+        # Swapping a city with the one the guide visits in its position puts the latter in place
+        return [SwapCitiesCandidate(city1=a, city2=b) for a, b in zip(solution.cities, guide.cities) if a != b]
+
+    @staticmethod
+    def batch_fitness(solution, instance):
+        """
+            Fitness of every swap at once, computed with NumPy over the pairs of positions to swap. Without NumPy candidates are just evaluated one by one.
+        """
+        if numpy is None:
+            return None
+
+        cities = solution.cities
+        n = len(cities)
+        index, matrix, pairs = instance.swap_arrays()
+        # order[i] is the city visited in position i and position[c] the position of city c, both as indices of the distance matrix
+        order = numpy.fromiter((index[c] for c in cities), dtype=numpy.intp, count=n)
+        position = numpy.empty(len(index), dtype=numpy.intp)
+        position[order] = numpy.arange(n)
+        swapped = position[pairs]
+        p, q = swapped.min(axis=1), swapped.max(axis=1)
+        prev_p, next_q = p - 1, (q + 1) % n
+
+        def dist(i, j):
+            # Distance between the cities visited in positions i and j
+            return matrix[order[i], order[j]]
+
+        # Edges are (position, previous position), as in calculate_objective. Adjacent positions share one edge, that only gets reversed.
+        adjacent = q == p + 1
+        before = dist(p, prev_p) + dist(q, q - 1) + dist(next_q, q) + numpy.where(adjacent, 0, dist(p + 1, p))
+        after = dist(q, prev_p) + dist(p, q - 1) + dist(next_q, p) + numpy.where(adjacent, 0, dist(p + 1, q))
+        after = numpy.where(adjacent, dist(q, prev_p) + dist(p, q) + dist(next_q, p), after)
+        return before - after
 
-        in_solution.cities[first_city], in_solution.cities[second_city] = in_solution.cities[second_city], in_solution.cities[first_city]
+    @staticmethod
+    def sample_candidate(solution, instance, rng):
+        # Draw two positions (but the initial one) instead of building the whole neighborhood
+        c1, c2 = rng.sample(range(1, len(solution.cities)), 2)
+        return SwapCitiesCandidate(city1=solution.cities[c1], city2=solution.cities[c2])
+
+    @staticmethod
+    def apply(in_candidate, in_solution):
+        in_solution.swap_elements(in_candidate.city1, in_candidate.city2)
         return in_solution
 
 
@@ -19,6 +19,16 @@ class TSPGraspCandidate(base_candidate.Candidate):
         last_visited = solution.cities[-1]
         return instance.data[last_visited][self.city]
 
+    def delta(self, solution, instance):
+        """
+            Appending a city replaces the edge that closes the trip with two new ones.
+        """
+        first, last = solution.cities[0], solution.cities[-1]
+        retval = instance.data[self.city][last] + instance.data[first][self.city]
+        if len(solution.cities) > 1:
+            retval -= instance.data[first][last]
+        return retval
+
 
 class TSPGraspMove(base_move.Move):
     """
@@ -26,13 +36,18 @@ class TSPGraspMove(base_move.Move):
     """
     @staticmethod
     def make_neighborhood(solution, instance):
-        return [TSPGraspCandidate(city=c) for c in instance.data[solution.cities[-1]].keys() if c not in solution.cities]
+        return [TSPGraspCandidate(city=c) for c in instance.data[solution.cities[-1]].keys() if c not in solution]
 
     @staticmethod
     def apply(in_candidate, in_solution):
-        in_solution.cities.append(in_candidate.city)
+        in_solution.append(in_candidate.city)
         return in_solution
 
+    @staticmethod
+    def update_neighborhood(candidates, applied, solution, instance):
+        # The new city is no longer available, and every cost depends on the last city visited
+        return [applied], None
+
 
 def compute_grasp_solution():
     tsp_solution_factory = TSPSolution.as_factory(tsp.initial_city)
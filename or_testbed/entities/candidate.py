@@ -13,8 +13,12 @@ class Candidate(ABC):
     """
         in OR-Testbed a candidate is used to model potential moves in trajectory solvers, such as simulated annealing or tabu search.
         Concrete attributes of a candidate depend on the problem being solved.
+
+        Tabu memories identify candidates by a hashable key, see ``tabu_key``. Problems can set ``tabu_attributes`` to the names of the attributes that make up that key.
     """
 
+    tabu_attributes = None
+
     @abstractmethod
     def fitness(self, solution, instance):
         """
@@ -26,6 +30,28 @@ class Candidate(ABC):
         """
         pass
 
+    def delta(self, solution, instance):
+        """
+            Incremental evaluation of a candidate. It returns how much the objective value of ``solution`` changes if this candidate is applied, without modifying the solution.
+            Solvers use it to update objective values without recomputing them from scratch. By default there is no incremental evaluation, so solvers fall back to ``Solution.update_objective``.
+
+        :param solution: Actual solution that the candidate will modify, its objective value must be up to date.
+        :param instance: Instance being solved, may be needed to check special requirements or data.
+        :return: Difference between the objective after and before applying the candidate, or None if it can not be computed incrementally.
+        """
+        return None
+
+    def tabu_key(self):
+        """
+            Hashable key of the candidate in tabu memories. It is made of the attributes named in ``tabu_attributes`` or, if it is None, of every attribute.
+            Either way, those attributes must be hashable. Override this method for more complex keys (for example, to make a swap of two cities symmetric).
+
+        :return: A hashable object.
+        """
+        if self.tabu_attributes is not None:
+            return tuple(getattr(self, attr) for attr in self.tabu_attributes)
+        return tuple(sorted(self.__dict__.items()))
+
     def __eq__(self, other):
         """
             Determine if two candidates are equal based on values of their attributes. All attributes must be hashable, otherwise comparison using __dict__ won't be possible.
@@ -1,6 +1,27 @@
 # -*- coding:utf-8 -*-
 
+import functools
+import hashlib
 import json
+import mmap
+import os
+import struct
+import sys
+import weakref
+from array import array
+import or_testbed.entities.metrics as base_metrics
+from or_testbed.entities.neighbors import NeighborListsMixin
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:
+    # Shared memory instances need Python 3.8 or later
+    resource_tracker = shared_memory = None
 
 
 class Instance:
@@ -57,3 +78,663 @@ class Instance:
         """
         with open(path, 'r') as f:
             self.data = json.load(f)
+
+
+# Binary matrix format: header, labels as UTF-8 JSON, then the matrix as little-endian float64 values in row-major order, aligned to BINARY_ALIGNMENT bytes.
+BINARY_MAGIC = b'ORTBMTX\0'
+BINARY_VERSION = 1
+BINARY_ALIGNMENT = 64
+# Magic, version, reserved, number of elements and length of the labels
+_BINARY_HEADER = struct.Struct('<8sIIQQ')
+# Shared memory blocks are followed by the identity of the resource tracker of their owner (device and inode of its pipe)
+_TRACKER = struct.Struct('<QQ')
+
+
+def _binary_offset(labels_length):
+    """
+        Offset of the matrix in a binary file, the first aligned position after the header and the labels.
+    """
+    end = _BINARY_HEADER.size + labels_length
+    return -(-end // BINARY_ALIGNMENT) * BINARY_ALIGNMENT
+
+
+def _parse_binary(buffer, source):
+    """
+        Reads a matrix in binary format from a buffer (a mapped file or a shared memory block) without copying the matrix.
+
+    :param buffer: Read only memoryview of bytes, starting at the header.
+    :param source: Name of the file or block, for error messages.
+    :return: The labels and a flat view of the matrix values.
+    """
+    if len(buffer) < _BINARY_HEADER.size:
+        raise ValueError('{} is not a binary matrix file'.format(source))
+    magic, version, _, size, labels_length = _BINARY_HEADER.unpack(buffer[:_BINARY_HEADER.size])
+    if magic != BINARY_MAGIC:
+        raise ValueError('{} is not a binary matrix file'.format(source))
+    if version != BINARY_VERSION:
+        raise ValueError('Unsupported binary matrix version {} in {}'.format(version, source))
+    labels = json.loads(bytes(buffer[_BINARY_HEADER.size:_BINARY_HEADER.size + labels_length]).decode('utf-8'))
+    if len(labels) != size:
+        raise ValueError('{} has {} labels, expected {}'.format(source, len(labels), size))
+
+    offset = _binary_offset(labels_length)
+    end = offset + 8 * size * size
+    if size == 0:
+        return labels, array('d')
+    if len(buffer) < end:
+        raise ValueError('{} is truncated'.format(source))
+    values = buffer[offset:end].cast('d')
+    if sys.byteorder != 'little':
+        values = array('d', values)
+        values.byteswap()
+    return labels, values
+
+
+def _tracker_id():
+    """
+        Identity of the resource tracker of this process (the pipe it reads from). Processes started by ``multiprocessing`` share the tracker of their parent.
+    """
+    if os.name != 'posix':
+        return None
+    info = os.fstat(resource_tracker.getfd())
+    return info.st_dev, info.st_ino
+
+
+def _block_tracker(buffer):
+    """
+        Identity of the resource tracker of the owner of a shared memory block, stored by ``MatrixInstance.share`` right after the matrix.
+    """
+    if len(buffer) < _BINARY_HEADER.size:
+        return None
+    magic, _, _, size, labels_length = _BINARY_HEADER.unpack_from(buffer)
+    end = _binary_offset(labels_length) + 8 * size * size
+    if magic != BINARY_MAGIC or len(buffer) < end + _TRACKER.size:
+        return None
+    return _TRACKER.unpack_from(buffer, end)
+
+
+def _open_shared(name):
+    """
+        Opens an existing shared memory block without letting the resource tracker of this process remove it on exit.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13 every block is registered in the tracker. Processes that share the tracker of the owner (like its worker processes) keep the
+    # registration, since it is the one of the owner and the tracker keeps a single entry per block. Any other process drops it.
+    block = shared_memory.SharedMemory(name=name)
+    if os.name == 'posix' and _block_tracker(block.buf) != _tracker_id():
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+def _unlink_shared(block):
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class _SharedBlock:
+    """
+        Shared memory block used by a MatrixInstance, along with the views of it the instance holds. The block is closed once every view is gone, and its owner
+        removes it then, on ``unlink`` or when the process exits.
+    """
+
+    def __init__(self, block, owner):
+        self.block = block
+        self.name = block.name
+        self._views = 0
+        self._unlink = weakref.finalize(self, _unlink_shared, block) if owner else None
+
+    def track(self, view):
+        """
+            Keeps the block open while a view of it is alive. Memoryviews release their buffer before their weakref callbacks run, so the block can be closed from
+            the callback of the last one.
+
+        :param view: Memoryview over the block.
+        :return: The view.
+        """
+        self._views += 1
+        weakref.finalize(view, self._released).atexit = False
+        return view
+
+    def _released(self):
+        self._views -= 1
+        if not self._views:
+            self.unlink()
+            self.block.close()
+
+    def unlink(self):
+        """
+            Removes the block if this process owns it, so it can no longer be attached to. Processes that already use it keep their mapping.
+        """
+        if self._unlink is not None:
+            self._unlink()
+
+
+def write_binary(path, labels, rows):
+    """
+        Writes a matrix in binary format, one row at a time, so the whole matrix never needs to be in memory.
+
+    :param path: Path of the binary file.
+    :param labels: Labels of the elements, ordered by index. They must be JSON serializable.
+    :param rows: Iterable with the rows of the matrix, as iterables of numbers or buffers of native float64 values.
+    """
+    encoded_labels = json.dumps(labels).encode('utf-8')
+    offset = _binary_offset(len(encoded_labels))
+    with open(path, 'wb') as f:
+        f.write(_BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, len(labels), len(encoded_labels)))
+        f.write(encoded_labels)
+        f.write(bytes(offset - f.tell()))
+        count = 0
+        for count, row in enumerate(rows, 1):
+            if isinstance(row, memoryview):
+                values = array('d')
+                values.frombytes(row)
+            else:
+                values = array('d', row)
+            if len(values) != len(labels):
+                raise ValueError('Row {} has {} values, expected {}'.format(count, len(values), len(labels)))
+            if sys.byteorder != 'little':
+                values.byteswap()
+            values.tofile(f)
+    if len(labels) and count != len(labels):
+        raise ValueError('Expected {} rows, got {}'.format(len(labels), count))
+
+
+def json_to_binary(json_path, binary_path, default=0.0):
+    """
+        Converts a JSON matrix instance (a dict of dicts keyed by labels, or a list of rows) to the binary format of ``MatrixInstance.from_binary``.
+
+    :param json_path: Path of the JSON file.
+    :param binary_path: Path of the binary file to write.
+    :param default: Value of the missing entries of the matrix.
+    """
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        labels = list(data.keys())
+        rows = ((data[a].get(b, default) for b in labels) for a in labels)
+    else:
+        labels = list(range(len(data)))
+        rows = data
+    write_binary(binary_path, labels, rows)
+
+
+class MatrixInstance(NeighborListsMixin, Instance):
+    """
+        Instance whose data is a square matrix of values between elements, like distances between cities in TSP.
+
+        Label keyed data (a dict of dicts, as loaded from JSON) is compiled into a contiguous matrix along with a label <-> index map, so solutions, candidates and moves
+        can work with integer indices instead of labels. Data may also be given as a list of rows, then labels are just the indices.
+
+        The matrix is a NumPy array if NumPy is available, and a memoryview over an ``array`` otherwise. In both cases values are read with ``matrix[i, j]`` (or ``distance(i, j)``).
+        Missing values, like the distance from a city to itself, take the ``default`` value.
+
+        Large matrices should be stored in binary format (see ``to_binary`` and ``json_to_binary``) and loaded with ``from_binary``, which maps the file into memory instead
+        of parsing it. Loading is then immediate, the matrix is never copied, and every process that loads the same file (or receives the pickled instance) shares its pages.
+
+        To run solvers in worker processes without copying the matrix into each of them, ``share`` moves it to a shared memory block (in the same binary format).
+        Pickled shared instances only carry the name of the block, and unpickling them (or calling ``attach`` with that name) maps the same read only pages with zero copies.
+        The process that shares the matrix owns the block: it is removed by ``unshare``, when the instance is garbage collected or when the process exits. If the owner
+        crashes, the resource tracker of ``multiprocessing`` removes it once the rest of its processes exit. Attached processes never remove it, so workers can crash
+        or exit at any time. Shared memory needs Python 3.8 or later.
+
+        Nearest neighbor lists for granular neighborhoods are given by ``neighbor_lists`` (see ``or_testbed.entities.neighbors``).
+    """
+
+    def __init__(self, name, data=None, default=0.0):
+        super().__init__(name)
+        self.default = default
+        self.labels = []
+        self.index = {}
+        self._values = None
+        self._mapped = None
+        self._shared = None
+        self._block = None
+        self.matrix = None
+        if data is not None:
+            self.data = data
+
+    @property
+    def data(self):
+        """
+            Getter for instance input data. Once compiled, data is the matrix itself.
+
+        :return: Instance matrix.
+        """
+        return self.matrix
+
+    @data.setter
+    def data(self, in_data):
+        """
+            Compiles input data into the matrix and the label <-> index map.
+
+        :param in_data: Dict of dicts keyed by labels, or list of rows.
+        """
+        if isinstance(in_data, dict):
+            labels = list(in_data.keys())
+            rows = ((in_data[a].get(b, self.default) for b in labels) for a in labels)
+        else:
+            labels = list(range(len(in_data)))
+            rows = in_data
+
+        values = array('d')
+        for row in rows:
+            values.extend(row)
+        self._mapped = None
+        self._set_matrix(labels, values)
+        self._detach()
+
+    def from_binary(self, path):
+        """
+            Loads a matrix in binary format, mapping the file into memory. The matrix is read only.
+
+        :param path: Path of the binary file.
+        """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _BINARY_HEADER.size:
+                raise ValueError('{} is not a binary matrix file'.format(path))
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        labels, values = _parse_binary(memoryview(mapped), path)
+
+        self._mapped = path
+        self._set_matrix(labels, values)
+        self._detach()
+
+    def share(self):
+        """
+            Moves the matrix to a new shared memory block, so worker processes can attach to it instead of receiving a copy. The matrix is read only from then on.
+            This process owns the block (see ``unshare``).
+
+        :return: Name of the block, to be given to ``attach``.
+        """
+        if shared_memory is None:
+            raise RuntimeError('Shared memory instances need Python 3.8 or later')
+        if self._shared is not None:
+            return self._shared
+        encoded_labels = json.dumps(self.labels).encode('utf-8')
+        offset = _binary_offset(len(encoded_labels))
+        end = offset + 8 * len(self._values)
+        block = shared_memory.SharedMemory(create=True, size=end + _TRACKER.size)
+        shared = _SharedBlock(block, True)
+        try:
+            buffer = block.buf
+            buffer[:_BINARY_HEADER.size] = _BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, self.size, len(encoded_labels))
+            buffer[_BINARY_HEADER.size:_BINARY_HEADER.size + len(encoded_labels)] = encoded_labels
+            values = array('d', self._values)
+            if sys.byteorder != 'little':
+                values.byteswap()
+            buffer[offset:end] = memoryview(values).cast('B')
+            _TRACKER.pack_into(buffer, end, *(_tracker_id() or (0, 0)))
+            view = shared.track(buffer.toreadonly())
+            labels, values = _parse_binary(view, block.name)
+        except BaseException:
+            shared.unlink()
+            raise
+
+        self._mapped = None
+        self._use_block(shared, labels, values)
+        return block.name
+
+    def attach(self, name):
+        """
+            Uses the matrix of a shared memory block created by ``share``, in this or any other process, without copying it. The matrix is read only.
+
+        :param name: Name of the block.
+        """
+        if shared_memory is None:
+            raise RuntimeError('Shared memory instances need Python 3.8 or later')
+        shared = _SharedBlock(_open_shared(name), False)
+        view = shared.track(shared.block.buf.toreadonly())
+        labels, values = _parse_binary(view, name)
+        self._mapped = None
+        self._use_block(shared, labels, values)
+
+    def unshare(self):
+        """
+            Stops using the shared memory block, copying the matrix back to private memory. If this process created the block, it is removed, so it can no longer
+            be attached to. The block is closed once nothing holds views of the matrix.
+        """
+        if self._shared is None:
+            return
+        self._set_matrix(self.labels, array('d', self._values))
+        self._detach()
+
+    @property
+    def shared_name(self):
+        """
+            Name of the shared memory block holding the matrix, or None if it is not shared.
+        """
+        return self._shared
+
+    def _use_block(self, shared, labels, values):
+        previous = self._block
+        self._block = shared
+        self._shared = shared.name
+        # Every view of the matrix keeps the block open: on unshare, garbage collection or exit it is closed once they are all gone
+        if isinstance(values, memoryview):
+            shared.track(values)
+        self._set_matrix(labels, values)
+        # NumPy arrays keep a memoryview of their own as their base
+        view = self.matrix
+        while view is not None and not isinstance(view, memoryview):
+            view = getattr(view, 'base', None)
+        if view is not None and view is not values:
+            shared.track(view)
+        if previous is not None:
+            previous.unlink()
+
+    def _detach(self):
+        """
+            Stops using the shared memory block, once the matrix no longer uses it. The owner removes it right away.
+        """
+        shared = self._block
+        self._shared = None
+        self._block = None
+        if shared is not None:
+            shared.unlink()
+
+    def to_binary(self, path):
+        """
+            Stores the matrix in binary format, to be loaded with ``from_binary``.
+
+        :param path: Path of the binary file.
+        """
+        row_bytes = 8 * self.size
+        values = memoryview(self._values).cast('B')
+        write_binary(path, self.labels, (values[i:i + row_bytes] for i in range(0, len(values), row_bytes)))
+
+    def _set_matrix(self, labels, values):
+        """
+            Sets the labels and builds the matrix view over a flat buffer of values, without copying it.
+
+        :param labels: Labels of the elements, ordered by index.
+        :param values: Flat buffer with the matrix in row-major order.
+        """
+        size = len(labels)
+        if len(values) != size * size:
+            raise ValueError('Expected {} values for {} elements, got {}'.format(size * size, size, len(values)))
+
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self._values = values
+        if numpy is not None:
+            self.matrix = numpy.frombuffer(values, dtype=numpy.float64).reshape(size, size)
+        else:
+            self.matrix = memoryview(values).cast('B').cast('d', (size, size))
+
+    @property
+    def size(self):
+        """
+            Number of elements of the instance.
+
+        :return: Number of rows (and columns) of the matrix.
+        """
+        return len(self.labels)
+
+    def distance(self, i, j):
+        """
+            Value between two elements given by their indices.
+
+        :param i: Index of the first element.
+        :param j: Index of the second element.
+        :return: Matrix value at ``(i, j)``.
+        """
+        return self.matrix[i, j]
+
+    def distances(self, rows, cols):
+        """
+            Values between many pairs of elements at once, for example to evaluate a whole neighborhood.
+
+        :param rows: Indices of the first element of each pair, a NumPy array if NumPy is available.
+        :param cols: Indices of the second element of each pair.
+        :return: A NumPy array with the values if NumPy is available, a list otherwise.
+        """
+        if numpy is not None:
+            return self.matrix[rows, cols]
+        matrix = self.matrix
+        return [matrix[i, j] for i, j in zip(rows, cols)]
+
+    def distance_digest(self):
+        """
+            Digest of the matrix values, to tell whether cached data (like neighbor lists) belongs to this instance.
+
+        :return: Digest as bytes.
+        """
+        return hashlib.blake2b(memoryview(self._values).cast('B'), digest_size=32).digest()
+
+    def index_of(self, label):
+        """
+            Index of an element given its label.
+        """
+        return self.index[label]
+
+    def label_of(self, i):
+        """
+            Label of an element given its index.
+        """
+        return self.labels[i]
+
+    def to_dict(self):
+        """
+            Converts the matrix back to its label keyed representation, for example to store it as JSON.
+
+        :return: Dict of dicts keyed by labels.
+        """
+        return {a: {b: self.matrix[i, j] for j, b in enumerate(self.labels) if i != j} for i, a in enumerate(self.labels)}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['matrix'] = None
+        state['_block'] = None
+        if self._mapped is not None or self._shared is not None:
+            # Mapped and shared matrices are mapped again from their file or block
+            state['_values'] = None
+        if self._shared is not None:
+            # And so are the labels of shared matrices
+            state['labels'] = None
+            state['index'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        shared = self.__dict__.setdefault('_shared', None)
+        self._shared = None
+        self._block = None
+        if shared is not None:
+            self.attach(shared)
+        elif self._mapped is not None:
+            self.from_binary(self._mapped)
+        else:
+            self._set_matrix(self.labels, self._values)
+
+
+class _LazyMatrix:
+    """
+        Read only view of the distances of a CoordinateInstance, indexed like ``MatrixInstance.matrix``: ``matrix[i, j]`` for a single distance, or with arrays of
+        indices for many of them.
+    """
+    __slots__ = ('instance',)
+
+    def __init__(self, instance):
+        self.instance = instance
+
+    def __getitem__(self, key):
+        i, j = key
+        if numpy is not None and (isinstance(i, numpy.ndarray) or isinstance(j, numpy.ndarray)):
+            return self.instance.distances(i, j)
+        return self.instance.distance(i, j)
+
+    @property
+    def shape(self):
+        return self.instance.size, self.instance.size
+
+    def __len__(self):
+        return self.instance.size
+
+
+class CoordinateInstance(NeighborListsMixin, Instance):
+    """
+        Instance whose data are the coordinates of its elements, like cities in TSP. Distances are not stored but computed on demand with one of the TSPLIB metrics
+        (see ``or_testbed.entities.metrics``), so the instance takes linear memory and fits problems with hundreds of thousands of elements.
+
+        It has the same interface as MatrixInstance (labels, indices, ``distance(i, j)``, ``distances(rows, cols)`` and ``matrix[i, j]``), so moves and solvers work with both.
+        Data may be a dict of ``(x, y)`` points keyed by labels, or a list of points whose labels are just the indices.
+
+        Single distances go through a bounded LRU cache of ``cache_size`` entries (0 disables it), whose hit rate is given by ``cache_info``.
+        Batch lookups (``distances``) are computed with NumPy over all the pairs at once, bypassing the cache. Nearest neighbor lists are given by ``neighbor_lists``.
+    """
+
+    def __init__(self, name, data=None, metric='EUC_2D', cache_size=2 ** 20):
+        super().__init__(name)
+        if metric not in base_metrics.metrics:
+            raise ValueError('Unknown metric {}, available metrics are {}'.format(metric, ', '.join(base_metrics.metrics)))
+        self.metric = metric
+        self.cache_size = cache_size
+        self.labels = []
+        self.index = {}
+        self.coordinates = []
+        self.points = None
+        self.matrix = _LazyMatrix(self)
+        self._metric = base_metrics.metrics[metric]
+        self._cached = None
+        if data is not None:
+            self.data = data
+
+    @property
+    def data(self):
+        """
+            Getter for instance input data.
+
+        :return: List of points, ordered by index.
+        """
+        return self.coordinates
+
+    @data.setter
+    def data(self, in_data):
+        """
+            Sets the points of the instance and the label <-> index map.
+
+        :param in_data: Dict of points keyed by labels, or list of points.
+        """
+        if isinstance(in_data, dict):
+            labels = list(in_data.keys())
+            points = [in_data[label] for label in labels]
+        else:
+            labels = list(range(len(in_data)))
+            points = in_data
+
+        self.labels = labels
+        self.index = {label: i for i, label in enumerate(labels)}
+        self.coordinates = [(float(x), float(y)) for x, y in points]
+        if numpy is not None:
+            self.points = numpy.array(self.coordinates, dtype=numpy.float64).reshape(-1, 2)
+        self._reset_cache()
+
+    def _reset_cache(self):
+        self._cached = functools.lru_cache(maxsize=self.cache_size)(self._compute) if self.cache_size else None
+
+    def _compute(self, i, j):
+        return self._metric(self.coordinates[i], self.coordinates[j])
+
+    @property
+    def size(self):
+        """
+            Number of elements of the instance.
+
+        :return: Number of points.
+        """
+        return len(self.labels)
+
+    def distance(self, i, j):
+        """
+            Distance between two elements given by their indices.
+
+        :param i: Index of the first element.
+        :param j: Index of the second element.
+        :return: Distance between both points.
+        """
+        if self._cached is None:
+            return self._compute(i, j)
+        # Metrics are symmetric, so (i, j) and (j, i) share their cache entry
+        if i > j:
+            i, j = j, i
+        return self._cached(i, j)
+
+    def distances(self, rows, cols):
+        """
+            Distances between many pairs of elements at once, for example to evaluate a whole neighborhood.
+
+        :param rows: Indices of the first element of each pair, a NumPy array if NumPy is available.
+        :param cols: Indices of the second element of each pair.
+        :return: A NumPy array with the distances if NumPy is available, a list otherwise.
+        """
+        if numpy is not None:
+            return base_metrics.array_metrics[self.metric](self.points[rows], self.points[cols])
+        return [self.distance(i, j) for i, j in zip(rows, cols)]
+
+    def distance_digest(self):
+        """
+            Digest of the metric and the points, which determine every distance. See ``MatrixInstance.distance_digest``.
+
+        :return: Digest as bytes.
+        """
+        digest = hashlib.blake2b(self.metric.encode('utf-8') + b'\0', digest_size=32)
+        digest.update(array('d', (value for point in self.coordinates for value in point)).tobytes())
+        return digest.digest()
+
+    def cache_info(self):
+        """
+            Statistics of the distance cache.
+
+        :return: Dict with cache hits, misses, current size, maximum size and hit rate.
+        """
+        if self._cached is None:
+            return {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 0, 'hit_rate': 0.0}
+        info = self._cached.cache_info()
+        lookups = info.hits + info.misses
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize, 'hit_rate': info.hits / lookups if lookups else 0.0}
+
+    def clear_cache(self):
+        """
+            Empties the distance cache and resets its statistics.
+        """
+        if self._cached is not None:
+            self._cached.cache_clear()
+
+    def index_of(self, label):
+        """
+            Index of an element given its label.
+        """
+        return self.index[label]
+
+    def label_of(self, i):
+        """
+            Label of an element given its index.
+        """
+        return self.labels[i]
+
+    def to_dict(self):
+        """
+            Converts the points back to their label keyed representation, for example to store them as JSON.
+
+        :return: Dict of points keyed by labels.
+        """
+        return dict(zip(self.labels, self.coordinates))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # The cache is not sent along, every process fills its own
+        state['_cached'] = None
+        state['points'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.matrix = _LazyMatrix(self)
+        if numpy is not None:
+            self.points = numpy.array(self.coordinates, dtype=numpy.float64).reshape(-1, 2)
+        self._reset_cache()
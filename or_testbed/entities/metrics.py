@@ -0,0 +1,78 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Distance metrics between points, following TSPLIB conventions (see TSPLIB95 documentation). Distances are rounded to integers, so results can be compared
+    with published optima.
+
+    Every metric has a scalar version, between two ``(x, y)`` points, and a NumPy version, between two arrays of points of shape ``(..., 2)``.
+    GEO points are ``(latitude, longitude)`` pairs in TSPLIB ``DDD.MM`` format.
+"""
+
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def euc_2d(a, b):
+    return int(math.hypot(a[0] - b[0], a[1] - b[1]) + 0.5)
+
+
+def ceil_2d(a, b):
+    return math.ceil(math.hypot(a[0] - b[0], a[1] - b[1]))
+
+
+def att(a, b):
+    r = math.sqrt(((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) / 10.0)
+    t = int(r + 0.5)
+    return t + 1 if t < r else t
+
+
+def _geo_radians(x):
+    degrees = int(x)
+    return math.pi * (degrees + 5.0 * (x - degrees) / 3.0) / 180.0
+
+
+def geo(a, b):
+    lat_a, lon_a = _geo_radians(a[0]), _geo_radians(a[1])
+    lat_b, lon_b = _geo_radians(b[0]), _geo_radians(b[1])
+    q1 = math.cos(lon_a - lon_b)
+    q2 = math.cos(lat_a - lat_b)
+    q3 = math.cos(lat_a + lat_b)
+    return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+
+def euc_2d_array(a, b):
+    return numpy.floor(numpy.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1]) + 0.5)
+
+
+def ceil_2d_array(a, b):
+    return numpy.ceil(numpy.hypot(a[..., 0] - b[..., 0], a[..., 1] - b[..., 1]))
+
+
+def att_array(a, b):
+    r = numpy.sqrt(((a[..., 0] - b[..., 0]) ** 2 + (a[..., 1] - b[..., 1]) ** 2) / 10.0)
+    t = numpy.floor(r + 0.5)
+    return numpy.where(t < r, t + 1, t)
+
+
+def _geo_radians_array(x):
+    degrees = numpy.trunc(x)
+    return numpy.pi * (degrees + 5.0 * (x - degrees) / 3.0) / 180.0
+
+
+def geo_array(a, b):
+    lat_a, lon_a = _geo_radians_array(a[..., 0]), _geo_radians_array(a[..., 1])
+    lat_b, lon_b = _geo_radians_array(b[..., 0]), _geo_radians_array(b[..., 1])
+    q1 = numpy.cos(lon_a - lon_b)
+    q2 = numpy.cos(lat_a - lat_b)
+    q3 = numpy.cos(lat_a + lat_b)
+    return numpy.floor(6378.388 * numpy.arccos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+
+# Metrics by their TSPLIB EDGE_WEIGHT_TYPE
+metrics = {'EUC_2D': euc_2d, 'CEIL_2D': ceil_2d, 'ATT': att, 'GEO': geo}
+array_metrics = {'EUC_2D': euc_2d_array, 'CEIL_2D': ceil_2d_array, 'ATT': att_array, 'GEO': geo_array}
@@ -1,6 +1,8 @@
 # -*- coding:utf-8 -*-
 
 from abc import ABC, abstractmethod
+from itertools import islice
+import or_testbed.entities.neighborhood as neighborhood
 
 
 class Move(ABC):
@@ -13,3 +15,89 @@ class Move(ABC):
     @abstractmethod
     def apply(in_candidate, in_solution):
         pass
+
+    @classmethod
+    def sample_candidate(cls, solution, instance, rng):
+        """
+            Gets one random candidate of the neighborhood. By default the whole neighborhood is built and sampled, so moves with large neighborhoods should override
+            this method to build just the sampled candidate, which is what simulated annealing needs on every step.
+
+        :param solution: Actual solution.
+        :param instance: Instance being solved.
+        :param rng: Random number generator to use.
+        :return: A candidate chosen uniformly at random.
+        """
+        return neighborhood.random_element(cls.make_neighborhood(solution, instance), rng)
+
+    @staticmethod
+    def batch_fitness(solution, instance):
+        """
+            Evaluates the whole neighborhood at once. Moves that can describe their neighborhood with arrays (like pairs of positions) should override this method
+            and return a vector (a NumPy array, or any sequence) with the fitness of every candidate, in the same order as ``make_neighborhood``.
+            Selection strategies then work over this vector instead of evaluating candidates one by one.
+
+        :param solution: Actual solution.
+        :param instance: Instance being solved.
+        :return: Vector of fitness values, or None if the move does not support batch evaluation (the default).
+        """
+        return None
+
+    @classmethod
+    def batch_candidate(cls, solution, instance, index):
+        """
+            Builds the candidate at a given position of the neighborhood, used along ``batch_fitness``. By default the neighborhood is traversed up to that position,
+            moves supporting batch evaluation usually know how to build it directly.
+
+        :param solution: Actual solution.
+        :param instance: Instance being solved.
+        :param index: Position of the candidate in the neighborhood.
+        :return: The candidate.
+        """
+        return next(islice(cls.make_neighborhood(solution, instance), index, None))
+
+    @classmethod
+    def update_neighborhood(cls, candidates, applied, solution, instance):
+        """
+            Updates a neighborhood after applying one of its candidates, used by constructive solvers (like GRASP) that keep their candidates between steps instead of
+            building them again. Moves that know which candidates become unavailable, and which ones change their fitness, should override this method.
+
+        :param candidates: Actual candidates, including the applied one. They must not be modified.
+        :param applied: Candidate that was just applied.
+        :param solution: Solution after applying the candidate.
+        :param instance: Instance being solved.
+        :return: A tuple ``(removed, stale)`` with the candidates that are no longer available and those whose fitness must be evaluated again (None if all of them),
+                 or None if the neighborhood must be built from scratch (the default).
+        """
+        return None
+
+    @classmethod
+    def relink_neighborhood(cls, solution, guide, instance):
+        """
+            Candidates that take a solution one step closer to another one, used by path relinking. For example, swapping an element with the one that the guiding
+            solution has in its position. Moves must override this method to be used in path relinking (see ``PathRelinking``).
+
+        :param solution: Actual solution.
+        :param guide: Solution to move towards, it must not be modified.
+        :param instance: Instance being solved.
+        :return: Iterable of candidates, empty when the solution is already equal to the guide or the move does not support path relinking (the default).
+        """
+        return []
+
+    @classmethod
+    def apply_and_update(cls, in_candidate, in_solution, in_instance):
+        """
+            Applies a candidate to a solution and keeps its objective value up to date. If the candidate provides an incremental evaluation (see ``Candidate.delta``) it is used,
+            otherwise the objective is fully recomputed.
+
+        :param in_candidate: Candidate to apply.
+        :param in_solution: Solution to modify.
+        :param in_instance: Instance being solved.
+        :return: The modified solution, with its new objective value.
+        """
+        delta = in_candidate.delta(in_solution, in_instance)
+        out_solution = cls.apply(in_candidate, in_solution)
+        if delta is None:
+            out_solution.update_objective(in_instance)
+        else:
+            out_solution.apply_delta(delta)
+        return out_solution
@@ -8,10 +8,17 @@
     Two solutions ``s`` an ``s'`` are close if there's a movement that, applied to ``s``, gives ``s'``. The movement itself depends on the problem, but examples are swapping cities
     in TSP, removing or adding items in knapsack, etc.
 
+    A neighborhood can be any iterable of candidates. Large neighborhoods should be returned as generators, since every strategy consumes them in a streaming way
+    and no more candidates than needed are ever built.
+
+    Moves may also evaluate their whole neighborhood at once (see ``Move.batch_fitness``), for example with NumPy. In that case first improving, best and bounded scan strategies
+    work directly over the vector of fitness values and only build the selected candidate.
+
     When selecting a candidate of a neighborhood, multiple strategies may be used:
         * Random. Just select one random candidate from neighborhood
         * First improving. Iterate through all candidates in neighborhood and select the first candidate that improves the actual solution.
         * Best. Get the best candidate in the neighborhood. Even though this one seems the optimal, it needs to compute the cost of every candidate, which may be a problem in large neighborhoods.
+        * Bounded scan. Get the best candidate among the first ones of the neighborhood, examining no more than a given amount of them.
         * Aspiration Plus. Iterate through all candidates, selecting the one that gives the best result but assuring that a minimum of candidates will be examined.
 
 """
@@ -19,51 +26,198 @@
 # TODO Implement Aspiration Plus Candidate selection.
 
 import random
+from collections.abc import Sequence
+from itertools import islice
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def random_element(candidates, rng=random):
+    """
+        Picks a random element of any iterable. Sequences are indexed directly, any other iterable is consumed once using reservoir sampling, so it is never materialized.
+
+    :param candidates: Iterable of candidates.
+    :param rng: Random number generator to use.
+    :return: One of the candidates chosen uniformly at random, None if there are no candidates.
+    """
+    if isinstance(candidates, Sequence):
+        return candidates[rng.randrange(len(candidates))] if candidates else None
+
+    retval = None
+    for seen, candidate in enumerate(candidates, 1):
+        if rng.random() * seen < 1:
+            retval = candidate
+    return retval
+
+
+def _is_array(values):
+    return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def _argmax(values):
+    """
+        Index of the greatest value of a fitness vector, the first one in case of ties.
+    """
+    if _is_array(values):
+        return int(values.argmax())
+    return max(range(len(values)), key=values.__getitem__)
+
+
+def _first_positive(values):
+    """
+        Index of the first positive value of a fitness vector, None if there is no such value.
+    """
+    if _is_array(values):
+        improving = numpy.flatnonzero(values > 0)
+        return int(improving[0]) if len(improving) else None
+    return next((i for i, cost in enumerate(values) if cost > 0), None)
 
 
 # Candidate selection strategies
+# Every strategy takes an optional Stats object (see or_testbed.utils.stats) where it counts the neighborhoods it explores and the candidates it evaluates,
+# and the random number generator of the solver (see or_testbed.utils.rng), the random module by default.
 class CandidateSelection:
-    def select(self, candidates, solution, instance):
+    def select(self, candidates, solution, instance, stats=None, rng=random):
         pass
 
+    def select_from(self, move, solution, instance, stats=None, rng=random):
+        """
+            Selects a candidate from the neighborhood of a move. Strategies can override it when they can take advantage of the move itself, instead of a plain neighborhood.
+
+        :param move: Move whose neighborhood is explored.
+        :param solution: Actual solution.
+        :param instance: Instance being solved.
+        :param stats: Stats object to count evaluations, None to disable counting.
+        :param rng: Random number generator to use.
+        :return: Same as ``select``.
+        """
+        if stats is not None:
+            stats.count('neighborhoods')
+        return self.select(move.make_neighborhood(solution, instance), solution, instance, stats, rng)
+
 
 class Random(CandidateSelection):
-    def select(self, candidates, solution, instance):
-        return random.choice(candidates)
+    def select(self, candidates, solution, instance, stats=None, rng=random):
+        return random_element(candidates, rng)
+
+    def select_from(self, move, solution, instance, stats=None, rng=random):
+        if stats is not None:
+            stats.count('sampled_candidates')
+        return move.sample_candidate(solution, instance, rng)
 
 
 class FirstImproving(CandidateSelection):
-    def select(self, candidates, solution, instance):
+    def select_from(self, move, solution, instance, stats=None, rng=random):
+        costs = move.batch_fitness(solution, instance)
+        if costs is None:
+            return super().select_from(move, solution, instance, stats, rng)
+        if stats is not None:
+            stats.count('neighborhoods')
+            stats.count('fitness_evaluations', len(costs))
+        if not len(costs):
+            return None
+
+        index = _first_positive(costs)
+        if index is None:
+            index = rng.randrange(len(costs))
+        return costs[index], move.batch_candidate(solution, instance, index)
+
+    def select(self, candidates, solution, instance, stats=None, rng=random):
+        # If no candidate improves solution, a random one is chosen in order to continue exploring solution space.
+        # It is sampled (along with its cost) while scanning, so the neighborhood is only traversed once.
+        # TODO Maybe we should provide techniques for this
+        retval = None
+        seen = 0
         for candidate in candidates:
+            seen += 1
             cost = candidate.fitness(solution, instance)
             if cost > 0:
-                return cost, candidate
+                retval = (cost, candidate)
+                break
+            if rng.random() * seen < 1:
+                retval = (cost, candidate)
 
-        # If no candidate improves solution, a random one is chosen in order to continue exploring solution space.
-        # TODO Maybe we should provide techniques for this
-        last_try_candidate = random.choice(candidates)
-        return last_try_candidate.fitness(solution, instance), last_try_candidate
+        if stats is not None:
+            stats.count('fitness_evaluations', seen)
+        return retval
 
 
 class Best(CandidateSelection):
-    def select(self, candidates, solution, instance):
+    def select_from(self, move, solution, instance, stats=None, rng=random):
+        costs = move.batch_fitness(solution, instance)
+        if costs is None:
+            return super().select_from(move, solution, instance, stats, rng)
+        return self._select_batch(costs, move, solution, instance, stats)
+
+    def _select_batch(self, costs, move, solution, instance, stats):
+        if stats is not None:
+            stats.count('neighborhoods')
+            stats.count('fitness_evaluations', len(costs))
+        if not len(costs):
+            return None
+        index = _argmax(costs)
+        return costs[index], move.batch_candidate(solution, instance, index)
+
+    def select(self, candidates, solution, instance, stats=None, rng=random):
         retval = None
-        for candidate in candidates:
+        seen = 0
+        for seen, candidate in enumerate(candidates, 1):
             cost = candidate.fitness(solution, instance)
             if retval is None or cost > retval[0]:
                 retval = (cost, candidate)
+
+        if stats is not None:
+            stats.count('fitness_evaluations', seen)
         return retval
 
 
+class BoundedScan(Best):
+    """
+        Best candidate among the first ``max_candidates`` of the neighborhood. The rest of the neighborhood is never built when it is a generator.
+    """
+    def __init__(self, max_candidates=100):
+        self.max_candidates = max_candidates
+
+    def _select_batch(self, costs, move, solution, instance, stats):
+        return super()._select_batch(costs[:self.max_candidates], move, solution, instance, stats)
+
+    def select(self, candidates, solution, instance, stats=None, rng=random):
+        return super().select(islice(candidates, self.max_candidates), solution, instance, stats, rng)
+
+
 # Strategies factory
-strategies = {'random': Random(), 'first': FirstImproving(), 'best': Best()}
+strategies = {'random': Random(), 'first': FirstImproving(), 'best': Best(), 'bounded': BoundedScan()}
 
 
 def strategy_factory(ref):
+    """
+        Gets a candidate selection strategy by its name. Strategy objects are returned as they are, so custom strategies (like a BoundedScan with a different limit) can be used too.
+
+    :param ref: Name of the strategy or a CandidateSelection object.
+    :return: The CandidateSelection object.
+    """
+    if isinstance(ref, CandidateSelection):
+        return ref
     return strategies[ref]
 
 
 # Neighborhood utilities
-def select_candidate(selection_strategy, candidates, solution, instance):
-    return selection_strategy.select(candidates, solution, instance)
+# Stats and generators other than the random module are only passed along when given, so custom strategies without instrumentation or generator support keep working.
+def select_candidate(selection_strategy, candidates, solution, instance, stats=None, rng=random):
+    if rng is not random:
+        return selection_strategy.select(candidates, solution, instance, stats, rng)
+    if stats is None:
+        return selection_strategy.select(candidates, solution, instance)
+    return selection_strategy.select(candidates, solution, instance, stats)
+
+
+def select_from_move(selection_strategy, move, solution, instance, stats=None, rng=random):
+    if rng is not random:
+        return selection_strategy.select_from(move, solution, instance, stats, rng)
+    if stats is None:
+        return selection_strategy.select_from(move, solution, instance)
+    return selection_strategy.select_from(move, solution, instance, stats)
 
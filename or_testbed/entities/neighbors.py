@@ -0,0 +1,213 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Nearest neighbor lists of an instance, the base of granular neighborhoods.
+
+    In large instances, most candidates of a neighborhood join elements that are far from each other and are never worth evaluating. Granular neighborhoods only
+    consider candidates between each element and its ``k`` nearest neighbors, so exploring them takes O(n·k) instead of O(n²).
+
+    Lists are built once per instance with a partial sort of the distances of each element (O(n²) time, O(n·k) memory) and can be cached to disk, since they only
+    depend on the instance. Cache files store a fingerprint of the instance (its name and a digest of its distances) and are rebuilt when it does not match.
+    Ties are broken by index, so lists are the same with or without NumPy.
+"""
+
+import hashlib
+import heapq
+import os
+import struct
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+NEIGHBORS_MAGIC = b'ORTBKNN\0'
+NEIGHBORS_VERSION = 2
+# Magic, version, reserved, number of elements, neighbors per element and fingerprint of the instance
+_NEIGHBORS_HEADER = struct.Struct('<8sIIQQ32s')
+
+
+def instance_fingerprint(instance):
+    """
+        Fingerprint of an instance for neighbor lists caches: a digest of its name and its distances. Instances with a ``distance_digest`` method provide the digest
+        of their distances, otherwise every distance is read.
+
+    :param instance: Instance with ``size`` and ``distance(i, j)``.
+    :return: 32 bytes.
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    digest.update(str(instance.name).encode('utf-8') + b'\0')
+    if hasattr(instance, 'distance_digest'):
+        digest.update(instance.distance_digest())
+    else:
+        n = instance.size
+        for i in range(n):
+            digest.update(array('d', (instance.distance(i, j) for j in range(n))).tobytes())
+    return digest.digest()
+
+
+def _nearest(instance, i, k):
+    """
+        Indices of the ``k`` nearest elements to ``i``, nearest first.
+    """
+    n = instance.size
+    if numpy is None:
+        return heapq.nsmallest(k, (j for j in range(n) if j != i), key=lambda j: (instance.distance(i, j), j))
+
+    distances = numpy.array(instance.distances(numpy.full(n, i), numpy.arange(n)), dtype=numpy.float64)
+    distances[i] = numpy.inf
+    kth = numpy.partition(distances, k - 1)[k - 1]
+    closer = numpy.flatnonzero(distances < kth)
+    tied = numpy.flatnonzero(distances == kth)[:k - len(closer)]
+    chosen = numpy.concatenate((closer, tied))
+    return chosen[numpy.lexsort((chosen, distances[chosen]))]
+
+
+class NeighborLists:
+    """
+        The ``k`` nearest neighbors of every element of an instance, nearest first. Neighbors of element ``i`` are given by ``of(i)``.
+
+        Any instance with ``size`` and ``distance(i, j)`` can be indexed. With NumPy, ``distances(rows, cols)`` is used to get whole rows of distances at once.
+    """
+
+    def __init__(self, size, k, neighbors, fingerprint=None):
+        self.size = size
+        self.k = k
+        # Flat, row major, k neighbors per element
+        self.neighbors = neighbors
+        # Fingerprint of the indexed instance, only set for cached lists
+        self.fingerprint = fingerprint
+        self._pairs = {}
+
+    @classmethod
+    def build(cls, instance, k):
+        """
+            Builds the neighbor lists of an instance.
+
+        :param instance: Instance to index.
+        :param k: Neighbors per element. It is capped to the number of elements minus one.
+        :return: A NeighborLists object.
+        """
+        size = instance.size
+        k = max(0, min(k, size - 1))
+        neighbors = array('q')
+        if k:
+            for i in range(size):
+                neighbors.extend(int(j) for j in _nearest(instance, i, k))
+        return cls(size, k, neighbors)
+
+    @classmethod
+    def cached(cls, instance, k, path):
+        """
+            Loads the neighbor lists of an instance from a file, or builds and saves them if the file does not exist, is not a valid neighbor lists file or belongs to
+            another instance (see ``instance_fingerprint``) or ``k``.
+
+        :param instance: Instance to index.
+        :param k: Neighbors per element.
+        :param path: Path of the cache file.
+        :return: A NeighborLists object.
+        """
+        fingerprint = instance_fingerprint(instance)
+        if os.path.exists(path):
+            try:
+                lists = cls.load(path)
+            except ValueError:
+                lists = None
+            if lists is not None and lists.fingerprint == fingerprint and lists.size == instance.size and lists.k == max(0, min(k, instance.size - 1)):
+                return lists
+        lists = cls.build(instance, k)
+        lists.fingerprint = fingerprint
+        lists.save(path)
+        return lists
+
+    def of(self, i):
+        """
+            Nearest neighbors of an element.
+
+        :param i: Index of the element.
+        :return: Sequence with the indices of its neighbors, nearest first.
+        """
+        k = self.k
+        return self.neighbors[i * k:(i + 1) * k]
+
+    def pairs(self, exclude=()):
+        """
+            Unique pairs ``(a, b)``, with ``a < b``, such that one of them is among the nearest neighbors of the other. These are the candidates of granular neighborhoods,
+            like swapping two near cities in TSP. Pairs are computed once and remembered.
+
+        :param exclude: Elements that must not be part of any pair, like the initial city of a tour.
+        :return: Two lists (NumPy arrays if NumPy is available) with the first and second element of each pair, sorted.
+        """
+        exclude = tuple(sorted(exclude))
+        if exclude not in self._pairs:
+            excluded = set(exclude)
+            k = self.k
+            unique = sorted({(min(i, j), max(i, j)) for i in range(self.size) if i not in excluded
+                             for j in self.neighbors[i * k:(i + 1) * k] if j not in excluded})
+            first, second = [a for a, _ in unique], [b for _, b in unique]
+            if numpy is not None:
+                first, second = numpy.array(first, dtype=numpy.intp), numpy.array(second, dtype=numpy.intp)
+            self._pairs[exclude] = (first, second)
+        return self._pairs[exclude]
+
+    def save(self, path):
+        """
+            Stores the neighbor lists in a binary file.
+
+        :param path: Path of the file.
+        """
+        neighbors = array('q', self.neighbors)
+        if sys.byteorder != 'little':
+            neighbors.byteswap()
+        with open(path, 'wb') as f:
+            f.write(_NEIGHBORS_HEADER.pack(NEIGHBORS_MAGIC, NEIGHBORS_VERSION, 0, self.size, self.k, self.fingerprint or bytes(32)))
+            neighbors.tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        """
+            Loads neighbor lists stored with ``save``.
+
+        :param path: Path of the file.
+        :return: A NeighborLists object.
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_NEIGHBORS_HEADER.size)
+            if len(header) < _NEIGHBORS_HEADER.size:
+                raise ValueError('{} is not a neighbor lists file'.format(path))
+            magic, version, _, size, k, fingerprint = _NEIGHBORS_HEADER.unpack(header)
+            if magic != NEIGHBORS_MAGIC or version != NEIGHBORS_VERSION:
+                raise ValueError('{} is not a neighbor lists file'.format(path))
+            neighbors = array('q')
+            neighbors.fromfile(f, size * k)
+        if sys.byteorder != 'little':
+            neighbors.byteswap()
+        return cls(size, k, neighbors, fingerprint if any(fingerprint) else None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pairs'] = {}
+        return state
+
+
+class NeighborListsMixin:
+    """
+        Gives instances a ``neighbor_lists`` method that builds (or loads) their neighbor lists once per ``k``.
+    """
+
+    def neighbor_lists(self, k, path=None):
+        """
+            Gets the ``k`` nearest neighbors of every element. They are built the first time and then kept in the instance, so pickled instances send them along.
+
+        :param k: Neighbors per element.
+        :param path: Optional file where the lists are cached between runs.
+        :return: A NeighborLists object.
+        """
+        lists = self.__dict__.setdefault('_neighbor_lists', {})
+        if k not in lists:
+            lists[k] = NeighborLists.cached(self, k, path) if path is not None else NeighborLists.build(self, k)
+        return lists[k]
@@ -0,0 +1,144 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Permutation solutions for OR-Testbed.
+
+    Lots of combinatorial problems (TSP, scheduling, assignment...) encode their solutions as a sequence of elements. Finding where an element is in a plain list
+    costs O(n), so this module provides a solution base class that keeps the position of every element in sync with the sequence.
+
+"""
+
+import copy
+import operator
+from abc import ABC
+import or_testbed.entities.solution as base_solution
+
+
+class PermutationSolution(base_solution.Solution, ABC):
+    """
+        Solution made of a sequence of distinct, hashable elements. Along with the sequence it keeps a position index, so looking for an element, swapping two elements
+        or appending a new one cost O(1). Inserting an element or reversing a segment only reindexes the positions that actually change.
+
+        The sequence must always be modified through these methods, otherwise the position index gets out of sync.
+        Developer still needs to implement ``is_feasible`` and ``calculate_objective``.
+    """
+
+    def __init__(self, sequence=None, objective=0):
+        super().__init__(objective)
+        self.sequence = []
+        self.positions = {}
+        self.set_sequence(sequence or [])
+
+    def set_sequence(self, in_sequence):
+        """
+            Replaces the whole sequence and rebuilds the position index.
+
+        :param in_sequence: Iterable of distinct elements.
+        """
+        self.sequence = list(in_sequence)
+        self.positions = {element: i for i, element in enumerate(self.sequence)}
+
+    def position(self, element):
+        """
+            Position of an element in the sequence.
+
+        :param element: Element to look for.
+        :return: Its index in the sequence.
+        """
+        return self.positions[element]
+
+    def append(self, element):
+        """
+            Adds an element at the end of the sequence.
+
+        :param element: Element to add, must not be in the sequence already.
+        """
+        self.positions[element] = len(self.sequence)
+        self.sequence.append(element)
+
+    def insert(self, index, element):
+        """
+            Inserts an element before the given position. Elements after it are shifted, so only their positions are updated.
+
+        :param index: Position where the element will be.
+        :param element: Element to add, must not be in the sequence already.
+        """
+        self.sequence.insert(index, element)
+        for i in range(index, len(self.sequence)):
+            self.positions[self.sequence[i]] = i
+
+    def swap(self, i, j):
+        """
+            Swaps the elements at two positions.
+
+        :param i: First position.
+        :param j: Second position.
+        """
+        sequence = self.sequence
+        sequence[i], sequence[j] = sequence[j], sequence[i]
+        self.positions[sequence[i]] = i
+        self.positions[sequence[j]] = j
+
+    def swap_elements(self, a, b):
+        """
+            Swaps two elements, wherever they are.
+
+        :param a: First element.
+        :param b: Second element.
+        """
+        self.swap(self.positions[a], self.positions[b])
+
+    def reverse(self, i, j):
+        """
+            Reverses the segment between two positions, both included (the usual 2-opt move).
+
+        :param i: First position of the segment.
+        :param j: Last position of the segment.
+        """
+        sequence = self.sequence
+        sequence[i:j + 1] = sequence[i:j + 1][::-1]
+        for k in range(i, j + 1):
+            self.positions[sequence[k]] = k
+
+    def snapshot(self):
+        """
+            Copies the sequence and the position index, any other attribute is shared with the copy. Subclasses holding mutable attributes must copy them too.
+
+        :return: A copy of the solution.
+        """
+        retval = copy.copy(self)
+        retval.sequence = list(self.sequence)
+        retval.positions = dict(self.positions)
+        return retval
+
+    def fingerprint(self):
+        """
+            The sequence itself, as a tuple.
+
+        :return: A hashable object.
+        """
+        return tuple(self.sequence)
+
+    def distance_to(self, in_solution):
+        """
+            Number of positions holding different elements in both sequences (Hamming distance), computed in a single pass.
+
+        :param in_solution: Another permutation solution of the same length.
+        :return: Number of positions that differ.
+        """
+        return sum(map(operator.ne, self.sequence, in_solution.sequence))
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __contains__(self, element):
+        return element in self.positions
+
+    def to_dict(self):
+        """
+            Converts the solution to a dictionary, leaving the position index out since it can be derived from the sequence.
+
+        :return: The solution structure as a python dict.
+        """
+        return {k: v for k, v in self.__dict__.items() if k != 'positions'}
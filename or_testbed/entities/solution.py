@@ -1,5 +1,6 @@
 # -*- coding:utf-8 -*-
 
+import copy
 import json
 from abc import ABC, abstractmethod
 from or_testbed.solvers.factory import FactoryMixin
@@ -43,6 +44,14 @@ class Solution(FactoryMixin, ABC):
         """
         self.set_objective(self.calculate_objective(in_instance))
 
+    def apply_delta(self, in_delta):
+        """
+            Updates the objective value incrementally, adding the difference calculated by a candidate.
+
+        :param in_delta: Difference between the new objective value and the actual one.
+        """
+        self.set_objective(self.objective + in_delta)
+
     def set_objective(self, in_objective):
         """
             Simple setter for the objective value of the solution.
@@ -59,6 +68,42 @@ class Solution(FactoryMixin, ABC):
         """
         return self.objective
 
+    def snapshot(self):
+        """
+            Makes an independent copy of the solution. Solvers use it to keep track of the best solution found and to copy their initial solutions.
+            By default it is a deep copy, solutions should override it with something cheaper when possible, like copying just their inner lists.
+
+        :return: A copy of the solution.
+        """
+        return copy.deepcopy(self)
+
+    def restore(self, in_snapshot):
+        """
+            Sets the solution back to the state of a snapshot. The snapshot itself is not modified, so it can be restored again later.
+
+        :param in_snapshot: Solution returned by ``snapshot``.
+        """
+        self.__dict__.update(in_snapshot.snapshot().__dict__)
+
+    def fingerprint(self):
+        """
+            Hashable value that identifies the solution, so duplicated solutions can be detected in O(1) (for example, in the elite pool of path relinking).
+            By default it is the JSON representation of the solution, solutions should override it with something cheaper when possible.
+
+        :return: A hashable object, equal for solutions with the same structure.
+        """
+        return self.to_json()
+
+    def distance_to(self, in_solution):
+        """
+            Distance between two solutions, used to keep a diverse set of solutions. By default solutions are either equal (0) or different (1),
+            solutions should override it with a metric of the problem, like the number of elements in different positions of a permutation.
+
+        :param in_solution: Another solution to compare with self one.
+        :return: A non negative number, 0 if both solutions are equal.
+        """
+        return 0 if self.fingerprint() == in_solution.fingerprint() else 1
+
     def compare_to(self, in_solution, sense='MIN'):
         """
         Compares two solutions based on their objective values. This basic comparison supposes that the objective is a numeric value and a MINIMIZE type function.
@@ -3,4 +3,12 @@
 from collections import namedtuple
 
 
-Task = namedtuple('Task', ['solution', 'is_feasible', 'time'])
+class Task(namedtuple('Task', ['solution', 'is_feasible', 'time'])):
+    """
+        Result of a solver. It unpacks as ``solution, is_feasible, time``. Stats are kept out of the tuple, in the ``stats`` attribute, and are only available
+        when the solver is instrumented.
+    """
+    def __new__(cls, solution, is_feasible, time, stats=None):
+        retval = super().__new__(cls, solution, is_feasible, time)
+        retval.stats = stats
+        return retval
@@ -0,0 +1,2 @@
+from .cache import ResultCache
+from .server import ExecutionService, Job
@@ -0,0 +1,53 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Runs the execution service until it is interrupted::
+
+        python -m or_testbed.service --socket /tmp/or-testbed.sock --workers 4 --preload benchmarks.jobs --builders benchmarks.jobs:build_solver \\
+            --loaders benchmarks.jobs:random_instance benchmarks.jobs:tsplib_instance --cache-dir results
+
+    The service listens on a Unix socket (``or-testbed.sock`` in the temporary folder by default). TCP connections are only accepted with ``--port``, and they
+    are not authenticated.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from or_testbed.service.cache import ResultCache
+from or_testbed.service.server import ExecutionService
+
+
+async def serve(args):
+    service = ExecutionService(args.workers, args.preload, ResultCache(args.cache_size, args.cache_dir) if args.cache_size else None,
+                               builders=args.builders, loaders=args.loaders)
+    await service.start()
+    try:
+        server = await service.listen(args.socket if args.port is None else None, args.host, args.port)
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='OR-Testbed execution service.')
+    parser.add_argument('--socket', default=os.path.join(tempfile.gettempdir(), 'or-testbed.sock'), help='Unix socket to listen on.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help='TCP port to listen on instead of the Unix socket. Connections are not authenticated.')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes.')
+    parser.add_argument('--preload', nargs='*', default=[], help='Modules every worker imports when it starts, like the ones with the job builders.')
+    parser.add_argument('--builders', nargs='*', default=[], help='Import paths (module:callable) of the solver builders jobs may use.')
+    parser.add_argument('--loaders', nargs='*', default=[], help='Import paths of the instance loaders jobs may use, besides the default one.')
+    parser.add_argument('--cache-size', type=int, default=1024, help='Results kept in memory, 0 to disable the cache.')
+    parser.add_argument('--cache-dir', default=None, help='Folder where results are also stored.')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
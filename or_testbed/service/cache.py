@@ -0,0 +1,80 @@
+# -*- coding:utf-8 -*-
+
+import json
+import os
+import tempfile
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+        Results of finished jobs, keyed by job fingerprint (see ``jobs.fingerprint``).
+
+        The last ``size`` results are kept in memory. With a ``path``, every result is also written to a JSON file in that folder, so results outlive the service
+        and can be shared by several of them. Files are written atomically, like checkpoints.
+
+        Only jobs with a seed are cached, since runs without one are not reproducible.
+    """
+
+    def __init__(self, size=1024, path=None):
+        self.size = size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        """
+            Looks up a result.
+
+        :param key: Job fingerprint.
+        :return: The result, or None if it is not cached.
+        """
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.hits += 1
+            return self._results[key]
+        if self.path is not None:
+            try:
+                with open(self._file(key), 'r') as f:
+                    result = json.load(f)
+            except (OSError, ValueError):
+                pass
+            else:
+                self._remember(key, result)
+                self.hits += 1
+                return result
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        """
+            Stores a result.
+
+        :param key: Job fingerprint.
+        :param result: JSON serializable result.
+        """
+        self._remember(key, result)
+        if self.path is not None:
+            fd, temp_path = tempfile.mkstemp(dir=self.path, prefix=key + '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as temp_file:
+                    json.dump(result, temp_file)
+                os.replace(temp_path, self._file(key))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _remember(self, key, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+    def __len__(self):
+        return len(self._results)
@@ -0,0 +1,79 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Client of the execution service.
+
+    Clients talk to the service over a Unix socket or a TCP connection, with one JSON object per line. Each request gets one or more responses, the last of them
+    being one of ``result``, ``failed``, ``status`` or ``error``:
+
+    * ``{"op": "submit", "job": {...}}``: Submits a job (see ``or_testbed.service.jobs``). The service answers ``accepted`` with the id of the job and then streams
+      its events (``queued``, ``running``, ``progress``...) until its ``result`` (or ``failed``). Closing the connection before that does not cancel the job.
+    * ``{"op": "events", "id": ...}``: Streams the events of a job, from the first one.
+    * ``{"op": "result", "id": ...}``: Waits for a job and answers its ``result`` or ``failed`` event.
+    * ``{"op": "status"}``: Answers the number of jobs in each state and the hits of the result cache.
+"""
+
+import asyncio
+import json
+
+
+FINAL_EVENTS = ('result', 'failed', 'status', 'error')
+
+
+async def request(message, path=None, host='127.0.0.1', port=None):
+    """
+        Sends a request to the service.
+
+    :param message: Dict with the request.
+    :param path: Path of the Unix socket of the service, or None to connect to ``host`` and ``port``.
+    :return: An async generator of the responses.
+    """
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(json.dumps(message).encode('utf-8') + b'\n')
+        await writer.drain()
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError('The service closed the connection')
+            response = json.loads(line)
+            yield response
+            if response['event'] in FINAL_EVENTS:
+                break
+    finally:
+        writer.close()
+
+
+def submit(job, path=None, host='127.0.0.1', port=None):
+    """
+        Submits a job and streams its events.
+
+    :param job: Dict with the job.
+    :return: An async generator of events, the last one is ``result`` or ``failed``.
+    """
+    return request({'op': 'submit', 'job': job}, path, host, port)
+
+
+def solve(job, path=None, host='127.0.0.1', port=None, on_event=None):
+    """
+        Submits a job and waits for its result, for scripts that do not run an event loop.
+
+    :param job: Dict with the job.
+    :param on_event: Function called with every event, like progress events.
+    :return: The ``result`` event.
+    """
+    async def run():
+        event = None
+        async for event in submit(job, path, host, port):
+            if on_event is not None:
+                on_event(event)
+        return event
+
+    event = asyncio.run(run())
+    if event['event'] != 'result':
+        raise RuntimeError(event.get('error') or event.get('message'))
+    return event
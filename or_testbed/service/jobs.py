@@ -0,0 +1,206 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Solve jobs of the execution service, and what worker processes do to run them.
+
+    A job is a JSON object that tells a worker how to build a solver, so it can be sent over a socket::
+
+        {"builder": "benchmarks.jobs:build_solver", "instance": {"loader": "benchmarks.jobs:random_instance", "kwargs": {"size": 200}},
+         "params": {"solver": "simanneal"}, "seed": 12345}
+
+    * ``builder``: Import path (``module:callable``) of a function that builds the solver, called as ``builder(instance, seed, **params)``.
+    * ``instance``: Reference to the instance, loaded by ``loader`` (an import path, ``load_matrix`` by default) as ``loader(*args, **kwargs)``.
+    * ``params`` and ``seed``: Parameters of the builder. Jobs with the same builder, instance, parameters and seed return the same result, so they share a fingerprint.
+    * ``incumbents``: If True, progress events include every new best solution, not just its objective.
+
+    Builders and loaders must be registered when the service starts (``builders`` and ``loaders`` of ``ExecutionService``), jobs naming any other import path
+    are rejected. ``load_matrix`` is always registered.
+
+    Workers keep the instances they load, so jobs over the same instance only load it once per worker.
+"""
+
+import hashlib
+import importlib
+import json
+from collections import OrderedDict
+from or_testbed.entities.instance import MatrixInstance
+
+
+DEFAULT_LOADER = 'or_testbed.service.jobs:load_matrix'
+# Instances each worker keeps loaded
+INSTANCE_CACHE_SIZE = 8
+
+# Set in every worker by _init_worker
+_progress = None
+_registered = frozenset()
+_callables = {}
+_instances = OrderedDict()
+
+
+def normalize(job):
+    """
+        Checks a job and fills in its defaults.
+
+    :param job: Dict with the job, as described in the module.
+    :return: A new dict with every field of the job.
+    """
+    if not isinstance(job, dict) or not isinstance(job.get('builder'), str):
+        raise ValueError('Jobs must be objects with a builder')
+    instance = job.get('instance') or {}
+    if not isinstance(instance, dict):
+        raise ValueError('The instance of a job must be an object')
+    loader, args, kwargs = instance.get('loader', DEFAULT_LOADER), instance.get('args', []), instance.get('kwargs', {})
+    params = job.get('params') or {}
+    if not isinstance(loader, str):
+        raise ValueError('The loader of an instance must be a string')
+    if not isinstance(args, (list, tuple)) or not isinstance(kwargs, dict):
+        raise ValueError('The args and kwargs of an instance must be a list and an object')
+    if not isinstance(params, dict):
+        raise ValueError('The params of a job must be an object')
+    return {'builder': job['builder'],
+            'instance': {'loader': loader, 'args': list(args), 'kwargs': dict(kwargs)},
+            'params': dict(params),
+            'seed': job.get('seed'),
+            'incumbents': bool(job.get('incumbents', False))}
+
+
+def fingerprint(job):
+    """
+        Hash of everything that determines the result of a normalized job.
+
+    :param job: Normalized job.
+    :return: Hex digest.
+    """
+    key = {k: job[k] for k in ('builder', 'instance', 'params', 'seed')}
+    return hashlib.sha256(json.dumps(key, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def resolve(path):
+    """
+        Imports an object given as ``module:name``.
+
+    :param path: Import path.
+    :return: The object.
+    """
+    module, _, name = path.partition(':')
+    if not name:
+        raise ValueError('{} is not a module:name import path'.format(path))
+    retval = importlib.import_module(module)
+    for attribute in name.split('.'):
+        retval = getattr(retval, attribute)
+    return retval
+
+
+def check(job, builders, loaders):
+    """
+        Checks that the builder and the loader of a normalized job are registered.
+
+    :param job: Normalized job.
+    :param builders: Import paths of the registered builders.
+    :param loaders: Import paths of the registered loaders.
+    """
+    if job['builder'] not in builders:
+        raise ValueError('Builder {} is not registered'.format(job['builder']))
+    if job['instance']['loader'] not in loaders:
+        raise ValueError('Loader {} is not registered'.format(job['instance']['loader']))
+
+
+def _lookup(path):
+    """
+        Gets a registered builder or loader, importing it the first time.
+    """
+    if path not in _registered:
+        raise ValueError('{} is not registered'.format(path))
+    if path not in _callables:
+        _callables[path] = resolve(path)
+    return _callables[path]
+
+
+def load_matrix(path=None, shared=None, name=None):
+    """
+        Default instance loader: a ``MatrixInstance`` mapped from a binary file (see ``MatrixInstance.from_binary``) or attached to a shared memory block
+        (see ``MatrixInstance.share``). Either way workers share the pages of the matrix instead of copying it.
+
+    :param path: Path of the binary file.
+    :param shared: Name of the shared memory block, if there is no path.
+    :param name: Name of the instance, the path or block by default.
+    :return: A MatrixInstance.
+    """
+    instance = MatrixInstance(name or path or shared)
+    if path is not None:
+        instance.from_binary(path)
+    elif shared is not None:
+        instance.attach(shared)
+    else:
+        raise ValueError('Matrix instances need a path or a shared memory block')
+    return instance
+
+
+def _load_instance(reference):
+    key = json.dumps(reference, sort_keys=True)
+    if key in _instances:
+        _instances.move_to_end(key)
+    else:
+        _instances[key] = _lookup(reference['loader'])(*reference['args'], **reference['kwargs'])
+        if len(_instances) > INSTANCE_CACHE_SIZE:
+            _instances.popitem(last=False)
+    return _instances[key]
+
+
+def _plain(value):
+    """
+        Converts a value to plain JSON types, so NumPy numbers (like objectives computed with NumPy) can be sent and cached.
+    """
+    return json.loads(json.dumps(value, default=lambda o: o.tolist() if hasattr(o, 'tolist') else str(o)))
+
+
+def _solution_to_json(solution):
+    return json.loads(solution.to_json())
+
+
+def _init_worker(progress, preload, registered):
+    """
+        Sets up a worker process once, so jobs do not pay for imports.
+
+    :param progress: Queue where workers send progress events.
+    :param preload: Modules to import.
+    :param registered: Import paths of the builders and loaders jobs may use.
+    """
+    global _progress, _registered
+    _progress = progress
+    _registered = frozenset(registered)
+    for module in preload:
+        importlib.import_module(module)
+
+
+def _warm_up():
+    """
+        Empty job, sent once to every worker when the service starts so they are all running before the first job arrives.
+    """
+    return None
+
+
+def _run_job(job_id, job):
+    """
+        Runs a job in a worker process. It lives at module level so it can be sent to worker processes.
+
+    :param job_id: Identifier of the job, for progress events.
+    :param job: Normalized job.
+    :return: Dict with the result: objective, feasibility, time, stats and the solution as JSON.
+    """
+    instance = _load_instance(job['instance'])
+    solver = _lookup(job['builder'])(instance, job['seed'], **job['params'])
+    incumbents = job['incumbents']
+    callback = solver.on_improvement
+
+    def on_improvement(solution, elapsed):
+        if callback is not None:
+            callback(solution, elapsed)
+        if _progress is not None:
+            _progress.put((job_id, _plain(solution.objective), elapsed, _solution_to_json(solution) if incumbents else None))
+
+    solver.on_improvement = on_improvement
+    task = solver.solve()
+    return _plain({'objective': task.solution.objective if task.is_feasible else None, 'feasible': task.is_feasible, 'time': task.time,
+                   'stats': task.stats.to_dict() if task.stats is not None else None, 'solution': _solution_to_json(task.solution) if task.solution is not None else None})
@@ -0,0 +1,301 @@
+# -*- coding:utf-8 -*-
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from or_testbed.service import jobs
+from or_testbed.utils.logger import Logger, LogLevel
+
+
+# Events after which a job sends nothing else
+FINAL_EVENTS = ('result', 'failed')
+
+
+class Job:
+    """
+        A job submitted to the service and everything that happened to it.
+
+        ``state`` is one of ``queued``, ``running``, ``done`` or ``failed``. ``events`` holds every event sent for the job so far, so late subscribers get them all.
+    """
+
+    def __init__(self, job_id, spec, key):
+        self.id = job_id
+        self.spec = spec
+        self.key = key
+        self.state = 'queued'
+        self.events = []
+        self.result = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self):
+        return self.state in ('done', 'failed')
+
+
+class ExecutionService:
+    """
+        Runs solve jobs (see ``or_testbed.service.jobs``) on a pool of ``workers`` worker processes that are started once and reused for every job, so jobs do not
+        pay for starting an interpreter, importing modules (give them in ``preload``) or loading instances, which workers keep.
+
+        Jobs may only use the builders and loaders registered in ``builders`` and ``loaders`` (import paths, ``module:callable``), besides the default loader.
+        Anything else is rejected when the job is submitted, so clients can never make workers import or call arbitrary code.
+
+        Jobs wait in a queue and run in the order they were submitted. While a job runs, every new best solution the solver finds is sent back as a ``progress`` event
+        (with its objective and the elapsed time) to everyone listening to the job. Results are cached by job fingerprint in ``cache`` (a ``ResultCache``, None to
+        disable caching), so a job that was already solved returns its result at once, and a job submitted while an identical one is queued or running joins it.
+        If a worker process crashes, every job running on the pool fails and the pool is started again.
+
+        The service is driven by an asyncio event loop: ``start`` it, ``submit`` jobs and read their ``events``, or ``listen`` on a socket and let clients do it
+        (see ``or_testbed.service.client`` for the protocol). Finished jobs are forgotten once there are more than ``history`` of them.
+        Closing the service fails every job that has not finished.
+    """
+
+    def __init__(self, workers=1, preload=(), cache=None, history=1000, mp_context=None, builders=(), loaders=(), debug=True, log_file=None, log_level=LogLevel.ALL):
+        self.logger = Logger(debug=debug, log_file=log_file, log_level=log_level)
+        self.workers = workers
+        self.preload = tuple(preload)
+        self.builders = frozenset(builders)
+        self.loaders = frozenset(loaders) | {jobs.DEFAULT_LOADER}
+        self.cache = cache
+        self.history = history
+        self.mp_context = mp_context if mp_context is not None else multiprocessing.get_context()
+        self.jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._active = {}
+        self._queue = None
+        self._pool = None
+        self._progress = None
+        self._pump = None
+        self._dispatchers = []
+        self._loop = None
+
+    async def start(self):
+        """
+            Starts the worker processes and waits until every one of them is ready.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._progress = self.mp_context.Queue()
+        self._pump = threading.Thread(target=self._pump_progress, daemon=True)
+        self._pump.start()
+        await self._start_pool()
+        self._dispatchers = [self._loop.create_task(self._dispatch()) for _ in range(self.workers)]
+        self.logger.log(LogLevel.INFO, 'Execution service started with {} workers.', self.workers)
+
+    async def _start_pool(self):
+        self._pool = ProcessPoolExecutor(self.workers, mp_context=self.mp_context, initializer=jobs._init_worker,
+                                         initargs=(self._progress, self.preload, sorted(self.builders | self.loaders)))
+        await asyncio.gather(*(self._loop.run_in_executor(self._pool, jobs._warm_up) for _ in range(self.workers)))
+
+    async def close(self):
+        """
+            Stops the service. Every job that has not finished fails, so its listeners get a final event, and worker processes finish the jobs they are running
+            before they stop.
+        """
+        for job in [job for job in self.jobs.values() if not job.finished]:
+            self._finish(job, 'failed', {'event': 'failed', 'id': job.id, 'error': 'service shutting down'})
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._pool is not None:
+            await self._loop.run_in_executor(None, self._pool.shutdown)
+            self._pool = None
+        if self._pump is not None:
+            self._progress.put(None)
+            await self._loop.run_in_executor(None, self._pump.join)
+            self._pump = None
+
+    def submit(self, spec):
+        """
+            Adds a job to the queue, unless its result is cached or an identical job is already queued or running.
+
+        :param spec: Dict with the job.
+        :return: The Job object.
+        """
+        spec = jobs.normalize(spec)
+        jobs.check(spec, self.builders, self.loaders)
+        key = jobs.fingerprint(spec)
+        cacheable = self.cache is not None and spec['seed'] is not None
+        if cacheable and key in self._active:
+            return self._active[key]
+
+        job = Job(str(next(self._ids)), spec, key)
+        self.jobs[job.id] = job
+        cached = self.cache.get(key) if cacheable else None
+        if cached is not None:
+            self._finish(job, 'done', dict(cached, event='result', id=job.id, cached=True), cached)
+            return job
+        if cacheable:
+            self._active[key] = job
+        self._publish(job, {'event': 'queued', 'id': job.id, 'position': self._queue.qsize()})
+        self._queue.put_nowait(job)
+        return job
+
+    async def events(self, job_id):
+        """
+            Events of a job, from the first one, until it finishes.
+
+        :param job_id: Identifier of the job.
+        :return: An async generator of dicts, whose ``event`` field is ``queued``, ``running``, ``progress``, ``result`` or ``failed``.
+        """
+        job = self.jobs[job_id]
+        sent = 0
+        while True:
+            while sent < len(job.events):
+                event = job.events[sent]
+                sent += 1
+                yield event
+                if event['event'] in FINAL_EVENTS:
+                    return
+            changed = job._changed
+            await changed.wait()
+
+    async def result(self, job_id):
+        """
+            Waits for a job to finish.
+
+        :param job_id: Identifier of the job.
+        :return: Its ``result`` or ``failed`` event.
+        """
+        event = None
+        async for event in self.events(job_id):
+            pass
+        return event
+
+    def status(self):
+        """
+            Summary of the service.
+
+        :return: Dict with the number of jobs in each state and the cache hits and misses.
+        """
+        states = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for job in self.jobs.values():
+            states[job.state] += 1
+        retval = {'workers': self.workers, 'jobs': states}
+        if self.cache is not None:
+            retval['cache'] = {'size': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses}
+        return retval
+
+    def _publish(self, job, event):
+        job.events.append(event)
+        job._changed.set()
+        job._changed = asyncio.Event()
+
+    def _finish(self, job, state, event, result=None):
+        job.state = state
+        job.result = result
+        if self._active.get(job.key) is job:
+            del self._active[job.key]
+        self._publish(job, event)
+        finished = [job_id for job_id, other in self.jobs.items() if other.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    async def _dispatch(self):
+        """
+            Takes jobs from the queue and runs them, one at a time. There is one dispatcher per worker.
+        """
+        while True:
+            job = await self._queue.get()
+            job.state = 'running'
+            self._publish(job, {'event': 'running', 'id': job.id})
+            pool = self._pool
+            try:
+                result = await self._loop.run_in_executor(pool, jobs._run_job, job.id, job.spec)
+            except asyncio.CancelledError:
+                raise
+            except BrokenProcessPool:
+                self._finish(job, 'failed', {'event': 'failed', 'id': job.id, 'error': 'Worker process died'})
+                if self._pool is pool:
+                    self.logger.log(LogLevel.INFO, 'A worker process died, restarting the pool.')
+                    pool.shutdown(wait=False)
+                    await self._start_pool()
+            except Exception as e:
+                self._finish(job, 'failed', {'event': 'failed', 'id': job.id, 'error': '{}: {}'.format(type(e).__name__, e)})
+            else:
+                if self.cache is not None and job.spec['seed'] is not None:
+                    self.cache.put(job.key, result)
+                self._finish(job, 'done', dict(result, event='result', id=job.id, cached=False), result)
+
+    def _pump_progress(self):
+        """
+            Forwards progress events from the workers to the event loop. It runs in a thread, since reading the queue blocks.
+        """
+        while True:
+            item = self._progress.get()
+            if item is None:
+                break
+            self._loop.call_soon_threadsafe(self._on_progress, *item)
+
+    def _on_progress(self, job_id, objective, elapsed, solution):
+        job = self.jobs.get(job_id)
+        # Progress may arrive after the result, which already has the final solution
+        if job is not None and job.state == 'running':
+            event = {'event': 'progress', 'id': job_id, 'objective': objective, 'elapsed': elapsed}
+            if solution is not None:
+                event['solution'] = solution
+            self._publish(job, event)
+
+    async def listen(self, path=None, host='127.0.0.1', port=None):
+        """
+            Starts accepting clients on a Unix socket (``path``) or, if ``port`` is given instead, a TCP port. The service must be started.
+            TCP connections are not authenticated, so anybody who can reach the port can submit jobs. Unix sockets are restricted by file permissions.
+
+        :return: The ``asyncio.Server``.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        if port is None:
+            raise ValueError('The service needs a Unix socket path or a TCP port')
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader, writer):
+        """
+            Serves a client: reads requests, one JSON object per line, and writes responses the same way. Anything else (like an HTTP request sent by a browser)
+            closes the connection.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if not isinstance(request, dict):
+                    self.logger.log(LogLevel.INFO, 'Closing a connection that did not send a JSON request.')
+                    break
+                async for response in self._respond(request):
+                    writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request):
+        try:
+            op = request.get('op')
+            if op == 'submit':
+                job = self.submit(request.get('job'))
+                yield {'event': 'accepted', 'id': job.id}
+                async for event in self.events(job.id):
+                    yield event
+            elif op == 'events':
+                async for event in self.events(request['id']):
+                    yield event
+            elif op == 'result':
+                yield await self.result(request['id'])
+            elif op == 'status':
+                yield dict(self.status(), event='status')
+            else:
+                raise ValueError('Unknown operation {}'.format(op))
+        except (ValueError, KeyError, AttributeError, TypeError) as e:
+            yield {'event': 'error', 'message': '{}: {}'.format(type(e).__name__, e)}
@@ -1,11 +1,192 @@
 # -*- coding:utf-8 -*-
 
+import asyncio
+import queue
+import threading
 import time
 from abc import abstractmethod, ABC
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from or_testbed.utils.logger import Logger, LogLevel
+from or_testbed.utils.stats import Stats
+from or_testbed.utils.rng import make_rng, child_seeds
+from or_testbed.solvers.base.stopping import StoppingCriteria
+from or_testbed.solvers.pathrelinking.elite import ElitePool
+from or_testbed.solvers.pathrelinking.relinking import _run_relink
 import or_testbed.entities.task as task
 from or_testbed.solvers.factory import FactoryMixin
-import copy
+import random
+
+
+def _needs_stats(solver):
+    """
+        Checks if a solver must keep stats, either because it is instrumented or because its stopping criteria count evaluations.
+
+    :param solver: Solver or multistart solver.
+    :return: True if the solver needs a Stats object.
+    """
+    return solver.instrument or (solver.stopping is not None and solver.stopping.max_evaluations is not None)
+
+
+def _resume(solver):
+    """
+        Loads the last checkpoint of a solver, if any, restoring its random number generator, its stats and its stopping criteria.
+
+    :param solver: Solver or multistart solver.
+    :return: The state saved by the solver with ``_save_checkpoint``, or None to start from scratch.
+    """
+    if solver.checkpoint is None:
+        return None
+    checkpoint = solver.checkpoint.load()
+    if checkpoint is None:
+        return None
+    if checkpoint['solver'] != solver.name:
+        raise ValueError('Checkpoint {} belongs to {}, not to {}'.format(solver.checkpoint.path, checkpoint['solver'], solver.name))
+
+    solver.rng.setstate(checkpoint['random'])
+    if solver.stats is not None and checkpoint['stats'] is not None:
+        solver.stats.merge(checkpoint['stats'])
+    if solver.stopping is not None:
+        solver.stopping.stagnant = checkpoint['stagnant']
+    solver.logger.log(LogLevel.INFO, 'Resuming {} from checkpoint {}.', solver.name, solver.checkpoint.path)
+    return checkpoint['state']
+
+
+def _save_checkpoint(solver, state):
+    """
+        Saves a checkpoint of a solver, along with the state of its random number generator, its stats and its stopping criteria.
+
+    :param solver: Solver or multistart solver.
+    :param state: Picklable dict with the state of the main loop of the solver.
+    """
+    solver.checkpoint.save({'solver': solver.name, 'random': solver.rng.getstate(), 'stats': solver.stats,
+                            'stagnant': solver.stopping.stagnant if solver.stopping is not None else 0, 'state': state})
+
+
+def _stream_improvements(solver):
+    """
+        Runs a solver in a background thread and yields every new best solution as soon as it is found. See ``Solver.improvements``.
+
+    :param solver: Solver or multistart solver.
+    :return: The task returned by the solver.
+    """
+    found = queue.Queue()
+    done = object()
+    outcome = {}
+    callback = solver.on_improvement
+    stopping = solver.stopping
+
+    def on_improvement(solution, elapsed):
+        if callback is not None:
+            callback(solution, elapsed)
+        found.put((solution, elapsed))
+
+    def run():
+        try:
+            outcome['task'] = solver.solve()
+        except BaseException as e:
+            outcome['error'] = e
+        finally:
+            found.put(done)
+
+    solver.on_improvement = on_improvement
+    # Criteria are always set, so closing the generator early can cancel the run
+    solver.stopping = stopping if stopping is not None else StoppingCriteria()
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = found.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        if thread.is_alive():
+            solver.stopping.cancel()
+            thread.join()
+        solver.on_improvement = callback
+        solver.stopping = stopping
+
+    if 'error' in outcome:
+        raise outcome['error']
+    return outcome['task']
+
+
+def _drain(steps):
+    """
+        Runs the steps of a solver (see ``Solver._steps``) to the end, without slicing them.
+
+    :param steps: Generator of steps.
+    :return: Its return value.
+    """
+    try:
+        while True:
+            next(steps)
+    except StopIteration as e:
+        return e.value
+
+
+async def _drive(steps, yield_every):
+    """
+        Runs the steps of a solver in the event loop, giving control back to it every ``yield_every`` steps and while waiting for futures.
+
+    :param steps: Generator of steps.
+    :param yield_every: Steps between yields.
+    :return: The return value of the generator.
+    """
+    pending = 0
+    try:
+        while True:
+            try:
+                item = next(steps)
+            except StopIteration as e:
+                return e.value
+            if item is not None:
+                await asyncio.wrap_future(item)
+                pending = 0
+            else:
+                pending += 1
+                if pending >= yield_every:
+                    pending = 0
+                    await asyncio.sleep(0)
+    finally:
+        steps.close()
+
+
+def _solve_offloaded(solver):
+    """
+        Solves in an executor. It lives at module level so it can be sent to worker processes.
+    """
+    return solver.solve()
+
+
+async def _solve_async(solver, yield_every, deadline, executor):
+    """
+        Runs a solver in the event loop, or in an executor, as a coroutine. See ``Solver.solve_async``.
+
+    :param solver: Solver or multistart solver.
+    :return: The task returned by the solver.
+    """
+    stopping = solver.stopping
+    if deadline is not None:
+        solver.stopping = (stopping if stopping is not None else StoppingCriteria()).with_deadline(deadline)
+    elif executor is not None and stopping is None:
+        # Criteria are always set, so cancelling the coroutine can stop a run in a thread
+        solver.stopping = StoppingCriteria()
+    try:
+        if executor is not None:
+            future = asyncio.get_running_loop().run_in_executor(executor, _solve_offloaded, solver)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                solver.stopping.cancel()
+                if not isinstance(executor, ProcessPoolExecutor):
+                    # Threads share the solver, which must not change until the run notices it was cancelled
+                    await asyncio.wait([future])
+                raise
+        return await _drive(solver._solve_steps(), yield_every)
+    finally:
+        solver.stopping = stopping
 
 
 class Solver(FactoryMixin, ABC):
@@ -16,30 +197,188 @@ class Solver(FactoryMixin, ABC):
 
         To add new solvers, ``optimize`` method must be overriden, there's where all the solver logic lives.
 
+        If ``instrument`` is True, ``self.stats`` holds a Stats object (see ``or_testbed.utils.stats``) while solving, where ``optimize`` counts events and measures phases.
+        Otherwise it is None and solvers skip any instrumentation.
+
+        Solvers stop earlier if ``stopping`` (a StoppingCriteria object, see ``or_testbed.solvers.base.stopping``) is met, which ``optimize`` checks once per iteration
+        with ``_should_stop``. Every time ``optimize`` finds a new best solution it calls ``_improved``, which in turn calls ``on_improvement(solution, elapsed)`` if set,
+        so the caller always has the best solution so far. Solutions given to ``on_improvement`` are not modified afterwards by the solver, and must not be modified by the caller.
+
+        Solvers that support it save their state with ``checkpoint`` (a Checkpointer object, see ``or_testbed.utils.checkpoint``) and resume from it when solving again.
+        ``optimize`` loads the saved state with ``_resume`` and saves it with ``_save_checkpoint``. The checkpoint is removed once the solver finishes.
+
+        Random numbers are drawn from ``self.rng`` (see ``or_testbed.utils.rng``), which ``optimize`` must pass down to selection strategies. It is built from the ``rng``
+        parameter: a seed, a ``random.Random`` object or a NumPy ``Generator``. By default it is the ``random`` module itself.
+
+        Solvers can also run as coroutines with ``solve_async``, which runs ``_steps`` (a generator version of ``optimize``) giving control back to the event loop
+        every few iterations, so many solvers can share one event loop. Solvers that do not implement ``_steps`` run ``optimize`` in a single slice.
+
     """
 
-    def __init__(self, debug=True, log_file=None, log_level=LogLevel.ALL):
+    def __init__(self, debug=True, log_file=None, log_level=LogLevel.ALL, instrument=False, stopping=None, on_improvement=None, checkpoint=None, rng=None):
         self.logger = Logger(debug=debug, log_file=log_file, log_level=log_level)
         self.name = "BaseSolver"
+        self.instrument = instrument
+        self.stats = None
+        self.stopping = stopping
+        self.on_improvement = on_improvement
+        self.checkpoint = checkpoint
+        self.rng = make_rng(rng)
+        self._started = 0.0
+
+    def reseed(self, seed):
+        """
+            Replaces the random number generator of the solver with a new one.
+
+        :param seed: Seed of the new generator.
+        """
+        self.rng = random.Random(seed)
 
     def solve(self):
         """
             This method runs the solver, measures execution time and logs the result.
 
-        :return: A tuple including a boolean value indicating if the solution is feasible and the solution itself.
+        :return: A task including the solution, a boolean value indicating if it is feasible, the execution time and the stats of the run (if instrumented).
         """
-        start = time.time()
+        self._begin()
         feasible, solution = self.optimize()
-        end = time.time() - start
+        return self._end(feasible, solution)
+
+    def solve_async(self, yield_every=100, deadline=None, executor=None):
+        """
+            Coroutine version of ``solve``. The solver runs in the event loop, giving control back to it every ``yield_every`` iterations, so several solvers
+            (and anything else) can run in the same loop. Interleaved solvers should have their own ``rng``, so their results do not depend on each other.
+
+            The run stops gracefully, returning the best solution so far, at ``deadline`` (an absolute time, as in ``time.time()``, added to ``stopping``) or
+            when ``stopping.cancel()`` is called. Cancelling the coroutine itself stops the run at the next yield and raises ``CancelledError``, as usual in asyncio.
+
+            With an ``executor``, the whole run is offloaded to it instead, for heavy runs that would slow the event loop down. In a thread pool, cancelling the
+            coroutine cancels the run too. In a process pool the solver must be picklable, and it is a copy that runs, so ``on_improvement`` is called in the worker.
+
+        :param yield_every: Iterations between yields.
+        :param deadline: Absolute time to stop at, or None.
+        :param executor: ``concurrent.futures`` executor to run the solver in, or None to run it in the event loop.
+        :return: A coroutine that returns the task of ``solve``.
+        """
+        return _solve_async(self, yield_every, deadline, executor)
+
+    def _steps(self):
+        """
+            Generator version of ``optimize``: it yields None after each iteration, so the run can be sliced, and returns what ``optimize`` returns.
+            Solvers that wait for other processes may also yield ``concurrent.futures.Future`` objects, and resume once they are done.
+            By default ``optimize`` runs as a single step, solvers override both methods, with ``optimize`` running ``_steps`` to the end.
+
+        :return: A generator of steps.
+        """
+        return self.optimize()
+        yield
+
+    def _solve_steps(self):
+        """
+            Generator version of ``solve``.
+        """
+        self._begin()
+        feasible, solution = yield from self._steps()
+        return self._end(feasible, solution)
+
+    def _begin(self):
+        self.stats = Stats() if _needs_stats(self) else None
+        if self.stopping is not None:
+            self.stopping.start()
+        self._started = time.time()
+
+    def _end(self, feasible, solution):
+        end = time.time() - self._started
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        if self.stats is not None:
+            self.stats.add_time('solve', end)
+        if self.stopping is not None and self.stopping.reason is not None:
+            self.logger.log(LogLevel.INFO, '{} stopped. Criteria met: {}', self.name, self.stopping.reason)
         self.logger.log(LogLevel.RESULT, '{solver} Done! Finished in {time} seconds. Objective: {obj}. Feasible: {feasible}\n', solver=self.name, time=round(end, 8),
                         obj=solution.objective if feasible else None, feasible=feasible)
-        return task.Task(solution, feasible, end)
+        self.logger.flush()
+        return task.Task(solution, feasible, end, self.stats)
+
+    def improvements(self):
+        """
+            Runs the solver in a background thread, yielding a ``(solution, elapsed)`` tuple every time a new best solution is found.
+            The task is the return value of the generator. Closing the generator before the solver finishes cancels the run.
+
+        :return: A generator of the best solutions found.
+        """
+        return _stream_improvements(self)
+
+    def _improved(self, solution):
+        """
+            Records that a new best solution was found. Solvers must call it every time they improve their best solution.
+
+        :param solution: New best solution.
+        """
+        if self.stats is not None:
+            self.stats.mark('best')
+        if self.on_improvement is not None:
+            self.on_improvement(solution, time.time() - self._started)
+
+    def _should_stop(self, best_solution, improved):
+        """
+            Checks the stopping criteria at the end of an iteration. Must only be called if ``stopping`` is set.
+
+        :param best_solution: Best solution found so far.
+        :param improved: True if the best solution was improved during the iteration.
+        :return: True if the solver must stop.
+        """
+        self.stopping.iteration(improved)
+        return self.stopping.should_stop(best_solution, self.stats)
+
+    def _resume(self):
+        """
+            Loads the last checkpoint, if any. The random module, stats and stopping criteria are restored too.
+
+        :return: The state given to ``_save_checkpoint``, or None if the solver must start from scratch.
+        """
+        return _resume(self)
+
+    def _save_checkpoint(self, **state):
+        """
+            Saves a checkpoint. Must only be called if ``checkpoint`` is set, at the end of an iteration, so resuming from it continues with the next one.
+
+        :param state: Everything ``optimize`` needs to continue, like current and best solutions and the next iteration.
+        """
+        _save_checkpoint(self, state)
 
     @abstractmethod
     def optimize(self):
         pass
 
 
+def _start_steps(inner_solver_factory, seed, deadline=None):
+    """
+        Steps of a single start of a multistart solver (see ``Solver._steps``).
+
+    :param inner_solver_factory: Factory that creates the solver to run.
+    :param seed: Seed for the random number generator of this start, None to leave it untouched.
+    :param deadline: Absolute time (as in ``time.time()``) the inner solver must stop at, None for no limit.
+    :return: A generator of steps that returns the task of the inner solver.
+    """
+    inner_solver = inner_solver_factory()
+    if seed is not None:
+        inner_solver.reseed(seed)
+    if deadline is not None:
+        stopping = inner_solver.stopping if inner_solver.stopping is not None else StoppingCriteria()
+        inner_solver.stopping = stopping.with_deadline(deadline)
+    return (yield from inner_solver._solve_steps())
+
+
+def _run_start(inner_solver_factory, seed, deadline=None):
+    """
+        Runs a single start of a multistart solver. It lives at module level so it can be sent to worker processes.
+
+    :return: The task returned by the inner solver.
+    """
+    return _drain(_start_steps(inner_solver_factory, seed, deadline))
+
+
 class MultiStartSolver(FactoryMixin):
     """
         Base multistart solver class.
@@ -48,29 +387,301 @@ class MultiStartSolver(FactoryMixin):
 
         It just executes a solver any given amount of times (``iters`` parameter) and returns the best result achieved.
 
+        Starts can be run in parallel by setting ``workers`` to the number of processes to use. In that case ``inner_solver_factory`` (and everything it references) must be picklable,
+        which is the case for factories built with ``as_factory``. Each start runs with its own seed, taken from ``seeds`` if given or derived from ``rng`` otherwise
+        (a seed, a ``random.Random`` object or a NumPy ``Generator``, the ``random`` module by default). Inner solvers are reseeded with the seed of their start, so
+        any start can be replayed alone by building its solver with ``rng=start_seeds[i]``. The best solution is always chosen in start order, so serial and parallel
+        runs with the same seeds return the same result.
+
+        If ``instrument`` is True, the stats of every instrumented inner solver are aggregated into the stats of the returned task, along with the multistart own counters.
+
+        ``stopping`` and ``on_improvement`` work as in ``Solver``, but per start: stagnation counts starts without improvement, the evaluations budget counts the evaluations of
+        instrumented inner solvers and ``on_improvement`` is called with the best solution of a start when it improves the best one so far.
+        The time limit is also given to inner solvers, so they do not run past it. Starts that are already running when the criteria are met still finish.
+
+        With a ``checkpoint``, the progress (finished starts, their seeds and the best solution) is saved after starts, and solving again skips the finished ones.
+
+        Setting ``relinking`` to a ``PathRelinking`` object adds path relinking between the solutions of the starts, see ``PathRelinking``. Its elite pool is kept in ``elite``.
+        Relinked solutions only take part in the choice of the best solution, so in parallel runs (where relinking jobs finish along the remaining starts) the best
+        objective is the same as in serial runs, although a different solution with that objective may be returned.
+
+        ``solve_async`` works as in ``Solver``. Serial runs give control back to the event loop between iterations of their inner solvers, and parallel runs while they wait for their starts.
+
+        Since ``workers``, ``seeds``, ``instrument``, ``stopping``, ``on_improvement``, ``checkpoint``, ``rng`` and ``relinking`` are plain attributes, they can also be set after building
+        any of the multistart solvers.
+
     """
 
-    def __init__(self, iters, inner_solver_factory, debug=True, log_file=None, log_level=LogLevel.ALL):
+    def __init__(self, iters, inner_solver_factory, debug=True, log_file=None, log_level=LogLevel.ALL, workers=1, seeds=None, instrument=False, stopping=None,
+                 on_improvement=None, checkpoint=None, rng=None):
         self.logger = Logger(debug=debug, log_file=log_file, log_level=log_level)
         self.name = 'IteratedBase'
         self.iters = iters
         self.inner_solver_factory = inner_solver_factory
+        self.workers = workers
+        self.seeds = seeds
+        self.instrument = instrument
+        self.stats = None
+        self.stopping = stopping
+        self.on_improvement = on_improvement
+        self.checkpoint = checkpoint
+        self.rng = make_rng(rng)
+        self.relinking = None
+        self.elite = None
+        self.start_seeds = None
         self.best_sol = {'feasible': False, 'solution': None}
+        self._started = 0.0
+        self._executor = None
+        self._relinks = deque()
+
+    def reseed(self, seed):
+        """
+            Replaces the random number generator of the multistart solver with a new one.
+
+        :param seed: Seed of the new generator.
+        """
+        self.rng = random.Random(seed)
+
+    def _make_seeds(self):
+        """
+            Computes the seed of every start. Serial runs without explicit seeds nor generator keep using the random module as it is.
+
+        :return: A list with one seed (or None) per start.
+        """
+        if self.seeds is not None:
+            if len(self.seeds) != self.iters:
+                raise ValueError('Expected {} seeds, got {}'.format(self.iters, len(self.seeds)))
+            return list(self.seeds)
+        if self.workers > 1 or self.rng is not random:
+            return child_seeds(self.rng, self.iters)
+        return [None] * self.iters
+
+    def _start_factory(self, current_iter):
+        """
+            Gets the factory that creates the inner solver of a start. Every start uses ``inner_solver_factory``, subclasses can override this method to set up each
+            start differently (see ``ReactiveGraspConstruct``). It is called right before the start is launched.
+
+        :param current_iter: Index of the start.
+        :return: A factory of solvers.
+        """
+        return self.inner_solver_factory
+
+    def _run_starts(self, seeds, first_start=0):
+        """
+            Runs every start, in this process or in a process pool depending on ``workers``. Starts are launched as previous ones finish, so no more starts are run
+            once the caller stops consuming tasks.
+
+            Besides tasks, it yields the steps of the inner solvers (None) in serial runs and the futures of the starts it is about to wait for in parallel ones,
+            which callers pass on as their own steps (see ``Solver._steps``).
+
+        :param seeds: One seed per start.
+        :param first_start: Index of the first start, when resuming from a checkpoint.
+        :return: An iterable with the task of each start, in start order.
+        """
+        deadline = self.stopping.deadline if self.stopping is not None else None
+        if self.workers > 1:
+            executor = ProcessPoolExecutor(max_workers=self.workers)
+            pending = deque()
+            finished = False
+            # Relinking jobs are sent to the same processes
+            self._executor = executor
+            try:
+                for current_iter, seed in enumerate(seeds, first_start):
+                    pending.append(executor.submit(_run_start, self._start_factory(current_iter), seed, deadline))
+                    if len(pending) >= self.workers:
+                        yield pending[0]
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending[0]
+                    yield pending.popleft().result()
+                # Relinking jobs are waited for as steps, so shutting the pool down does not block
+                for future in list(self._relinks):
+                    yield future
+                finished = True
+            finally:
+                self._executor = None
+                if finished:
+                    executor.shutdown()
+                else:
+                    # Stopped or cancelled: jobs not started yet are dropped and the ones running are left to finish in the background, so closing never blocks
+                    for future in pending:
+                        future.cancel()
+                    for future in self._relinks:
+                        future.cancel()
+                    self._relinks.clear()
+                    executor.shutdown(wait=False)
+        else:
+            for current_iter, seed in enumerate(seeds, first_start):
+                yield (yield from _start_steps(self._start_factory(current_iter), seed, deadline))
+
+    def _update_best(self, current_iter, inner_task):
+        """
+            Keeps the best solution found so far. Ties are resolved in favor of the earliest start.
+
+        :param current_iter: Index of the start that produced the task.
+        :param inner_task: Task returned by the inner solver.
+        :return: True if the best solution was improved.
+        """
+        if self.stats is not None:
+            self.stats.count('starts')
+            if inner_task.stats is not None:
+                self.stats.merge(inner_task.stats)
+
+        if inner_task.is_feasible:
+            return self._offer_best(inner_task.solution, 'Iter {}'.format(current_iter))
+        return False
+
+    def _offer_best(self, solution, source):
+        """
+            Keeps a feasible solution if it is better than the best one so far.
+
+        :param solution: Feasible solution.
+        :param source: Where the solution comes from, for the logs.
+        :return: True if the best solution was improved.
+        """
+        if self.best_sol['solution'] is None or solution.compare_to(self.best_sol['solution']) > 0:
+            self.best_sol['feasible'] = True
+            self.best_sol['solution'] = solution.snapshot()
+            if self.stats is not None:
+                self.stats.count('solution_copies')
+                self.stats.mark('best')
+            if self.on_improvement is not None:
+                self.on_improvement(self.best_sol['solution'], time.time() - self._started)
+            self.logger.log(LogLevel.DEBUG, '{}. Solution Improved. New obj: {}.', source, solution.objective)
+            return True
+        return False
+
+    def _relink_start(self, inner_task):
+        """
+            Offers the solution of a start to the elite pool and, if it enters, relinks it with the elite that differs the most from it. Without worker processes
+            the relinking runs right away, otherwise it is sent to the workers.
+
+        :param inner_task: Task returned by the inner solver.
+        :return: True if a relinked solution improved the best solution.
+        """
+        if inner_task.is_feasible:
+            solution = inner_task.solution.snapshot()
+            guide = self.elite.farthest(solution) if self.elite.add(solution) else None
+            if guide is not None:
+                pair = (solution, guide) if solution.compare_to(guide) > 0 else (guide, solution)
+                if self._executor is None:
+                    return self._relinked(_run_relink(self.relinking, *pair, self.stats is not None))
+                self._relinks.append(self._executor.submit(_run_relink, self.relinking, *pair, self.stats is not None))
+        return self._collect_relinks()
+
+    def _collect_relinks(self, wait=False):
+        """
+            Processes the relinking jobs that already finished, in the order they were sent.
+
+        :param wait: Wait for every pending job.
+        :return: True if a relinked solution improved the best solution.
+        """
+        improved = False
+        while self._relinks and (wait or self._relinks[0].done()):
+            improved = self._relinked(self._relinks.popleft().result()) or improved
+        return improved
+
+    def _relinked(self, result):
+        solution, stats = result
+        if stats is not None:
+            self.stats.merge(stats)
+        return solution is not None and self._offer_best(solution, 'Relinking')
+
+    def _get_state(self, seeds, next_start):
+        """
+            State of the multistart solver saved in checkpoints. Subclasses with more state should extend it, along with ``_set_state``.
+
+        :param seeds: Seeds of every start.
+        :param next_start: Index of the first start that has not finished.
+        :return: A picklable dict.
+        """
+        return {'seeds': seeds, 'next_start': next_start, 'best_sol': dict(self.best_sol), 'elite': self.elite}
+
+    def _set_state(self, state):
+        """
+            Restores the state saved by ``_get_state``.
+
+        :param state: Saved state.
+        :return: The seeds of every start and the index of the first start to run.
+        """
+        self.best_sol = state['best_sol']
+        if state.get('elite') is not None:
+            self.elite = state['elite']
+        return state['seeds'], state['next_start']
+
+    def improvements(self):
+        """
+            Same as ``Solver.improvements``, yielding the best solution of every start that improves the best one so far.
+
+        :return: A generator of the best solutions found.
+        """
+        return _stream_improvements(self)
 
     def solve(self):
+        return _drain(self._solve_steps())
+
+    def solve_async(self, yield_every=100, deadline=None, executor=None):
+        """
+            Same as ``Solver.solve_async``.
+        """
+        return _solve_async(self, yield_every, deadline, executor)
+
+    def _solve_steps(self):
         self.logger.log(LogLevel.INFO, 'Executing {} {} times.', self.name, self.iters)
-        start = time.time()
-        for current_iter in range(self.iters):
-            inner_solver = self.inner_solver_factory()
-            inner_task = inner_solver.solve()
+        # Inner solvers may write to the same log file from worker processes
+        self.logger.flush()
+        self.stats = Stats() if _needs_stats(self) else None
+        stopping = self.stopping
+        if stopping is not None:
+            stopping.start()
+        start = self._started = time.time()
+        checkpoint = self.checkpoint
+        relinking = self.relinking
+        self.elite = ElitePool(relinking.pool_size, relinking.min_distance) if relinking is not None else None
+        state = _resume(self)
+        if state is not None:
+            seeds, first_start = self._set_state(state)
+        else:
+            seeds, first_start = self._make_seeds(), 0
+        self.start_seeds = seeds
+        self._relinks.clear()
 
-            if inner_task.is_feasible:
-                if self.best_sol['solution'] is None or inner_task.solution.compare_to(self.best_sol['solution']) > 0:
-                    self.best_sol['feasible'] = inner_task.is_feasible
-                    self.best_sol['solution'] = copy.deepcopy(inner_task.solution)
-                    self.logger.log(LogLevel.DEBUG, 'Iter {}. Solution Improved. New obj: {}.', current_iter, inner_task.solution.objective)
+        starts = self._run_starts(seeds[first_start:], first_start)
+        current_iter = first_start - 1
+        try:
+            for inner_task in starts:
+                if inner_task is None or isinstance(inner_task, Future):
+                    yield inner_task
+                    continue
+                current_iter += 1
+                improved = self._update_best(current_iter, inner_task)
+                if relinking is not None:
+                    improved = self._relink_start(inner_task) or improved
+                if stopping is not None:
+                    stopping.iteration(improved)
+                    if stopping.should_stop(self.best_sol['solution'], self.stats):
+                        self.logger.log(LogLevel.INFO, '{} stopped after {} starts. Criteria met: {}', self.name, current_iter + 1, stopping.reason)
+                        for future in self._relinks:
+                            future.cancel()
+                        self._relinks.clear()
+                        break
+                if checkpoint is not None and checkpoint.due(current_iter):
+                    # Checkpoints do not keep relinking jobs, so they are finished first
+                    self._collect_relinks(wait=True)
+                    _save_checkpoint(self, self._get_state(seeds, current_iter + 1))
+        finally:
+            # Also when the steps are closed early, so worker processes are released right away
+            starts.close()
+        for future in list(self._relinks):
+            yield future
+        self._collect_relinks(wait=True)
+        if checkpoint is not None:
+            checkpoint.clear()
 
         end = time.time() - start
+        if self.stats is not None:
+            self.stats.add_time('multistart', end)
         self.logger.log(LogLevel.RESULT, '{solver} Done! Finished in {time} seconds. Objective: {obj}. Feasible: {feasible}\n', solver=self.name, time=round(end, 8),
                         obj=self.best_sol['solution'].objective if self.best_sol['feasible'] else None, feasible=self.best_sol['feasible'])
-        return task.Task(self.best_sol['solution'], self.best_sol['feasible'], end)
+        self.logger.flush()
+        return task.Task(self.best_sol['solution'], self.best_sol['feasible'], end, self.stats)
@@ -0,0 +1,112 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    OR-Testbed stopping criteria.
+
+    Besides their own limits (iterations, temperature...), every solver can be given a ``StoppingCriteria`` object to stop earlier. Solvers check it once per iteration
+    (once per start in multistart solvers), and when any of its criteria is met they return the best solution found so far.
+"""
+
+import copy
+import time
+
+
+class StoppingCriteria:
+    """
+        Common stopping criteria for solvers. Every criterion is optional, and the solver stops as soon as any of them is met.
+
+        * ``time_limit``: Seconds since the solver started.
+        * ``max_evaluations``: Fitness evaluations, as counted by the ``fitness_evaluations`` counter of the solver stats.
+        * ``stagnation``: Iterations (starts in multistart solvers) in a row without improving the best solution.
+        * ``target``: Objective value good enough to stop, according to ``sense`` (see ``Solution.compare_to``).
+
+        The object keeps the state of a single run, so solvers reset it with ``start`` when they begin. After the run, ``reason`` tells which criterion stopped the solver,
+        if any. Runs can also be stopped from another thread with ``cancel``.
+    """
+
+    def __init__(self, time_limit=None, max_evaluations=None, stagnation=None, target=None, sense='MIN'):
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.stagnation = stagnation
+        self.target = target
+        self.sense = sense
+        self.deadline = None
+        self.stagnant = 0
+        self.reason = None
+        self.cancelled = False
+        self._cap = None
+
+    def start(self):
+        """
+            Resets the state of the criteria, solvers call it when they begin.
+        """
+        self.deadline = time.time() + self.time_limit if self.time_limit is not None else None
+        if self._cap is not None and (self.deadline is None or self._cap < self.deadline):
+            self.deadline = self._cap
+        self.stagnant = 0
+        self.reason = None
+        self.cancelled = False
+
+    def with_deadline(self, deadline):
+        """
+            Gets a copy of these criteria that also stops at an absolute time. Multistart solvers use it so their inner solvers do not outlive their own time limit.
+
+        :param deadline: Absolute time, as returned by ``time.time()``.
+        :return: A new StoppingCriteria object.
+        """
+        criteria = copy.copy(self)
+        if criteria._cap is None or deadline < criteria._cap:
+            criteria._cap = deadline
+        return criteria
+
+    def cancel(self):
+        """
+            Stops the run at the next check, whatever the other criteria say.
+        """
+        self.cancelled = True
+
+    def iteration(self, improved):
+        """
+            Records that an iteration (or start) finished.
+
+        :param improved: True if the best solution was improved during the iteration.
+        """
+        self.stagnant = 0 if improved else self.stagnant + 1
+
+    def reached(self, solution):
+        """
+            Checks if a solution is as good as the target objective.
+
+        :param solution: Best solution found so far.
+        :return: True if the target is set and reached.
+        """
+        if self.target is None:
+            return False
+        if self.sense == 'MAX':
+            return solution.objective >= self.target
+        return solution.objective <= self.target
+
+    def should_stop(self, best_solution=None, stats=None):
+        """
+            Checks every criterion. ``reason`` is set to the name of the criterion that is met.
+
+        :param best_solution: Best solution found so far, used to check the target.
+        :param stats: Stats of the solver, used to check the evaluations budget.
+        :return: True if the solver must stop.
+        """
+        if self.cancelled:
+            self.reason = 'cancelled'
+        elif self.deadline is not None and time.time() >= self.deadline:
+            self.reason = 'time_limit'
+        elif self.max_evaluations is not None and stats is not None and stats.counters.get('fitness_evaluations', 0) >= self.max_evaluations:
+            self.reason = 'max_evaluations'
+        elif self.stagnation is not None and self.stagnant >= self.stagnation:
+            self.reason = 'stagnation'
+        elif best_solution is not None and self.reached(best_solution):
+            self.reason = 'target'
+        return self.reason is not None
+
+    def __repr__(self):
+        return 'StoppingCriteria(time_limit={}, max_evaluations={}, stagnation={}, target={}, sense={})'.format(self.time_limit, self.max_evaluations, self.stagnation,
+                                                                                                           self.target, self.sense)
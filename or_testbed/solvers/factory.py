@@ -1,5 +1,7 @@
 # -*- coding:utf-8 -*-
 
+import functools
+
 
 class FactoryMixin:
     @classmethod
@@ -7,12 +9,11 @@ class FactoryMixin:
         """
             This class method creates a factory from a class reference (``cls``) and its arguments. It is then used by the solvers which need to be able to instantiate any object like solutions or even other solvers.
 
+            The factory is a ``functools.partial`` object, so it can be pickled and sent to worker processes as long as ``cls`` and its arguments are picklable too.
+
         :param cls: Class Reference
         :param args: Argument list with class parameters
         :param kwargs: Argument dictionary with class parameters
-        :return: A function that, when executed, creates the object itself.
+        :return: A callable that, when executed, creates the object itself.
         """
-        def inner_factory():
-            return cls(*args, **kwargs)
-
-        return inner_factory
+        return functools.partial(cls, *args, **kwargs)
@@ -1 +1,2 @@
-from .construct import GraspConstruct, MultiStartGraspConstruct
+from .construct import GraspConstruct, MultiStartGraspConstruct, RestrictedCandidateList
+from .reactive import ReactiveGraspConstruct
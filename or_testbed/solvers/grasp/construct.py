@@ -1,8 +1,11 @@
 # -*- coding:utf-8 -*-
 
+import itertools
+from bisect import bisect_left, bisect_right
 import or_testbed.solvers.base.solver as base_solver
 import or_testbed.entities.neighborhood as neighborhood
 from or_testbed.utils.logger import LogLevel
+from or_testbed.utils.stats import phase
 
 
 class MultiStartGraspConstruct(base_solver.MultiStartSolver):
@@ -17,6 +20,89 @@ class MultiStartGraspConstruct(base_solver.MultiStartSolver):
         self.name = 'MultiStart GRASP Construct'
 
 
+class RestrictedCandidateList:
+    """
+        Candidates of a GRASP construction sorted by their cost, so the Restricted Candidates List is always a prefix of them.
+
+        Finding the threshold ``c_min + alpha*(c_max - c_min)`` costs O(log n) and candidates can be added or removed one by one, so only the costs that change
+        need to be evaluated again between steps. Candidates with the same cost keep the order in which they were added.
+    """
+
+    def __init__(self):
+        self._keys = []
+        self._candidates = []
+        # Key of every candidate, by identity (candidates are not required to be hashable)
+        self._key_of = {}
+        self._order = itertools.count()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __iter__(self):
+        return iter(self._candidates)
+
+    def rebuild(self, candidates, costs):
+        """
+            Replaces every candidate at once, which is cheaper than adding them one by one.
+
+        :param candidates: List of candidates.
+        :param costs: List of costs associated with each candidate.
+        """
+        entries = sorted(((cost, next(self._order)), candidate) for cost, candidate in zip(costs, candidates))
+        self._keys = [key for key, _ in entries]
+        self._candidates = [candidate for _, candidate in entries]
+        self._key_of = {id(candidate): key for key, candidate in entries}
+
+    def add(self, candidate, cost):
+        """
+            Adds a candidate, or updates its cost if it is already in the list.
+
+        :param candidate: Candidate to add.
+        :param cost: Its cost.
+        """
+        self.remove(candidate)
+        key = (cost, next(self._order))
+        index = bisect_right(self._keys, key)
+        self._keys.insert(index, key)
+        self._candidates.insert(index, candidate)
+        self._key_of[id(candidate)] = key
+
+    def remove(self, candidate):
+        """
+            Removes a candidate, if it is in the list.
+
+        :param candidate: Candidate to remove.
+        """
+        key = self._key_of.pop(id(candidate), None)
+        if key is not None:
+            index = bisect_left(self._keys, key)
+            del self._keys[index]
+            del self._candidates[index]
+
+    def size(self, alpha):
+        """
+            Number of candidates in the RCL, those whose cost fits ``c_min <= c(e) <= c_min + alpha*(c_max - c_min)``.
+
+        :param alpha: GRASP alpha parameter.
+        :return: Length of the RCL, always a prefix of the sorted candidates.
+        """
+        if not self._keys:
+            return 0
+        c_min, c_max = self._keys[0][0], self._keys[-1][0]
+        return bisect_right(self._keys, (c_min + alpha * (c_max - c_min), float('inf')))
+
+    def select(self, alpha, rng):
+        """
+            Picks a random candidate of the RCL.
+
+        :param alpha: GRASP alpha parameter.
+        :param rng: Random number generator to use.
+        :return: The chosen candidate, None if there are no candidates.
+        """
+        size = self.size(alpha)
+        return self._candidates[rng.randrange(size)] if size else None
+
+
 class GraspConstruct(base_solver.Solver):
     """
         GRASP constructive version.
@@ -34,16 +120,25 @@ class GraspConstruct(base_solver.Solver):
         The core of the algorithm is implemented in this class, see ``optimize`` method.
         The developer needs to override the methods that handle the candidates and the greedy function, as that is what is needed to adapt GRASP to any problem.
 
+        A construction is never interrupted by ``stopping`` criteria, since it would leave an incomplete solution. Set them on ``MultiStartGraspConstruct`` instead.
+
+        By default, candidates are built and evaluated from scratch after every insertion. With ``incremental`` set, candidates are kept between steps and the move
+        tells which ones must be removed or evaluated again (see ``Move.update_neighborhood``); moves that do not support it are rebuilt on every step, as usual.
+        When only some costs change, candidates are kept sorted by cost in a ``RestrictedCandidateList``, so each step just evaluates those costs and finds the RCL
+        threshold by bisection. Since the RCL is then sorted by cost, the same random numbers may choose other candidates than the default mode if alpha is greater than 0.
+
         Check examples folder to see how to define and interact with GRASP.
     """
 
-    def __init__(self, instance, solution_factory, grasp_move, alpha, debug=True, log_file=None, log_level=LogLevel.ALL):
-        super().__init__(debug, log_file, log_level)
+    def __init__(self, instance, solution_factory, grasp_move, alpha, debug=True, log_file=None, log_level=LogLevel.ALL, instrument=False, stopping=None,
+                 on_improvement=None, rng=None, incremental=False):
+        super().__init__(debug, log_file, log_level, instrument, stopping, on_improvement, rng=rng)
         self.instance = instance
         self.alpha = alpha
         self.solution_factory = solution_factory
         self.solution = self.solution_factory()
         self.grasp_move = grasp_move
+        self.incremental = incremental
         self.name = "GRASP Construct"
 
     def _filter_candidate_list(self, candidates, costs):
@@ -74,25 +169,106 @@ class GraspConstruct(base_solver.Solver):
 
         :return: Calculated RCL
         """
-        cost_list = [c.fitness(self.solution, self.instance) for c in candidates]
-        rcl = self._filter_candidate_list(candidates, cost_list)
-        return rcl
+        cost_list = self._evaluate(candidates)
+        return self._filter_candidate_list(candidates, cost_list)
+
+    def _evaluate(self, candidates):
+        """
+            Applies the greedy function to a list of candidates.
+
+        :return: List of costs associated with each candidate.
+        """
+        costs = [c.fitness(self.solution, self.instance) for c in candidates]
+        if self.stats is not None:
+            self.stats.count('fitness_evaluations', len(costs))
+        return costs
 
     def optimize(self):
+        return base_solver._drain(self._steps())
+
+    def _steps(self):
         self.logger.log(LogLevel.INFO, 'Executing {} on instance {} with alpha {}.', self.name, self.instance.name, self.alpha)
         self._initialize_solution()
+        if self.incremental:
+            yield from self._construct_incremental()
+        else:
+            yield from self._construct()
 
-        candidates = self.grasp_move.make_neighborhood(self.solution, self.instance)
-        while candidates:
-            rcl = self._make_rcl(candidates)
-            candidate = neighborhood.select_candidate(neighborhood.strategy_factory('random'), rcl, self.solution, self.instance)
-            self.grasp_move.apply(candidate, self.solution)
-            # self._add_candidate(candidate)
-            self.solution.update_objective(self.instance)
-            candidates = self.grasp_move.make_neighborhood(self.solution, self.instance)
-
+        self._improved(self.solution)
         feasible = self.solution.is_feasible(self.instance)
         return feasible, self.solution
 
+    def _construct(self):
+        stats = self.stats
+        with phase(stats, 'neighborhood'):
+            candidates = list(self.grasp_move.make_neighborhood(self.solution, self.instance))
+        if stats is not None:
+            stats.count('neighborhoods')
+        while candidates:
+            with phase(stats, 'rcl'):
+                rcl = self._make_rcl(candidates)
+                candidate = neighborhood.select_candidate(neighborhood.strategy_factory('random'), rcl, self.solution, self.instance, rng=self.rng)
+            with phase(stats, 'move'):
+                self.solution = self.grasp_move.apply_and_update(candidate, self.solution, self.instance)
+            with phase(stats, 'neighborhood'):
+                candidates = list(self.grasp_move.make_neighborhood(self.solution, self.instance))
+            if stats is not None:
+                stats.count('neighborhoods')
+                stats.count('moves_applied')
+            yield
+
+    def _construct_incremental(self):
+        stats = self.stats
+        # Sorted candidates, only kept while the move refreshes some costs at a time
+        rcl = None
+        costs = {}
+        update = None
+        while True:
+            if update is None:
+                with phase(stats, 'neighborhood'):
+                    # Keyed by identity, so candidates can be removed in O(1) keeping their order
+                    pool = {id(c): c for c in self.grasp_move.make_neighborhood(self.solution, self.instance)}
+                if stats is not None:
+                    stats.count('neighborhoods')
+                stale = None
+            else:
+                removed, stale = update
+                for c in removed:
+                    pool.pop(id(c), None)
+                    costs.pop(id(c), None)
+                    if rcl is not None:
+                        rcl.remove(c)
+
+            with phase(stats, 'rcl'):
+                if stale is None:
+                    # Every cost changed, filtering them is cheaper than sorting them
+                    rcl = None
+                    candidates = list(pool.values())
+                    cost_list = self._evaluate(candidates)
+                    costs = {id(c): cost for c, cost in zip(candidates, cost_list)}
+                    if not candidates:
+                        break
+                    rcl_list = self._filter_candidate_list(candidates, cost_list)
+                    candidate = neighborhood.select_candidate(neighborhood.strategy_factory('random'), rcl_list, self.solution, self.instance, rng=self.rng)
+                else:
+                    stale = [c for c in stale if id(c) in pool]
+                    for c, cost in zip(stale, self._evaluate(stale)):
+                        costs[id(c)] = cost
+                        if rcl is not None:
+                            rcl.add(c, cost)
+                    if rcl is None:
+                        rcl = RestrictedCandidateList()
+                        rcl.rebuild(list(pool.values()), [costs[key] for key in pool])
+                    if not rcl:
+                        break
+                    candidate = rcl.select(self.alpha, self.rng)
+            with phase(stats, 'move'):
+                self.solution = self.grasp_move.apply_and_update(candidate, self.solution, self.instance)
+            with phase(stats, 'neighborhood'):
+                update = self.grasp_move.update_neighborhood(pool.values(), candidate, self.solution, self.instance)
+            if stats is not None:
+                stats.count('moves_applied')
+            yield
+
     def _initialize_solution(self):
         pass
@@ -0,0 +1,124 @@
+# -*- coding:utf-8 -*-
+
+import functools
+import or_testbed.solvers.grasp.construct as grasp_construct
+from or_testbed.utils.logger import LogLevel
+
+
+DEFAULT_ALPHAS = (0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+
+class ReactiveGraspConstruct(grasp_construct.MultiStartGraspConstruct):
+    """
+        Reactive GRASP, a multistart GRASP that learns which alpha works best for the instance being solved (Prais and Ribeiro).
+
+        Instead of a fixed alpha, each start draws its alpha from a discrete set (``alphas``) with probabilities that are updated every ``block`` starts.
+        The probability of each alpha is proportional to ``q_i = (z* / A_i) ** amplification``, where ``z*`` is the best objective found so far and ``A_i`` the average
+        objective of the feasible solutions built with that alpha, so alphas that build better solutions on average are chosen more often. Objectives are minimized,
+        as in every multistart solver, and ``(z* / A_i)`` is computed as ``1 / (1 + (A_i - z*) / |z*|)`` so it also works with objectives that are zero or negative.
+        Alphas that have not been tried yet are given the largest ``q_i``, so every alpha gets a chance.
+
+        An alpha is pruned (its probability is set to 0 for the rest of the run) once it has been used ``prune_after`` times and none of its solutions is within
+        ``prune_gap`` (relative to ``|z*|``) of the best one. The alpha that built the best solution among them is never pruned, since the best one may come from
+        path relinking. Set ``prune_after`` to None to never prune alphas.
+
+        ``inner_grasp_factory`` must accept an ``alpha`` argument, like factories of ``GraspConstruct`` built with ``as_factory``, which overrides the alpha it was built with.
+        Probabilities are only updated with starts that already finished, so parallel runs (``workers`` greater than 1) draw alphas with less information than serial
+        ones and may return different results, although each of them is reproducible given its seeds.
+
+        After solving, ``probabilities``, ``uses`` and ``active`` tell, for each alpha, its final probability, how many starts used it and if it was not pruned.
+    """
+
+    def __init__(self, iters, inner_grasp_factory, alphas=DEFAULT_ALPHAS, block=10, amplification=10, prune_after=20, prune_gap=0.05, debug=True, log_file=None,
+                 log_level=LogLevel.ALL):
+        super().__init__(iters, inner_grasp_factory, debug=debug, log_file=log_file, log_level=log_level)
+        self.name = 'Reactive GRASP Construct'
+        self.alphas = list(alphas)
+        self.block = block
+        self.amplification = amplification
+        self.prune_after = prune_after
+        self.prune_gap = prune_gap
+        self._reset()
+
+    def _reset(self):
+        n = len(self.alphas)
+        self.probabilities = [1.0 / n] * n
+        self.uses = [0] * n
+        self.active = [True] * n
+        # Sum and best objective of the feasible solutions built with each alpha
+        self._feasible = [0] * n
+        self._total = [0] * n
+        self._best = [None] * n
+        # Alpha of every start that has been launched but not processed yet
+        self._start_alphas = {}
+        self._finished = 0
+
+    def _start_factory(self, current_iter):
+        """
+            Draws the alpha of a start according to the actual probabilities.
+        """
+        if current_iter not in self._start_alphas:
+            self._start_alphas[current_iter] = self.rng.choices(range(len(self.alphas)), weights=self.probabilities)[0]
+        return functools.partial(self.inner_solver_factory, alpha=self.alphas[self._start_alphas[current_iter]])
+
+    def _update_best(self, current_iter, inner_task):
+        improved = super()._update_best(current_iter, inner_task)
+        i = self._start_alphas.pop(current_iter)
+        self.uses[i] += 1
+        if inner_task.is_feasible:
+            objective = inner_task.solution.objective
+            self._feasible[i] += 1
+            self._total[i] += objective
+            if self._best[i] is None or objective < self._best[i]:
+                self._best[i] = objective
+        self._finished += 1
+        if self._finished % self.block == 0:
+            self._update_probabilities()
+        return improved
+
+    def _gap(self, objective, best):
+        return (objective - best) / abs(best) if best else objective - best
+
+    def _update_probabilities(self):
+        """
+            Prunes the alphas that do not build competitive solutions and computes the probabilities of the rest.
+        """
+        if self.best_sol['solution'] is None:
+            return
+        best = self.best_sol['solution'].objective
+        if self.prune_after is not None:
+            leader = min((i for i in range(len(self.alphas)) if self._best[i] is not None), key=lambda i: self._best[i], default=None)
+            for i, alpha in enumerate(self.alphas):
+                if i == leader:
+                    continue
+                if self.active[i] and self.uses[i] >= self.prune_after and (self._best[i] is None or self._gap(self._best[i], best) > self.prune_gap):
+                    self.active[i] = False
+                    self.logger.log(LogLevel.DEBUG, 'Alpha {} pruned after {} starts.', alpha, self.uses[i])
+
+        q = [(1.0 + self._gap(self._total[i] / self._feasible[i], best)) ** -self.amplification if self._feasible[i] else None for i in range(len(self.alphas))]
+        untried = max((value for value in q if value is not None), default=1.0)
+        q = [(untried if value is None else value) if self.active[i] else 0.0 for i, value in enumerate(q)]
+        total = sum(q)
+        if total > 0:
+            self.probabilities = [value / total for value in q]
+        elif any(self.active):
+            # Every q underflowed, active alphas are given the same chance
+            active = sum(self.active)
+            self.probabilities = [1.0 / active if is_active else 0.0 for is_active in self.active]
+
+    def _get_state(self, seeds, next_start):
+        state = super()._get_state(seeds, next_start)
+        state['reactive'] = {'probabilities': self.probabilities, 'uses': self.uses, 'active': self.active, 'feasible': self._feasible, 'total': self._total,
+                             'best': self._best, 'start_alphas': self._start_alphas, 'finished': self._finished}
+        return state
+
+    def _set_state(self, state):
+        reactive = state['reactive']
+        self.probabilities, self.uses, self.active = reactive['probabilities'], reactive['uses'], reactive['active']
+        self._feasible, self._total, self._best = reactive['feasible'], reactive['total'], reactive['best']
+        self._start_alphas, self._finished = reactive['start_alphas'], reactive['finished']
+        return super()._set_state(state)
+
+    def _solve_steps(self):
+        self._reset()
+        return (yield from super()._solve_steps())
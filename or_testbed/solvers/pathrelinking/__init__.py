@@ -0,0 +1,2 @@
+from .elite import ElitePool
+from .relinking import PathRelinking
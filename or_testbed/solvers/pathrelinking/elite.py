@@ -0,0 +1,66 @@
+# -*- coding:utf-8 -*-
+
+
+class ElitePool:
+    """
+        Bounded set of the best and most diverse solutions found, the source of the pairs that path relinking joins.
+
+        Duplicates are detected in O(1) through solution fingerprints (see ``Solution.fingerprint``). A new solution enters the pool if it is better than every elite,
+        or if the pool is not full (or the solution is better than the worst elite) and it is at least ``min_distance`` away from every elite (see ``Solution.distance_to``).
+        When the pool is full, the worst elite leaves it. Elites are kept from best to worst.
+    """
+
+    def __init__(self, size=10, min_distance=1):
+        self.size = size
+        self.min_distance = min_distance
+        self.solutions = []
+        self._fingerprints = set()
+
+    def __len__(self):
+        return len(self.solutions)
+
+    def __iter__(self):
+        return iter(self.solutions)
+
+    def __contains__(self, solution):
+        return solution.fingerprint() in self._fingerprints
+
+    def add(self, solution):
+        """
+            Offers a solution to the pool. The pool keeps the solution itself, so callers should pass a snapshot if they keep modifying it.
+
+        :param solution: Candidate to elite.
+        :return: True if the solution entered the pool.
+        """
+        fingerprint = solution.fingerprint()
+        if fingerprint in self._fingerprints:
+            return False
+        solutions = self.solutions
+        if len(solutions) >= self.size and solution.compare_to(solutions[-1]) <= 0:
+            return False
+        if solutions and solution.compare_to(solutions[0]) <= 0 and any(solution.distance_to(elite) < self.min_distance for elite in solutions):
+            return False
+
+        if len(solutions) >= self.size:
+            self._fingerprints.discard(solutions.pop().fingerprint())
+        # Pools are small, a linear search keeps them sorted with just compare_to
+        index = next((i for i, elite in enumerate(solutions) if solution.compare_to(elite) > 0), len(solutions))
+        solutions.insert(index, solution)
+        self._fingerprints.add(fingerprint)
+        return True
+
+    def farthest(self, solution):
+        """
+            Elite that differs the most from a solution, the usual guide for relinking it.
+
+        :param solution: Solution to compare with.
+        :return: The farthest elite other than the solution itself (the best one on ties), or None if there is no other elite.
+        """
+        fingerprint = solution.fingerprint()
+        retval, retval_distance = None, -1
+        for elite in self.solutions:
+            if elite.fingerprint() != fingerprint:
+                distance = solution.distance_to(elite)
+                if distance > retval_distance:
+                    retval, retval_distance = elite, distance
+        return retval
@@ -0,0 +1,70 @@
+# -*- coding:utf-8 -*-
+
+import or_testbed.entities.move as base_move
+import or_testbed.entities.neighborhood as neighborhood
+from or_testbed.utils.stats import Stats, phase
+
+
+class PathRelinking:
+    """
+        Path relinking, a post-processing stage for multistart solvers.
+
+        Path relinking explores the solutions that lie between two good solutions. Starting from one of them (the initiating solution), it applies at each step the candidate
+        that best moves it towards the other one (the guiding solution), until it is reached. Candidates come from ``relink_move`` (see ``Move.relink_neighborhood``)
+        and are evaluated incrementally, like in any other solver (see ``Move.apply_and_update``). The best feasible solution found along the path is the result.
+
+        Multistart solvers use it through their ``relinking`` attribute: the solution of every start is offered to an ``ElitePool`` of ``pool_size`` solutions,
+        at least ``min_distance`` apart, and each solution that enters the pool is relinked with the elite that differs the most from it. The better of both is the initiating solution.
+        In parallel runs relinking jobs are sent to the same worker processes as the starts, so they run while the remaining starts do.
+
+        The object only holds the settings, so it can be shared by several solvers and sent to worker processes as long as the instance and the move are picklable.
+    """
+
+    def __init__(self, instance, relink_move, pool_size=10, min_distance=1):
+        if getattr(relink_move.relink_neighborhood, '__func__', None) is base_move.Move.relink_neighborhood.__func__:
+            raise ValueError('{} does not support path relinking, it must override relink_neighborhood'.format(relink_move.__name__))
+        self.instance = instance
+        self.relink_move = relink_move
+        self.pool_size = pool_size
+        self.min_distance = min_distance
+
+    def relink(self, initiating, guiding, stats=None):
+        """
+            Walks the path from one solution to another.
+
+        :param initiating: Solution where the path starts, it is not modified.
+        :param guiding: Solution where the path ends.
+        :param stats: Stats object to count steps and evaluations, or None.
+        :return: The best feasible solution strictly between both of them, or None if the path has no such solution.
+        """
+        instance, move = self.instance, self.relink_move
+        strategy = neighborhood.strategy_factory('best')
+        target = guiding.fingerprint()
+        current = initiating.snapshot()
+        retval = None
+        with phase(stats, 'relinking'):
+            while True:
+                candidates = list(move.relink_neighborhood(current, guiding, instance))
+                if not candidates:
+                    break
+                _, candidate = neighborhood.select_candidate(strategy, candidates, current, instance, stats)
+                current = move.apply_and_update(candidate, current, instance)
+                if stats is not None:
+                    stats.count('relink_steps')
+                if current.fingerprint() == target:
+                    break
+                if (retval is None or current.compare_to(retval) > 0) and current.is_feasible(instance):
+                    retval = current.snapshot()
+        if stats is not None:
+            stats.count('relinks')
+        return retval
+
+
+def _run_relink(relinking, initiating, guiding, instrument):
+    """
+        Runs a single relinking job. It lives at module level so it can be sent to worker processes.
+
+    :return: The result of ``PathRelinking.relink`` and its stats (None if ``instrument`` is False).
+    """
+    stats = Stats() if instrument else None
+    return relinking.relink(initiating, guiding, stats), stats
@@ -1,2 +1,3 @@
 from .simanneal import SimAnneal
 from .multistart import MultiStartSimAnneal
+from .tempering import ParallelTempering
@@ -4,9 +4,8 @@ import or_testbed.solvers.simanneal.exceptions
 import or_testbed.solvers.base.solver as base_solver
 import or_testbed.entities.neighborhood as neighborhood
 import math
-import random
-import copy
 from or_testbed.utils.logger import LogLevel
+from or_testbed.utils.stats import phase
 
 
 class SimAnneal(base_solver.Solver):
@@ -25,8 +24,9 @@ class SimAnneal(base_solver.Solver):
 
         Check examples folder to see how to define and interact with simulated annealing.
     """
-    def __init__(self, instance, initial_solution, available_movs, movs_weight, max_temp, min_temp, alpha, debug=True, log_file=None, log_level=LogLevel.ALL):
-        super().__init__(debug, log_file, log_level)
+    def __init__(self, instance, initial_solution, available_movs, movs_weight, max_temp, min_temp, alpha, debug=True, log_file=None, log_level=LogLevel.ALL, instrument=False,
+                 stopping=None, on_improvement=None, checkpoint=None, rng=None):
+        super().__init__(debug, log_file, log_level, instrument, stopping, on_improvement, checkpoint, rng)
         self.instance = instance
         self.initial_solution = initial_solution
         self.available_movs = available_movs
@@ -43,7 +43,7 @@ class SimAnneal(base_solver.Solver):
         :return: A movement to be made.
         """
 
-        next_mov_class = random.choices(population=self.available_movs, cum_weights=self.movs_weight)[0]
+        next_mov_class = self.rng.choices(population=self.available_movs, cum_weights=self.movs_weight)[0]
         return next_mov_class
 
     def _make_move(self, next_mov, candidate, in_solution):
@@ -54,42 +54,99 @@ class SimAnneal(base_solver.Solver):
         :param in_solution: The solution to make the move to and calculate a new neighbor.
         :return: The new neighbor solution.
         """
-        new_sol = next_mov.apply(candidate, in_solution)
-        new_sol.update_objective(self.instance)
-        return new_sol
+        return next_mov.apply_and_update(candidate, in_solution, self.instance)
 
-    def optimize(self):
-        self.logger.log(LogLevel.INFO, 'Executing Simulated Annealing from {}ºC to {}ºC, {} rate', self.max_temp, self.min_temp, self.alpha)
-        self.logger.log(LogLevel.INFO, 'Initial Solution Objective: {}', self.initial_solution.objective)
-
-        best_sol = copy.deepcopy(self.initial_solution)
-        current_sol = copy.deepcopy(self.initial_solution)
-        current_temp = self.max_temp
-        while current_temp >= self.min_temp:
-            try:
+    def _step(self, current_sol, best_sol, temperature, log_debug=False):
+        """
+            Runs one step of the chain at a given temperature: a random candidate is applied to the current solution if it improves it, or with probability
+            ``exp(fitness / temperature)`` if it worsens it (Metropolis criterion). Parallel tempering runs its replicas with this same step.
+
+        :param current_sol: Current solution of the chain, modified in place.
+        :param best_sol: Best solution of the chain so far.
+        :param temperature: Temperature of the step.
+        :param log_debug: Log debug messages, it is checked once per run by the caller.
+        :return: The best solution of the chain, and True if the step improved it.
+        """
+        stats = self.stats
+        rng = self.rng
+        try:
+            with phase(stats, 'selection'):
                 next_mov = self._select_movement()
-                candidates = next_mov.make_neighborhood(current_sol, self.instance)
-                candidate = neighborhood.select_candidate(neighborhood.strategy_factory('random'), candidates, current_sol, self.instance)
+                candidate = neighborhood.select_from_move(neighborhood.strategy_factory('random'), next_mov, current_sol, self.instance, stats, rng)
                 fitness = candidate.fitness(current_sol, self.instance)
-                if fitness > 0:
+            if stats is not None:
+                stats.count('iterations')
+                stats.count('fitness_evaluations')
+
+            if fitness > 0:
+                with phase(stats, 'move'):
                     self._make_move(next_mov, candidate, current_sol)
+                if stats is not None:
+                    stats.count('moves_accepted')
+                    stats.count('moves_applied')
+                if log_debug:
                     self.logger.log(LogLevel.DEBUG, 'Improved solution by: {}. Move accepted', fitness)
-                    if current_sol.compare_to(best_sol) > 0:
-                        best_sol = copy.deepcopy(current_sol)
-                elif fitness < 0:
-                    # Sometimes bad solutions are accepted.
-                    threshold = math.exp(fitness / current_temp)
-                    if random.random() < threshold:
+                if current_sol.compare_to(best_sol) > 0:
+                    with phase(stats, 'bookkeeping'):
+                        best_sol = current_sol.snapshot()
+                    if stats is not None:
+                        stats.count('solution_copies')
+                    return best_sol, True
+            elif fitness < 0:
+                # Sometimes bad solutions are accepted.
+                threshold = math.exp(fitness / temperature)
+                if rng.random() < threshold:
+                    with phase(stats, 'move'):
                         self._make_move(next_mov, candidate, current_sol)
+                    if stats is not None:
+                        stats.count('moves_accepted')
+                        stats.count('moves_applied')
+                    if log_debug:
                         self.logger.log(LogLevel.DEBUG, 'Worsened solution by: {}. Move Accepted', fitness)
-                    else:
+                else:
+                    if stats is not None:
+                        stats.count('moves_rejected')
+                    if log_debug:
                         self.logger.log(LogLevel.DEBUG, 'Worsened solution by: {}. Move Rejected', fitness)
+        except or_testbed.solvers.simanneal.exceptions.MovementException:
+            pass
+        return best_sol, False
 
-                current_temp *= self.alpha
+    def optimize(self):
+        return base_solver._drain(self._steps())
 
-            except or_testbed.solvers.simanneal.exceptions.MovementException:
-                current_temp *= self.alpha
-                continue
+    def _steps(self):
+        self.logger.log(LogLevel.INFO, 'Executing Simulated Annealing from {}ºC to {}ºC, {} rate', self.max_temp, self.min_temp, self.alpha)
+        self.logger.log(LogLevel.INFO, 'Initial Solution Objective: {}', self.initial_solution.objective)
+
+        stats = self.stats
+        stopping = self.stopping
+        checkpoint = self.checkpoint
+        # Checked once, so debug messages cost nothing when they are not logged
+        log_debug = self.logger.enabled(LogLevel.DEBUG)
+        state = self._resume()
+        if state is not None:
+            best_sol, current_sol, current_temp, iteration = state['best_sol'], state['current_sol'], state['temperature'], state['iteration']
+        else:
+            best_sol = self.initial_solution.snapshot()
+            current_sol = self.initial_solution.snapshot()
+            current_temp = self.max_temp
+            iteration = 0
+            if stats is not None:
+                stats.count('solution_copies', 2)
+
+        while current_temp >= self.min_temp:
+            best_sol, improved = self._step(current_sol, best_sol, current_temp, log_debug)
+            if improved:
+                self._improved(best_sol)
+            current_temp *= self.alpha
+
+            if stopping is not None and self._should_stop(best_sol, improved):
+                break
+            if checkpoint is not None and checkpoint.due(iteration):
+                self._save_checkpoint(best_sol=best_sol, current_sol=current_sol, temperature=current_temp, iteration=iteration + 1)
+            iteration += 1
+            yield
 
         feasible = best_sol.is_feasible(self.instance)
         return feasible, best_sol
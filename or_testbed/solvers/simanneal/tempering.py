@@ -0,0 +1,260 @@
+# -*- coding:utf-8 -*-
+
+import math
+import multiprocessing
+import threading
+from concurrent.futures import Future
+import or_testbed.solvers.base.solver as base_solver
+import or_testbed.solvers.simanneal.simanneal as base_simanneal
+from or_testbed.utils.logger import LogLevel
+from or_testbed.utils.rng import child_seeds
+from or_testbed.utils.stats import Stats
+
+
+class _Replica:
+    """
+        A simulated annealing chain that runs at whatever temperature it is given.
+    """
+
+    def __init__(self, chain_factory, seed, instrument):
+        self.chain = chain_factory(rng=seed)
+        self.instrument = instrument
+        self.current_sol = self.chain.initial_solution.snapshot()
+        self.best_sol = self.current_sol.snapshot()
+
+    def run(self, temperature, steps, best_objective):
+        """
+            Runs some steps of the chain.
+
+        :return: Objective of the current solution, best solution of the chain if its objective is lower than ``best_objective`` (None otherwise) and stats of the steps.
+        """
+        chain = self.chain
+        chain.stats = Stats() if self.instrument else None
+        current_sol, best_sol = self.current_sol, self.best_sol
+        for _ in range(steps):
+            best_sol, _ = chain._step(current_sol, best_sol, temperature)
+        self.best_sol = best_sol
+        return current_sol.objective, best_sol.snapshot() if best_sol.objective < best_objective else None, chain.stats
+
+
+class _ReplicaGroup:
+    """
+        Replicas that live in the same process. Messages to the group only carry temperatures and objectives, solutions are only sent when they improve the best one.
+    """
+
+    def __init__(self, chain_factory, seeds, instrument):
+        self.replicas = {i: _Replica(chain_factory, seed, instrument) for i, seed in seeds.items()}
+
+    def run(self, jobs, steps, best_objective):
+        return {i: self.replicas[i].run(temperature, steps, best_objective) for i, temperature in jobs}
+
+
+class _LocalGroup:
+    """
+        Runs a group of replicas in this process, with the same interface as ``_ProcessGroup``.
+    """
+
+    def __init__(self, chain_factory, seeds, instrument):
+        self.group = _ReplicaGroup(chain_factory, seeds, instrument)
+
+    def submit(self, *args):
+        future = Future()
+        future.set_result(self.group.run(*args))
+        return future
+
+    def close(self, wait=True):
+        pass
+
+
+def _group_worker(connection, chain_factory, seeds, instrument):
+    """
+        Main loop of a worker process, it runs the steps it is asked for until it gets None.
+    """
+    group = _ReplicaGroup(chain_factory, seeds, instrument)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        try:
+            connection.send(group.run(*message))
+        except Exception as e:
+            connection.send(e)
+    connection.close()
+
+
+class _ProcessGroup:
+    """
+        Runs a group of replicas in a worker process.
+    """
+
+    def __init__(self, chain_factory, seeds, instrument):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_group_worker, args=(child_connection, chain_factory, seeds, instrument), daemon=True)
+        self.process.start()
+        child_connection.close()
+        self._future = None
+
+    def submit(self, *args):
+        """
+            Sends a round to the worker. Its answer is waited for in a thread, so the caller can wait on the future without blocking an event loop.
+
+        :return: A future with the results of the replicas of the group.
+        """
+        self.connection.send(args)
+        self._future = future = Future()
+        # Running futures cannot be cancelled, the round is only stopped by closing the group
+        future.set_running_or_notify_cancel()
+        threading.Thread(target=self._receive, args=(future,), daemon=True).start()
+        return future
+
+    def _receive(self, future):
+        try:
+            retval = self.connection.recv()
+        except (EOFError, OSError) as e:
+            # The worker was terminated
+            future.set_exception(e)
+            self.connection.close()
+            return
+        if isinstance(retval, Exception):
+            future.set_exception(retval)
+        else:
+            future.set_result(retval)
+
+    def close(self, wait=True):
+        """
+            Stops the worker.
+
+        :param wait: Let the worker finish and wait for it. Otherwise it is terminated and reaped in a thread, so closing never blocks.
+        """
+        if not wait:
+            self.process.terminate()
+            threading.Thread(target=self.process.join, daemon=True).start()
+            if self._future is None or self._future.done():
+                self.connection.close()
+            return
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self.connection.close()
+
+
+class ParallelTempering(base_solver.Solver):
+    """
+        Parallel tempering (replica exchange) version of Simulated Annealing.
+
+        Instead of cooling a single chain, it runs one chain (replica) per temperature in ``temperatures``, all of them starting from ``initial_solution``. Replicas run
+        ``steps`` steps of simulated annealing at their temperature (see ``SimAnneal._step``), then replicas at adjacent temperatures try to exchange their temperatures,
+        which is accepted with probability ``min(1, exp((1/T_i - 1/T_j) * (E_i - E_j)))``, where ``E`` is the objective of the current solution of each replica (Metropolis criterion).
+        Even and odd pairs of temperatures are tried in alternate rounds. This lets good solutions found at high temperatures go down to low temperatures, where they
+        are refined, and lets solutions stuck at low temperatures go up to escape. It runs ``rounds`` rounds, or less if ``stopping`` is met (checked once per round).
+        Objectives are minimized, as in the acceptance criterion of simulated annealing.
+
+        With ``workers`` greater than 1, replicas are spread over that many worker processes. Each replica keeps its solutions in its process, and exchanges only swap
+        temperatures, so each round just sends a temperature to each replica and gets back an objective (and a solution, only when it improves the best one).
+        Replicas draw their random numbers from their own generator, seeded from ``rng``, and exchanges are decided in the main process, so runs with any number
+        of workers return the same result.
+
+        ``temperatures`` can be built with ``geometric_temperatures``. Like multistart solvers, its problem definitions (and ``initial_solution``) must be picklable
+        to run in worker processes. Checkpoints are not supported.
+    """
+
+    def __init__(self, instance, initial_solution, available_movs, movs_weight, temperatures, rounds, steps=100, workers=1, debug=True, log_file=None, log_level=LogLevel.ALL,
+                 instrument=False, stopping=None, on_improvement=None, rng=None):
+        super().__init__(debug, log_file, log_level, instrument, stopping, on_improvement, rng=rng)
+        self.instance = instance
+        self.initial_solution = initial_solution
+        self.available_movs = available_movs
+        self.movs_weight = movs_weight
+        self.temperatures = list(temperatures)
+        self.rounds = rounds
+        self.steps = steps
+        self.workers = workers
+        self.name = 'Parallel Tempering'
+
+    @staticmethod
+    def geometric_temperatures(max_temp, min_temp, replicas):
+        """
+            Temperatures evenly spaced in a logarithmic scale, the usual choice for parallel tempering.
+
+        :param max_temp: Highest temperature.
+        :param min_temp: Lowest temperature.
+        :param replicas: Number of temperatures.
+        :return: List of temperatures, from lowest to highest.
+        """
+        if replicas == 1:
+            return [min_temp]
+        ratio = (max_temp / min_temp) ** (1.0 / (replicas - 1))
+        return [min_temp * ratio ** i for i in range(replicas)]
+
+    def _make_groups(self, seeds):
+        chain_factory = base_simanneal.SimAnneal.as_factory(self.instance, self.initial_solution, self.available_movs, self.movs_weight, self.temperatures[0],
+                                                            self.temperatures[0], 1.0, debug=False)
+        instrument = self.stats is not None
+        workers = max(1, min(self.workers, len(seeds)))
+        group_class = _ProcessGroup if workers > 1 else _LocalGroup
+        return [group_class(chain_factory, {i: seed for i, seed in enumerate(seeds) if i % workers == g}, instrument) for g in range(workers)]
+
+    def optimize(self):
+        return base_solver._drain(self._steps())
+
+    def _steps(self):
+        self.logger.log(LogLevel.INFO, 'Executing Parallel Tempering with {} replicas from {}ºC to {}ºC', len(self.temperatures), min(self.temperatures), max(self.temperatures))
+        stats = self.stats
+        stopping = self.stopping
+        temperatures = self.temperatures
+        replicas = len(temperatures)
+        seeds = child_seeds(self.rng, replicas)
+        # Replica at each temperature, exchanges swap them
+        order = list(range(replicas))
+        energies = [self.initial_solution.objective] * replicas
+        best_sol = self.initial_solution.snapshot()
+
+        groups = self._make_groups(seeds)
+        finished = False
+        try:
+            for current_round in range(self.rounds):
+                jobs = [[] for _ in groups]
+                for k, i in enumerate(order):
+                    jobs[i % len(groups)].append((i, temperatures[k]))
+                futures = [group.submit(group_jobs, self.steps, best_sol.objective) for group, group_jobs in zip(groups, jobs)]
+
+                results = {}
+                for future in futures:
+                    if not future.done():
+                        yield future
+                    results.update(future.result())
+                improved = False
+                # In replica order, so ties are broken the same way whatever the number of workers
+                for i in range(replicas):
+                    energies[i], solution, replica_stats = results[i]
+                    if replica_stats is not None:
+                        stats.merge(replica_stats)
+                    if solution is not None and solution.compare_to(best_sol) > 0:
+                        best_sol = solution
+                        improved = True
+                if improved:
+                    self._improved(best_sol)
+
+                for k in range(current_round % 2, replicas - 1, 2):
+                    a, b = order[k], order[k + 1]
+                    exponent = (1.0 / temperatures[k] - 1.0 / temperatures[k + 1]) * (energies[a] - energies[b])
+                    if stats is not None:
+                        stats.count('exchange_attempts')
+                    if exponent >= 0 or self.rng.random() < math.exp(exponent):
+                        order[k], order[k + 1] = b, a
+                        if stats is not None:
+                            stats.count('exchanges')
+
+                if stopping is not None and self._should_stop(best_sol, improved):
+                    break
+                yield
+            finished = True
+        finally:
+            # Workers closed early (cancelled runs or errors) may be in the middle of a round, they are terminated instead of waited for
+            for group in groups:
+                group.close(wait=finished)
+
+        feasible = best_sol.is_feasible(self.instance)
+        return feasible, best_sol
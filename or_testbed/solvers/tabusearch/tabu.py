@@ -4,8 +4,7 @@ import or_testbed.solvers.base.solver as base_solver
 from .tabulist import TabuList
 import or_testbed.entities.neighborhood as neighborhood
 from or_testbed.utils.logger import LogLevel
-import copy
-import random
+from or_testbed.utils.stats import phase
 
 
 class TabuSearch(base_solver.Solver):
@@ -21,42 +20,84 @@ class TabuSearch(base_solver.Solver):
         solutions over and over again.
 
         When a candidate is accepted, it is added to the tabu list, sometimes, if no good solution is found, a bad solution can be taken to continue the exploration.
-        When the tabu list is full, elements get discarded in favor of new ones.
+        When the tabu list is full, elements get discarded in favor of new ones. Alternatively, if ``tabu_tenure`` is set, candidates stay in the tabu list for that many iterations,
+        regardless of how many other candidates are added.
 
         Check examples folder to see how to define and interact with tabu search.
     """
-    def __init__(self, instance, initial_solution, available_movs, movs_weight, tabulen=10, iters=10, candidate_selection='first', debug=True, log_file=None, log_level=LogLevel.ALL):
-        super().__init__(debug, log_file, log_level=log_level)
+    def __init__(self, instance, initial_solution, available_movs, movs_weight, tabulen=10, iters=10, candidate_selection='first', debug=True, log_file=None, log_level=LogLevel.ALL,
+                 tabu_tenure=None, instrument=False, stopping=None, on_improvement=None, checkpoint=None, rng=None):
+        super().__init__(debug, log_file, log_level=log_level, instrument=instrument, stopping=stopping, on_improvement=on_improvement, checkpoint=checkpoint, rng=rng)
         self.instance = instance
         self.initial_sol = initial_solution
         self.available_movs = available_movs
         self.movs_weight = movs_weight
         self.tabulen = tabulen
-        self.tabu = TabuList(maxlen=tabulen)
+        self.tabu_tenure = tabu_tenure
+        self.tabu = TabuList(tenure=tabu_tenure) if tabu_tenure is not None else TabuList(maxlen=tabulen)
         self.iters = iters
         self.candidate_selection = candidate_selection
         self.candidates_strategy = neighborhood.strategy_factory(self.candidate_selection)
         self.name = "Tabu Search"
 
     def optimize(self):
+        return base_solver._drain(self._steps())
+
+    def _steps(self):
         self.logger.log(LogLevel.INFO, 'Executing {}, {} iterations. Candidate selection strategy: {}', self.name, self.iters, self.candidate_selection)
         self.logger.log(LogLevel.INFO, 'Initial Solution Objective: {}', self.initial_sol.objective)
 
-        best_sol = copy.deepcopy(self.initial_sol)
-        current_sol = copy.deepcopy(self.initial_sol)
+        stats = self.stats
+        rng = self.rng
+        stopping = self.stopping
+        checkpoint = self.checkpoint
+        # Checked once, so debug messages cost nothing when they are not logged
+        log_debug = self.logger.enabled(LogLevel.DEBUG)
+        state = self._resume()
+        if state is not None:
+            best_sol, current_sol, self.tabu, first_iter = state['best_sol'], state['current_sol'], state['tabu'], state['iteration']
+        else:
+            best_sol = self.initial_sol.snapshot()
+            current_sol = self.initial_sol.snapshot()
+            first_iter = 0
+            if stats is not None:
+                stats.count('solution_copies', 2)
+
+        for iter in range(first_iter, self.iters):
+            improved = False
+            self.tabu.tick(iter)
+            with phase(stats, 'selection'):
+                next_mov_class = rng.choices(population=self.available_movs, cum_weights=self.movs_weight)[0]
+                cost, candidate = neighborhood.select_from_move(self.candidates_strategy, next_mov_class, current_sol, self.instance, stats, rng)
+            if stats is not None:
+                stats.count('iterations')
 
-        for iter in range(self.iters):
-            next_mov_class = random.choices(population=self.available_movs, cum_weights=self.movs_weight)[0]
-            candidates = next_mov_class.make_neighborhood(current_sol, self.instance)
-            cost, candidate = neighborhood.select_candidate(self.candidates_strategy, candidates, current_sol, self.instance)
             if candidate not in self.tabu:
-                self.logger.log(LogLevel.DEBUG, 'Iter {}. Candidate: {} ({})', iter, candidate, cost)
+                if log_debug:
+                    self.logger.log(LogLevel.DEBUG, 'Iter {}. Candidate: {} ({})', iter, candidate, cost)
                 self.tabu.append(candidate)
-                current_sol = next_mov_class.apply(candidate, current_sol)
-                current_sol.update_objective(self.instance)
+                with phase(stats, 'move'):
+                    current_sol = next_mov_class.apply_and_update(candidate, current_sol, self.instance)
+                if stats is not None:
+                    stats.count('moves_accepted')
+                    stats.count('moves_applied')
 
                 if current_sol.compare_to(best_sol) > 0:
-                    best_sol = copy.deepcopy(current_sol)
+                    with phase(stats, 'bookkeeping'):
+                        best_sol = current_sol.snapshot()
+                    if stats is not None:
+                        stats.count('solution_copies')
+                    self._improved(best_sol)
+                    improved = True
+            elif stats is not None:
+                stats.count('tabu_hits')
+                stats.count('moves_rejected')
+
+            if stopping is not None and self._should_stop(best_sol, improved):
+                break
+            if checkpoint is not None and checkpoint.due(iter):
+                self._save_checkpoint(best_sol=best_sol, current_sol=current_sol, tabu=self.tabu, iteration=iter + 1)
+            yield
 
         feasible = best_sol.is_feasible(self.instance)
         return feasible, best_sol
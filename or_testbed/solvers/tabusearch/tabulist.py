@@ -4,7 +4,8 @@
 """
     OR-Testbed implementation of a Tabu List.
 
-    This is a wrapper of Python's deque.
+    Candidates are stored by their tabu key (see ``Candidate.tabu_key``) in a hash map, along with a queue that keeps them in expiry order.
+    This way, checking if a candidate is tabu costs O(1) no matter how long the tabu tenure is.
 """
 
 
@@ -12,22 +13,76 @@ from collections import deque
 
 
 class TabuList:
-    def __init__(self, maxlen=None):
+    """
+        Tabu memory with two expiry policies:
+
+        * Length based (``maxlen``). It behaves like a bounded queue: once the list is full, the oldest entry is dropped when a new one is appended.
+        * Iteration based (``tenure``). An entry appended on iteration ``i`` stays tabu until iteration ``i + tenure``. The solver must call ``tick`` on every iteration.
+
+        A ``maxlen`` or ``tenure`` of 0 means no tabu memory, nothing is stored. Any hashable object may be stored too, in that case the object itself is its key.
+    """
+    def __init__(self, maxlen=None, tenure=None):
         self._maxlen = maxlen
-        self.list = deque(maxlen=maxlen)
+        self._tenure = tenure
+        self._clock = 0
+        # Last iteration in which each key is tabu, and (expiry, key) pairs in the order they expire.
+        self._expiry = {}
+        self._queue = deque()
 
     @property
     def maxlen(self):
         return self._maxlen
 
+    @property
+    def tenure(self):
+        return self._tenure
+
+    @staticmethod
+    def _key(node):
+        return node.tabu_key() if hasattr(node, 'tabu_key') else node
+
+    def _expire(self):
+        queue, expiry = self._queue, self._expiry
+        while queue and queue[0][0] < self._clock:
+            node_expiry, key = queue.popleft()
+            # A key appended again is tabu until its latest expiry
+            if expiry.get(key) == node_expiry:
+                del expiry[key]
+
+    def tick(self, iteration):
+        """
+            Sets the current iteration, expiring the entries whose tenure is over. Length based lists ignore it.
+
+        :param iteration: Current iteration of the solver.
+        """
+        if self._tenure is not None:
+            self._clock = iteration
+            self._expire()
+
     def append(self, node):
-        self.list.append(node)
+        if self._maxlen == 0 or self._tenure == 0:
+            return
+        if self._tenure is not None:
+            node_expiry = self._clock + self._tenure
+        else:
+            # In length based lists the clock counts appended entries
+            self._clock += 1
+            self._expire()
+            node_expiry = self._clock + self._maxlen - 1 if self._maxlen is not None else float('inf')
+
+        key = self._key(node)
+        self._expiry[key] = node_expiry
+        self._queue.append((node_expiry, key))
 
     def index(self, node):
-        try:
-            return self.list.index(node)
-        except ValueError:
-            return -1
+        key = self._key(node)
+        for i, (_, queued_key) in enumerate(self._queue):
+            if queued_key == key:
+                return i
+        return -1
+
+    def __len__(self):
+        return len(self._queue)
 
     def __contains__(self, node):
-        return node in self.list
+        return self._key(node) in self._expiry
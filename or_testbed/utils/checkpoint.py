@@ -0,0 +1,87 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    OR-Testbed solver checkpoints.
+
+    Solvers built with a ``Checkpointer`` periodically save the state of their main loop (current and best solutions, iteration or temperature, tabu memory, stats and the state of
+    the random module) to a file. If the process is killed, building the same solver with the same checkpointer and solving again resumes from the last checkpoint,
+    following exactly the same trajectory as an uninterrupted run. Once the solver finishes, the checkpoint is removed.
+
+    Checkpoints are written atomically: the state is pickled to a temporary file in the same folder, which then replaces the previous checkpoint.
+    Since they are pickles, checkpoints should only be loaded from trusted files.
+"""
+
+import os
+import pickle
+import tempfile
+import time
+
+
+class Checkpointer:
+    """
+        Saves and loads the checkpoints of a solver.
+
+        A checkpoint is due every ``interval`` seconds, or every ``iterations`` iterations (starts in multistart solvers) if set. Both can be combined.
+    """
+
+    def __init__(self, path, interval=60.0, iterations=None):
+        self.path = path
+        self.interval = interval
+        self.iterations = iterations
+        self.last_saved = time.monotonic()
+
+    def due(self, iteration):
+        """
+            Checks if a checkpoint must be saved after an iteration.
+
+        :param iteration: Iteration that just finished, counting from 0.
+        :return: True if the solver should save its state.
+        """
+        if self.iterations is not None and (iteration + 1) % self.iterations == 0:
+            return True
+        return self.interval is not None and time.monotonic() - self.last_saved >= self.interval
+
+    def save(self, state):
+        """
+            Writes a checkpoint atomically, so the file always holds a complete checkpoint even if the process is killed while saving.
+
+        :param state: Picklable dict with the state of the solver.
+        """
+        folder = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=folder, prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                pickle.dump(state, temp_file, protocol=pickle.HIGHEST_PROTOCOL)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self.last_saved = time.monotonic()
+
+    def load(self):
+        """
+            Reads the last checkpoint.
+
+        :return: The saved state, or None if there is no checkpoint.
+        """
+        self.last_saved = time.monotonic()
+        try:
+            with open(self.path, 'rb') as checkpoint_file:
+                return pickle.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+
+    def clear(self):
+        """
+            Removes the checkpoint, solvers call it when they finish.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self):
+        return 'Checkpointer({!r}, interval={}, iterations={})'.format(self.path, self.interval, self.iterations)
@@ -0,0 +1,24 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    Converts JSON matrix instances to the binary format loaded by ``MatrixInstance.from_binary``::
+
+        python -m or_testbed.utils.convert instance.json instance.bin
+"""
+
+import argparse
+from or_testbed.entities.instance import json_to_binary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Converts a JSON matrix instance to binary format.')
+    parser.add_argument('json_path', help='JSON file, a dict of dicts keyed by labels or a list of rows.')
+    parser.add_argument('binary_path', help='Binary file to write.')
+    parser.add_argument('--default', type=float, default=0.0, help='Value of the missing entries of the matrix.')
+    args = parser.parse_args(argv)
+    json_to_binary(args.json_path, args.binary_path, args.default)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,10 @@
 # TODO Add timestamp to log entries.
 
 
+import os
+import queue
+import threading
+import weakref
 from enum import Enum
 
 
@@ -56,16 +60,103 @@ class Message:
         return retval
 
 
+class _LogFile:
+    """
+        Buffered handle of a log file. Every logger writing to the same path shares one handle, so their messages keep the order they were logged in.
+        The file is closed once no logger uses it.
+    """
+    _handles = weakref.WeakValueDictionary()
+    _handles_lock = threading.Lock()
+
+    def __init__(self, path):
+        self._file = open(path, 'a')
+        self._lock = threading.Lock()
+        weakref.finalize(self, self._file.close)
+
+    @classmethod
+    def get(cls, path):
+        key = os.path.abspath(path)
+        with cls._handles_lock:
+            retval = cls._handles.get(key)
+            if retval is None:
+                retval = cls(key)
+                cls._handles[key] = retval
+            return retval
+
+    def write(self, msg):
+        with self._lock:
+            self._file.write(msg + '\n')
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+
 class Logger:
     """
         OR-Testbed logging utility.
 
         It lets the developer to create messages that can be printed to standard output (console) of stored into a file.
+
+        Logging is designed to be cheap inside solver loops: the level is checked before anything is formatted, each message is formatted only once and the log file
+        is kept open (and buffered) instead of being reopened on every message. Loggers writing to the same file share its handle. Solvers can also check ``enabled`` once and skip the ``log`` calls altogether.
+
+        If ``threaded`` is True, messages are written by a background thread, so the caller never waits for the console or the disk. Call ``flush`` to wait until every
+        pending message has been written, and ``close`` to release the log file.
     """
-    def __init__(self, debug=True, log_file=None, log_level=LogLevel.ALL):
-        self.debug = debug
-        self.log_file = log_file
-        self.log_level = log_level
+    def __init__(self, debug=True, log_file=None, log_level=LogLevel.ALL, threaded=False):
+        self._debug = debug
+        self._log_file = log_file
+        self._log_level = log_level
+        self.threaded = threaded
+        self._file = None
+        self._queue = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._update_max_level()
+
+    def _update_max_level(self):
+        # Messages of a level above this value are discarded right away
+        self._max_level = self._log_level.value if self._debug or self._log_file else LogLevel.NONE.value - 1
+
+    @property
+    def debug(self):
+        return self._debug
+
+    @debug.setter
+    def debug(self, in_debug):
+        self._debug = in_debug
+        self._update_max_level()
+
+    @property
+    def log_file(self):
+        return self._log_file
+
+    @log_file.setter
+    def log_file(self, in_log_file):
+        if in_log_file != self._log_file:
+            self.flush()
+            self._file = None
+        self._log_file = in_log_file
+        self._update_max_level()
+
+    @property
+    def log_level(self):
+        return self._log_level
+
+    @log_level.setter
+    def log_level(self, in_log_level):
+        self._log_level = in_log_level
+        self._update_max_level()
+
+    def enabled(self, level):
+        """
+            Checks if messages of some level would be printed or stored. Useful to avoid building costly arguments, or to skip logging in hot loops.
+
+        :param level: Level of message.
+        :return: True if messages of that level are logged, False otherwise.
+        """
+        return level.value <= self._max_level
 
     def log(self, level, strf, *args, **kwargs):
         """
@@ -83,10 +174,71 @@ class Logger:
         :param args: Arguments to be referenced in positional format.
         :param kwargs: Arguments to be referenced in key-value format.
         """
-        msg = Message(strf, *args, **kwargs)
-        if self.log_level >= level:
-            if self.debug:
-                print(msg.mkstring())
-            if self.log_file:
-                with open(self.log_file, 'a') as f:
-                    f.write(msg.mkstring() + '\n')
+        if level.value > self._max_level:
+            return
+
+        msg = strf.format(*args, **kwargs) if args or kwargs else strf
+        if self.threaded:
+            self._enqueue(msg)
+        else:
+            self._write(msg)
+
+    def _write(self, msg):
+        if self._debug:
+            print(msg)
+        if self._log_file:
+            if self._file is None:
+                self._file = _LogFile.get(self._log_file)
+            self._file.write(msg)
+
+    def _enqueue(self, msg):
+        with self._lock:
+            if self._writer is None:
+                self._queue = queue.Queue()
+                self._writer = threading.Thread(target=self._write_pending, args=(self._queue,), daemon=True)
+                self._writer.start()
+        self._queue.put(msg)
+
+    def _write_pending(self, pending):
+        while True:
+            msg = pending.get()
+            try:
+                if msg is None:
+                    return
+                self._write(msg)
+            finally:
+                pending.task_done()
+
+    def flush(self):
+        """
+            Waits until every pending message is written, then flushes the log file.
+        """
+        if self._queue is not None:
+            self._queue.join()
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """
+            Writes every pending message, stops the background writer (if any) and releases the log file, which is closed unless other loggers are writing to it.
+            The logger can still be used afterwards, the file is reopened on demand.
+        """
+        with self._lock:
+            writer, pending = self._writer, self._queue
+            self._writer = self._queue = None
+        if writer is not None:
+            pending.put(None)
+            writer.join()
+        if self._file is not None:
+            self._file.flush()
+            self._file = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attr in ('_file', '_queue', '_writer', '_lock'):
+            state[attr] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,72 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    OR-Testbed random number generators.
+
+    Every solver draws its random numbers from its own generator (``rng``), which it passes down to selection strategies and moves. Any object with the interface of
+    ``random.Random`` works, the ``random`` module itself included. Solvers built without a generator use the ``random`` module, as they always did, while solvers built
+    with a seed or a generator are reproducible no matter what else uses the ``random`` module, and can run side by side in threads or processes.
+"""
+
+import random
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class NumpyRandom(random.Random):
+    """
+        Adapter that lets a NumPy ``Generator`` be used as a ``random.Random`` object. Every method of ``random.Random`` (``randrange``, ``choices``, ``shuffle``...)
+        draws its numbers from the generator.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        super().__init__()
+
+    def random(self):
+        return float(self.generator.random())
+
+    def getrandbits(self, k):
+        if k <= 0:
+            return 0
+        return int.from_bytes(self.generator.bytes((k + 7) // 8), 'little') >> (-k % 8)
+
+    def getstate(self):
+        return self.generator.bit_generator.state
+
+    def setstate(self, state):
+        self.generator.bit_generator.state = state
+
+    def __reduce__(self):
+        return self.__class__, (self.generator,)
+
+
+def make_rng(rng=None):
+    """
+        Gets the random number generator a solver must use.
+
+    :param rng: None to use the ``random`` module, an integer seed, a ``random.Random`` object or a NumPy ``Generator``.
+    :return: An object with the interface of ``random.Random``.
+    """
+    if rng is None:
+        return random
+    if isinstance(rng, int):
+        return random.Random(rng)
+    if numpy is not None and isinstance(rng, numpy.random.Generator):
+        return NumpyRandom(rng)
+    return rng
+
+
+def child_seeds(rng, amount):
+    """
+        Derives independent seeds from a generator, for example one per start of a multistart solver.
+
+    :param rng: Parent random number generator.
+    :param amount: Number of seeds.
+    :return: A list of integer seeds.
+    """
+    return [rng.randrange(2 ** 32) for _ in range(amount)]
@@ -0,0 +1,129 @@
+# -*- coding:utf-8 -*-
+
+
+"""
+    OR-Testbed solver instrumentation.
+
+    Solvers built with ``instrument=True`` keep a ``Stats`` object where they count what happens in their hot paths (neighborhoods built, fitness evaluations, moves
+    accepted or rejected, tabu hits, solution copies...) and accumulate the time spent in each phase. It is returned in the ``stats`` field of the task.
+    Solvers also mark when they find a new best solution, which gives the time to best.
+
+    When instrumentation is disabled solvers hold ``None`` instead, and every counter is skipped with a single check, so there is no overhead at all.
+"""
+
+import time
+
+
+class _Phase:
+    """
+        Context manager that adds the time spent inside it to a phase.
+    """
+    __slots__ = ('stats', 'name', 'start')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stats.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoPhase:
+    """
+        Context manager that does nothing, used when instrumentation is disabled.
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+NO_PHASE = _NoPhase()
+
+
+def phase(stats, name):
+    """
+        Gets a context manager that measures a phase, or a no-op one if ``stats`` is None.
+
+    :param stats: Stats object, or None if instrumentation is disabled.
+    :param name: Name of the phase.
+    :return: A context manager.
+    """
+    return NO_PHASE if stats is None else _Phase(stats, name)
+
+
+class Stats:
+    """
+        Counters and cumulative phase timings (in seconds) of one or more solver runs.
+
+        Marks store the time elapsed since the Stats object was created until some event last happened. They are not aggregated by ``merge``, since times of different runs
+        can not be added.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.timings = {}
+        self.marks = {}
+        self.started = time.perf_counter()
+
+    def count(self, name, amount=1):
+        """
+            Increments a counter.
+
+        :param name: Name of the counter.
+        :param amount: Amount to add.
+        """
+        counters = self.counters
+        counters[name] = counters.get(name, 0) + amount
+
+    def add_time(self, name, seconds):
+        """
+            Adds time to a phase.
+
+        :param name: Name of the phase.
+        :param seconds: Time to add.
+        """
+        timings = self.timings
+        timings[name] = timings.get(name, 0.0) + seconds
+
+    def mark(self, name):
+        """
+            Marks that some event just happened.
+
+        :param name: Name of the event.
+        """
+        self.marks[name] = time.perf_counter() - self.started
+
+    def phase(self, name):
+        """
+            Context manager that adds the time spent inside it to a phase.
+
+        :param name: Name of the phase.
+        """
+        return _Phase(self, name)
+
+    def merge(self, other):
+        """
+            Adds the counters and timings of another Stats object to this one, for example to aggregate multistart runs.
+
+        :param other: Stats object to add.
+        """
+        for name, amount in other.counters.items():
+            self.count(name, amount)
+        for name, seconds in other.timings.items():
+            self.add_time(name, seconds)
+
+    def to_dict(self):
+        return {'counters': dict(self.counters), 'timings': dict(self.timings), 'marks': dict(self.marks)}
+
+    def __repr__(self):
+        return 'Stats({})'.format(self.to_dict())
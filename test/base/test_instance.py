@@ -0,0 +1,123 @@
+# -*- coding:utf-8 -*-
+
+import or_testbed.entities.instance as base_instance
+import concurrent.futures
+import json
+import multiprocessing
+import pickle
+import pytest
+
+cities = {'A': {'B': 3, 'C': 5}, 'B': {'A': 3, 'C': 25}, 'C': {'A': 5, 'B': 25}}
+
+
+def test_matrix_instance():
+    instance = base_instance.MatrixInstance('example', cities)
+
+    assert instance.size == 3
+    assert instance.labels == ['A', 'B', 'C']
+    assert instance.index_of('C') == 2
+    assert instance.label_of(1) == 'B'
+    assert instance.distance(instance.index_of('B'), instance.index_of('C')) == 25
+    assert instance.matrix[0, 0] == 0
+    assert instance.to_dict() == cities
+
+
+def test_matrix_instance_from_file(tmp_path):
+    path = tmp_path / 'example.json'
+    path.write_text(json.dumps(cities))
+
+    instance = base_instance.MatrixInstance('example')
+    instance.from_file(str(path))
+    assert instance.distance(0, 2) == 5
+
+    restored = pickle.loads(pickle.dumps(instance))
+    assert restored.labels == instance.labels
+    assert restored.distance(2, 1) == 25
+
+
+def test_matrix_instance_binary(tmp_path):
+    json_path = tmp_path / 'example.json'
+    json_path.write_text(json.dumps(cities))
+    binary_path = str(tmp_path / 'example.bin')
+    base_instance.json_to_binary(str(json_path), binary_path)
+
+    instance = base_instance.MatrixInstance('example')
+    instance.from_binary(binary_path)
+    assert instance.labels == ['A', 'B', 'C']
+    assert instance.to_dict() == cities
+
+    restored = pickle.loads(pickle.dumps(instance))
+    assert restored.distance(1, 2) == 25
+
+    copy_path = str(tmp_path / 'copy.bin')
+    restored.to_binary(copy_path)
+    with open(binary_path, 'rb') as original, open(copy_path, 'rb') as copy:
+        assert original.read() == copy.read()
+
+
+def test_matrix_instance_bad_binary(tmp_path):
+    path = tmp_path / 'example.bin'
+    path.write_bytes(b'{"A": {"B": 3}}')
+    with pytest.raises(ValueError):
+        base_instance.MatrixInstance('example').from_binary(str(path))
+
+
+def _shared_distance(instance, i, j):
+    return instance.distance(i, j), instance.shared_name
+
+
+def test_matrix_instance_shared():
+    instance = base_instance.MatrixInstance('example', cities)
+    name = instance.share()
+    assert instance.shared_name == name
+    assert instance.to_dict() == cities
+
+    # Pickles carry the name of the block instead of the matrix
+    restored = pickle.loads(pickle.dumps(instance))
+    assert restored.shared_name == name
+    assert restored.to_dict() == cities
+    attached = base_instance.MatrixInstance('example')
+    attached.attach(name)
+    assert attached.distance(1, 2) == 25
+
+    context = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as executor:
+        assert executor.submit(_shared_distance, instance, 2, 0).result() == (5, name)
+
+    # Attached instances never remove the block, the owner does
+    del restored
+    attached.unshare()
+    assert attached.shared_name is None and attached.distance(1, 2) == 25
+    instance.unshare()
+    assert instance.to_dict() == cities
+    with pytest.raises(FileNotFoundError):
+        base_instance.MatrixInstance('example').attach(name)
+
+
+points = {'A': (38.24, 20.42), 'B': (39.57, 26.15), 'C': (40.56, 25.32), 'D': (36.26, 23.12)}
+
+
+def test_coordinate_instance():
+    instance = base_instance.CoordinateInstance('example', points, metric='EUC_2D', cache_size=4)
+    assert instance.size == 4
+    assert instance.index_of('C') == 2
+    assert instance.distance(0, 1) == instance.distance(1, 0) == instance.matrix[1, 0] == 6
+
+    info = instance.cache_info()
+    assert info['hits'] == 2 and info['misses'] == 1
+    assert info['hit_rate'] == 2 / 3
+
+    restored = pickle.loads(pickle.dumps(instance))
+    assert restored.to_dict() == instance.to_dict()
+    assert restored.distance(2, 3) == instance.distance(2, 3)
+    assert restored.cache_info()['misses'] == 1
+
+
+def test_coordinate_instance_batch():
+    rows, cols = [0, 1, 2, 3, 0], [1, 2, 3, 0, 2]
+    for metric in ['EUC_2D', 'CEIL_2D', 'ATT', 'GEO']:
+        instance = base_instance.CoordinateInstance('example', list(points.values()), metric=metric, cache_size=0)
+        assert [float(d) for d in instance.distances(rows, cols)] == [instance.distance(i, j) for i, j in zip(rows, cols)]
+
+    with pytest.raises(ValueError):
+        base_instance.CoordinateInstance('example', points, metric='MAN_3D')
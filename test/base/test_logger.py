@@ -0,0 +1,61 @@
+# -*- coding:utf-8 -*-
+
+from or_testbed.utils.logger import Logger, LogLevel
+
+
+class Unformattable:
+    def __format__(self, format_spec):
+        raise AssertionError('Filtered messages must not be formatted')
+
+
+def test_filtered_messages():
+    logger = Logger(debug=True, log_level=LogLevel.INFO)
+    assert logger.enabled(LogLevel.RESULT)
+    assert not logger.enabled(LogLevel.DEBUG)
+    logger.log(LogLevel.DEBUG, 'Hidden {}', Unformattable())
+
+    silent = Logger(debug=False)
+    assert not silent.enabled(LogLevel.RESULT)
+    silent.log(LogLevel.RESULT, 'Hidden {}', Unformattable())
+
+
+def test_log_file(tmp_path):
+    path = tmp_path / 'log.txt'
+    logger = Logger(debug=False, log_file=str(path), log_level=LogLevel.INFO)
+    logger.log(LogLevel.INFO, 'Hello, {}', 'World')
+    logger.log(LogLevel.INFO, 'Hello, {name}', name='James')
+    logger.log(LogLevel.DEBUG, 'Hidden')
+    logger.flush()
+    assert path.read_text() == 'Hello, World\nHello, James\n'
+    logger.close()
+
+
+def test_threaded_log_file(tmp_path):
+    path = tmp_path / 'log.txt'
+    logger = Logger(debug=False, log_file=str(path), threaded=True)
+    for i in range(100):
+        logger.log(LogLevel.DEBUG, 'Message {}', i)
+    logger.flush()
+    assert path.read_text().splitlines() == ['Message {}'.format(i) for i in range(100)]
+    logger.close()
+
+
+def test_level_changes():
+    logger = Logger(debug=False, log_level=LogLevel.INFO)
+    assert not logger.enabled(LogLevel.RESULT)
+    logger.debug = True
+    assert logger.enabled(LogLevel.INFO)
+    logger.log_level = LogLevel.DEBUG
+    assert logger.enabled(LogLevel.DEBUG)
+
+
+def test_shared_log_file(tmp_path):
+    path = tmp_path / 'log.txt'
+    outer = Logger(debug=False, log_file=str(path))
+    inner = Logger(debug=False, log_file=str(path))
+    outer.log(LogLevel.INFO, 'Outer')
+    inner.log(LogLevel.INFO, 'Inner')
+    inner.close()
+    outer.log(LogLevel.INFO, 'Outer again')
+    outer.close()
+    assert path.read_text() == 'Outer\nInner\nOuter again\n'
@@ -0,0 +1,47 @@
+# -*- coding:utf-8 -*-
+
+import or_testbed.entities.instance as base_instance
+from or_testbed.entities.neighbors import NeighborLists
+import pickle
+
+points = [(0, 0), (1, 0), (3, 0), (0, 2), (5, 5), (2, 2)]
+
+
+def test_neighbor_lists():
+    instance = base_instance.CoordinateInstance('example', points)
+    lists = instance.neighbor_lists(2)
+    assert lists is instance.neighbor_lists(2)
+    for i in range(instance.size):
+        # Nearest first, ties broken by index
+        expected = sorted((j for j in range(instance.size) if j != i), key=lambda j: (instance.distance(i, j), j))[:2]
+        assert list(lists.of(i)) == expected
+
+    dense = base_instance.MatrixInstance('example', [[instance.distance(i, j) for j in range(instance.size)] for i in range(instance.size)])
+    assert list(dense.neighbor_lists(2).neighbors) == list(lists.neighbors)
+    assert instance.neighbor_lists(10).k == instance.size - 1
+
+
+def test_neighbor_pairs():
+    lists = base_instance.CoordinateInstance('example', points).neighbor_lists(1)
+    first, second = lists.pairs()
+    assert list(zip(first, second)) == [(0, 1), (0, 3), (1, 2), (1, 5), (4, 5)]
+    first, second = lists.pairs(exclude=(5,))
+    assert list(zip(first, second)) == [(0, 1), (0, 3), (1, 2)]
+
+
+def test_neighbor_lists_cache(tmp_path):
+    path = str(tmp_path / 'example.knn')
+    instance = base_instance.CoordinateInstance('example', points)
+    lists = instance.neighbor_lists(3, path)
+    loaded = NeighborLists.load(path)
+    assert (loaded.size, loaded.k) == (6, 3)
+    assert list(loaded.neighbors) == list(lists.neighbors)
+
+    restored = pickle.loads(pickle.dumps(instance))
+    assert list(restored.neighbor_lists(3).neighbors) == list(lists.neighbors)
+    assert NeighborLists.cached(instance, 2, path).k == 2
+
+    # Another instance with the same number of elements does not reuse the file
+    moved = base_instance.CoordinateInstance('example', [(x, -y) for x, y in points[::-1]])
+    assert list(NeighborLists.cached(moved, 3, path).neighbors) == list(moved.neighbor_lists(3).neighbors)
+    assert NeighborLists.load(path).fingerprint != NeighborLists.cached(instance, 3, str(tmp_path / 'other.knn')).fingerprint
@@ -0,0 +1,97 @@
+# -*- coding:utf-8 -*-
+
+import or_testbed.entities.permutation as base_permutation
+from or_testbed.solvers.pathrelinking import ElitePool
+
+
+class Permutation(base_permutation.PermutationSolution):
+    def is_feasible(self, in_instance):
+        return True
+
+    def calculate_objective(self, in_instance):
+        return 0
+
+
+def check_positions(solution):
+    assert all(solution.position(element) == i for i, element in enumerate(solution.sequence))
+    assert len(solution.positions) == len(solution)
+
+
+def test_permutation_operations():
+    solution = Permutation(['a', 'b', 'c', 'd', 'e'])
+    assert 'c' in solution
+    assert solution.position('d') == 3
+
+    solution.swap(0, 4)
+    assert solution.sequence == ['e', 'b', 'c', 'd', 'a']
+    check_positions(solution)
+
+    solution.swap_elements('b', 'd')
+    assert solution.sequence == ['e', 'd', 'c', 'b', 'a']
+    check_positions(solution)
+
+    solution.reverse(1, 3)
+    assert solution.sequence == ['e', 'b', 'c', 'd', 'a']
+    check_positions(solution)
+
+    solution.insert(2, 'f')
+    solution.append('g')
+    assert solution.sequence == ['e', 'b', 'f', 'c', 'd', 'a', 'g']
+    check_positions(solution)
+
+    assert 'positions' not in solution.to_dict()
+
+
+def test_permutation_snapshot():
+    solution = Permutation(['a', 'b', 'c'], objective=10)
+    snapshot = solution.snapshot()
+
+    solution.swap(0, 2)
+    solution.set_objective(5)
+    assert snapshot.sequence == ['a', 'b', 'c']
+    assert snapshot.position('a') == 0
+
+    solution.restore(snapshot)
+    assert solution.sequence == ['a', 'b', 'c']
+    assert solution.objective == 10
+    check_positions(solution)
+
+    solution.swap(0, 1)
+    assert snapshot.sequence == ['a', 'b', 'c']
+
+
+def test_permutation_fingerprint_and_distance():
+    solution = Permutation(['a', 'b', 'c', 'd'])
+    other = solution.snapshot()
+    assert solution.fingerprint() == other.fingerprint()
+    assert solution.distance_to(other) == 0
+
+    other.swap(1, 3)
+    assert solution.fingerprint() != other.fingerprint()
+    assert solution.distance_to(other) == 2
+    assert {solution.fingerprint(), other.fingerprint(), solution.snapshot().fingerprint()} == {solution.fingerprint(), other.fingerprint()}
+
+
+def test_elite_pool():
+    def make(sequence, objective):
+        return Permutation(list(sequence), objective)
+
+    pool = ElitePool(size=3, min_distance=3)
+    assert pool.add(make('abcde', 10))
+    # Duplicates never enter
+    assert not pool.add(make('abcde', 10))
+    # Too close to an elite, unless it is the best so far
+    assert not pool.add(make('abced', 12))
+    assert pool.add(make('abced', 9))
+    assert pool.add(make('edcba', 11))
+    assert [s.objective for s in pool] == [9, 10, 11]
+
+    # Full pool, the worst elite leaves
+    assert not pool.add(make('baedc', 20))
+    assert pool.add(make('baedc', 8))
+    assert [s.objective for s in pool] == [8, 9, 10]
+    assert make('edcba', 11) not in pool
+
+    assert pool.farthest(make('abcde', 10)).sequence == list('baedc')
+    assert ElitePool().farthest(make('abcde', 10)) is None
+
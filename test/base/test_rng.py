@@ -0,0 +1,28 @@
+# -*- coding:utf-8 -*-
+
+from or_testbed.utils.rng import make_rng, child_seeds
+import pickle
+import random
+import pytest
+
+
+def test_make_rng():
+    assert make_rng() is random
+    seeded = make_rng(7)
+    assert seeded.random() == random.Random(7).random()
+    generator = random.Random(3)
+    assert make_rng(generator) is generator
+    assert child_seeds(random.Random(1), 3) == child_seeds(random.Random(1), 3)
+
+
+def test_numpy_rng():
+    numpy = pytest.importorskip('numpy')
+    rng = make_rng(numpy.random.default_rng(5))
+    state = rng.getstate()
+    drawn = [rng.randrange(10), rng.random(), rng.choices('abc', cum_weights=[1, 2, 3])[0]]
+    rng.setstate(state)
+    assert [rng.randrange(10), rng.random(), rng.choices('abc', cum_weights=[1, 2, 3])[0]] == drawn
+    assert 0 <= rng.randrange(2 ** 70) < 2 ** 70
+
+    copy = pickle.loads(pickle.dumps(rng))
+    assert copy.random() == rng.random()
@@ -36,3 +36,11 @@ def test_bad_ms_solver():
     assert not task.is_feasible
     assert task.solution is None
 
+
+def test_bad_ms_solver_parallel():
+    bms = BadMultiStartSolver()
+    bms.workers = 2
+    task = bms.solve()
+
+    assert not task.is_feasible
+    assert task.solution is None
@@ -6,10 +6,11 @@
     Yes, it's basically the same code as in the examples replicated here, maybe not the smartest idea out there.
 """
 
-import or_testbed.entities.solution as base_solution
+import or_testbed.entities.permutation as base_permutation
 import or_testbed.entities.instance as base_instance
 import or_testbed.entities.candidate as base_candidate
 import or_testbed.entities.move as base_move
+from or_testbed.utils.checkpoint import Checkpointer
 import itertools
 
 
@@ -19,11 +20,21 @@ class TSPInstance(base_instance.Instance):
         self.initial_city = initial_city
 
 
-class TSPSolution(base_solution.Solution):
+class TSPSolution(base_permutation.PermutationSolution):
     def __init__(self, initial_city):
-        super().__init__()
+        super().__init__([initial_city])
         self.initial_city = initial_city
-        self.cities = [initial_city]
+
+    @property
+    def cities(self):
+        return self.sequence
+
+    @cities.setter
+    def cities(self, in_cities):
+        self.set_sequence(in_cities)
+
+    def to_dict(self):
+        return {'objective': self.objective, 'initial_city': self.initial_city, 'cities': list(self.cities)}
 
     def is_feasible(self, in_instance):
         predicates = [
@@ -45,48 +56,100 @@ class TSPGraspCandidate(base_candidate.Candidate):
         last_visited = solution.cities[-1]
         return instance.data[last_visited][self.city]
 
+    def delta(self, solution, instance):
+        first, last = solution.cities[0], solution.cities[-1]
+        retval = instance.data[self.city][last] + instance.data[first][self.city]
+        if len(solution.cities) > 1:
+            retval -= instance.data[first][last]
+        return retval
+
 
 class TSPGraspMove(base_move.Move):
     @staticmethod
     def make_neighborhood(solution, instance):
-        return [TSPGraspCandidate(city=c) for c in instance.data[solution.cities[-1]].keys() if c not in solution.cities]
+        return [TSPGraspCandidate(city=c) for c in instance.data[solution.cities[-1]].keys() if c not in solution]
 
     @staticmethod
     def apply(in_candidate, in_solution):
-        in_solution.cities.append(in_candidate.city)
+        in_solution.append(in_candidate.city)
         return in_solution
 
+    @staticmethod
+    def update_neighborhood(candidates, applied, solution, instance):
+        # The new city is no longer available, and every cost depends on the last city visited
+        return [applied], None
+
+
+def swap_delta(cities, c1, c2, instance):
+    n = len(cities)
+    # Only the edges touching both positions change, each edge is stored as (position, previous position)
+    edges = {(i % n, (i - 1) % n) for c in (c1, c2) for i in (c, c + 1)}
+    swapped = {c1: cities[c2], c2: cities[c1]}
+
+    retval = 0
+    for a, b in edges:
+        retval += instance.data[swapped.get(a, cities[a])][swapped.get(b, cities[b])] - instance.data[cities[a]][cities[b]]
+    return retval
+
 
 class SwapCitiesCandidate(base_candidate.Candidate):
+    tabu_attributes = ('city1', 'city2')
+
     def __init__(self, city1, city2):
         self.city1 = city1
         self.city2 = city2
 
     def fitness(self, solution, instance):
-        c1 = solution.cities.index(self.city1)
-        c2 = solution.cities.index(self.city2)
+        return -self.delta(solution, instance)
 
-        obj_before = solution.objective
-
-        solution.cities[c1], solution.cities[c2] = solution.cities[c2], solution.cities[c1]
-        obj_after = solution.calculate_objective(instance)
-        solution.cities[c2], solution.cities[c1] = solution.cities[c1], solution.cities[c2]
-
-        retval = obj_before - obj_after
-        return retval
+    def delta(self, solution, instance):
+        return swap_delta(solution.cities, solution.position(self.city1), solution.position(self.city2), instance)
 
 
 class SwapCitiesMove(base_move.Move):
     @staticmethod
-    def make_neighborhood(solution, instance):
+    def swaps(instance):
         swaps = itertools.combinations(instance.data.keys(), 2)
-        swaps = filter(lambda x: x[0] != instance.initial_city and x[1] != instance.initial_city, swaps)
-        return [SwapCitiesCandidate(city1=s[0], city2=s[1]) for s in swaps]
+        return filter(lambda x: x[0] != instance.initial_city and x[1] != instance.initial_city, swaps)
 
     @staticmethod
-    def apply(in_candidate, in_solution):
-        first_city = in_solution.cities.index(in_candidate.city1)
-        second_city = in_solution.cities.index(in_candidate.city2)
+    def make_neighborhood(solution, instance):
+        return (SwapCitiesCandidate(city1=s[0], city2=s[1]) for s in SwapCitiesMove.swaps(instance))
+
+    @staticmethod
+    def relink_neighborhood(solution, guide, instance):
+        # Swapping a city with the one the guide visits in its position puts the latter in place
+        return [SwapCitiesCandidate(city1=a, city2=b) for a, b in zip(solution.cities, guide.cities) if a != b]
+
+    @staticmethod
+    def batch_fitness(solution, instance):
+        positions = solution.positions
+        return [-swap_delta(solution.cities, positions[s[0]], positions[s[1]], instance) for s in SwapCitiesMove.swaps(instance)]
+
+    @staticmethod
+    def sample_candidate(solution, instance, rng):
+        c1, c2 = rng.sample(range(1, len(solution.cities)), 2)
+        return SwapCitiesCandidate(city1=solution.cities[c1], city2=solution.cities[c2])
 
-        in_solution.cities[first_city], in_solution.cities[second_city] = in_solution.cities[second_city], in_solution.cities[first_city]
+    @staticmethod
+    def apply(in_candidate, in_solution):
+        in_solution.swap_elements(in_candidate.city1, in_candidate.city2)
         return in_solution
+
+
+# Checkpoint helpers shared by the tests of every solver
+class Killed(Exception):
+    pass
+
+
+class KillingCheckpointer(Checkpointer):
+    # Simulates a process killed right after saving some checkpoints
+    def __init__(self, path, iterations, saves):
+        super().__init__(path, interval=None, iterations=iterations)
+        self.saves = saves
+
+    def save(self, state):
+        super().save(state)
+        self.saves -= 1
+        if self.saves == 0:
+            raise Killed()
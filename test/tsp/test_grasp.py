@@ -1,6 +1,8 @@
 from .definition import *
 from .instances import example_cities, example_initial_city
 import or_testbed.solvers.grasp as base_grasp
+from or_testbed.solvers.base.stopping import StoppingCriteria
+from or_testbed.utils.checkpoint import Checkpointer
 import random
 import pytest
 
@@ -31,6 +33,57 @@ def test_random_grasp():
     assert task.solution.objective == 43  # TODO no magic numbers pls
 
 
+class ClosestToInitialCandidate(TSPGraspCandidate):
+    def fitness(self, solution, instance):
+        return instance.data[solution.initial_city][self.city]
+
+
+class ClosestToInitialMove(TSPGraspMove):
+    """
+        Visits cities by their distance to the initial one, so costs never change while constructing.
+    """
+    @staticmethod
+    def make_neighborhood(solution, instance):
+        return [ClosestToInitialCandidate(city=c) for c in instance.data[solution.cities[-1]].keys() if c not in solution]
+
+    @staticmethod
+    def update_neighborhood(candidates, applied, solution, instance):
+        return [applied], []
+
+
+def test_incremental_grasp():
+    for alpha in (0.0, 0.3, 1.0):
+        default = base_grasp.GraspConstruct(tsp_instance, alpha=alpha, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False, rng=7)
+        incremental = base_grasp.GraspConstruct(tsp_instance, alpha=alpha, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False, rng=7,
+                                                instrument=True, incremental=True)
+        task = incremental.solve()
+        assert task.solution.cities == default.solve().solution.cities
+        # The neighborhood is only built once
+        assert task.stats.counters['neighborhoods'] == 1
+
+    default = base_grasp.GraspConstruct(tsp_instance, alpha=0.0, solution_factory=tsp_solution_factory, grasp_move=ClosestToInitialMove, debug=False)
+    incremental = base_grasp.GraspConstruct(tsp_instance, alpha=0.0, solution_factory=tsp_solution_factory, grasp_move=ClosestToInitialMove, debug=False,
+                                            instrument=True, incremental=True)
+    task = incremental.solve()
+    assert task.solution.cities == default.solve().solution.cities
+    assert task.solution.objective == task.solution.calculate_objective(tsp_instance)
+    # Costs are evaluated once
+    assert task.stats.counters['fitness_evaluations'] == len(tsp_instance.data) - 1
+
+
+def test_restricted_candidate_list():
+    rcl = base_grasp.RestrictedCandidateList()
+    candidates = [TSPGraspCandidate(city=c) for c in range(5)]
+    rcl.rebuild(candidates, [4, 0, 3, 1, 2])
+    assert rcl.size(0.0) == 1
+    assert rcl.size(0.5) == 3
+    assert rcl.size(1.0) == 5
+    rcl.remove(candidates[1])
+    rcl.add(candidates[0], -1)
+    assert rcl.select(0.0, random) is candidates[0]
+    assert [c.city for c in rcl] == [0, 3, 4, 2]
+
+
 def test_grasp_multistart():
     random.seed(12345)
 
@@ -40,3 +93,103 @@ def test_grasp_multistart():
 
     assert task.is_feasible is True
     assert task.solution.objective == 17  # TODO no magic numbers pls
+
+
+def test_grasp_multistart_parallel():
+    seeds = list(range(25))
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=0.3, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+
+    serial = base_grasp.MultiStartGraspConstruct(iters=25, inner_grasp_factory=tsp_grasp_factory, debug=False)
+    serial.seeds = seeds
+    serial_task = serial.solve()
+
+    parallel = base_grasp.MultiStartGraspConstruct(iters=25, inner_grasp_factory=tsp_grasp_factory, debug=False)
+    parallel.seeds = seeds
+    parallel.workers = 2
+    parallel_task = parallel.solve()
+
+    assert parallel_task.is_feasible is True
+    assert parallel_task.solution.objective == serial_task.solution.objective
+    assert parallel_task.solution.cities == serial_task.solution.cities
+
+
+def test_grasp_multistart_stopping():
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=1.0, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+    stopping = StoppingCriteria(stagnation=2)
+    improvements = []
+    tsp_multistart = base_grasp.MultiStartGraspConstruct(iters=1000, inner_grasp_factory=tsp_grasp_factory)
+    tsp_multistart.stopping = stopping
+    tsp_multistart.on_improvement = lambda solution, elapsed: improvements.append(solution.objective)
+    tsp_multistart.instrument = True
+    task = tsp_multistart.solve()
+    assert stopping.reason == 'stagnation'
+    assert task.stats.counters['starts'] < 1000
+    assert improvements[-1] == task.solution.objective
+
+    stopping = StoppingCriteria(time_limit=0.0)
+    tsp_multistart = base_grasp.MultiStartGraspConstruct(iters=1000, inner_grasp_factory=tsp_grasp_factory)
+    tsp_multistart.stopping = stopping
+    tsp_multistart.workers = 2
+    task = tsp_multistart.solve()
+    assert stopping.reason == 'time_limit'
+    assert task.is_feasible is True
+
+
+def test_reactive_grasp():
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=0.3, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+    tsp_reactive = base_grasp.ReactiveGraspConstruct(60, tsp_grasp_factory, alphas=[0.0, 0.3, 0.6, 1.0], block=5, prune_after=5, prune_gap=0.0, debug=False)
+    tsp_reactive.rng = random.Random(3)
+    task = tsp_reactive.solve()
+
+    assert task.is_feasible is True
+    assert sum(tsp_reactive.uses) == 60
+    assert sum(tsp_reactive.probabilities) == pytest.approx(1.0)
+    # Alphas that never find the best tour are pruned after 5 starts, and most starts use the one that does
+    assert tsp_reactive.active == [True, True, False, True]
+    assert tsp_reactive.probabilities[2] == 0.0
+    assert tsp_reactive.uses[2] == 5
+    assert max(tsp_reactive.uses) == tsp_reactive.uses[1]
+
+    again = base_grasp.ReactiveGraspConstruct(60, tsp_grasp_factory, alphas=[0.0, 0.3, 0.6, 1.0], block=5, prune_after=5, prune_gap=0.0, debug=False)
+    again.rng = random.Random(3)
+    assert again.solve().solution.cities == task.solution.cities
+    assert again.uses == tsp_reactive.uses
+
+
+def test_reactive_grasp_relinked_best():
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=0.3, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+    tsp_reactive = base_grasp.ReactiveGraspConstruct(60, tsp_grasp_factory, alphas=[0.0, 0.3, 0.6, 1.0], block=5, prune_after=5, prune_gap=0.0, debug=False)
+    # Every alpha has been used enough, and relinking found a solution better than all of theirs
+    tsp_reactive.uses = [5] * 4
+    tsp_reactive._feasible = [5] * 4
+    tsp_reactive._total = [150, 100, 125, 175]
+    tsp_reactive._best = [30, 20, 25, 35]
+    relinked = tsp_solution_factory()
+    relinked.objective = 10
+    tsp_reactive.best_sol = {'feasible': True, 'solution': relinked}
+    tsp_reactive._update_probabilities()
+
+    assert tsp_reactive.active == [False, True, False, False]
+    assert tsp_reactive.probabilities == [0.0, 1.0, 0.0, 0.0]
+
+
+def test_reactive_grasp_checkpoint(tmp_path):
+    path = str(tmp_path / 'reactive.ckpt')
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=0.3, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+
+    def make_reactive(checkpoint=None):
+        tsp_reactive = base_grasp.ReactiveGraspConstruct(40, tsp_grasp_factory, block=5, prune_after=5, debug=False)
+        tsp_reactive.rng = random.Random(5)
+        tsp_reactive.checkpoint = checkpoint
+        return tsp_reactive
+
+    uninterrupted = make_reactive()
+    uninterrupted_task = uninterrupted.solve()
+    with pytest.raises(Killed):
+        make_reactive(KillingCheckpointer(path, iterations=7, saves=2)).solve()
+    resumed = make_reactive(Checkpointer(path, interval=None, iterations=7))
+    resumed_task = resumed.solve()
+
+    assert resumed_task.solution.cities == uninterrupted_task.solution.cities
+    assert resumed.uses == uninterrupted.uses
+    assert resumed.probabilities == uninterrupted.probabilities
@@ -0,0 +1,131 @@
+from .definition import *
+from .instances import example_cities, example_initial_city
+import or_testbed.entities.neighborhood as neighborhood
+import copy
+import importlib.util
+import json
+import os
+import random
+import pytest
+
+tsp_instance = TSPInstance('tsp_example', example_cities, example_initial_city)
+
+
+def make_solution(cities):
+    solution = TSPSolution(initial_city=tsp_instance.initial_city)
+    solution.cities = list(cities)
+    solution.update_objective(tsp_instance)
+    return solution
+
+
+def test_swap_delta():
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    for candidate in SwapCitiesMove.make_neighborhood(solution, tsp_instance):
+        neighbor = SwapCitiesMove.apply_and_update(candidate, copy.deepcopy(solution), tsp_instance)
+        assert neighbor.objective == neighbor.calculate_objective(tsp_instance)
+        assert candidate.fitness(solution, tsp_instance) == solution.objective - neighbor.objective
+
+
+def test_solution_json():
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    assert json.loads(solution.to_json()) == {'objective': solution.objective, 'initial_city': 'A', 'cities': ['A', 'C', 'B', 'E', 'D']}
+
+
+def test_grasp_delta():
+    solution = TSPSolution(initial_city=tsp_instance.initial_city)
+    while len(solution.cities) < len(example_cities):
+        candidate = TSPGraspMove.make_neighborhood(solution, tsp_instance)[0]
+        solution = TSPGraspMove.apply_and_update(candidate, solution, tsp_instance)
+        assert solution.objective == solution.calculate_objective(tsp_instance)
+
+
+def test_lazy_neighborhood_selection():
+    random.seed(12345)
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    built = []
+
+    def lazy_neighborhood():
+        for candidate in SwapCitiesMove.make_neighborhood(solution, tsp_instance):
+            built.append(candidate)
+            yield candidate
+
+    cost, candidate = neighborhood.strategy_factory('first').select(lazy_neighborhood(), solution, tsp_instance)
+    assert cost > 0
+    assert candidate == built[-1]
+    assert len(built) < len(list(SwapCitiesMove.make_neighborhood(solution, tsp_instance)))
+
+    built.clear()
+    best = neighborhood.strategy_factory('best').select(lazy_neighborhood(), solution, tsp_instance)
+    bounded = neighborhood.BoundedScan(max_candidates=2).select(lazy_neighborhood(), solution, tsp_instance)
+    assert len(built) == 6 + 2
+    assert bounded[0] <= best[0]
+
+    assert neighborhood.strategy_factory('random').select(lazy_neighborhood(), solution, tsp_instance) is not None
+
+
+def test_sample_candidate():
+    rng = random.Random(12345)
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    swaps = list(SwapCitiesMove.make_neighborhood(solution, tsp_instance))
+    for _ in range(20):
+        candidate = SwapCitiesMove.sample_candidate(solution, tsp_instance, rng)
+        assert candidate in swaps or SwapCitiesCandidate(candidate.city2, candidate.city1) in swaps
+
+    partial = TSPSolution(initial_city=tsp_instance.initial_city)
+    candidate = TSPGraspMove.sample_candidate(partial, tsp_instance, rng)
+    assert candidate in TSPGraspMove.make_neighborhood(partial, tsp_instance)
+
+
+class ListedSwapCitiesMove(SwapCitiesMove):
+    """
+        Same move without batch evaluation, so strategies evaluate candidates one by one.
+    """
+    @staticmethod
+    def batch_fitness(solution, instance):
+        return None
+
+
+def test_batch_selection():
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    for strategy in ('first', 'best', 'bounded'):
+        selection = neighborhood.strategy_factory(strategy)
+        batch_cost, batch_candidate = neighborhood.select_from_move(selection, SwapCitiesMove, solution, tsp_instance)
+        cost, candidate = neighborhood.select_from_move(selection, ListedSwapCitiesMove, solution, tsp_instance)
+        assert batch_cost == cost
+        assert batch_candidate == candidate
+
+
+def test_numpy_batch_selection():
+    numpy = pytest.importorskip('numpy')
+
+    class ArraySwapCitiesMove(SwapCitiesMove):
+        @staticmethod
+        def batch_fitness(solution, instance):
+            return numpy.array(SwapCitiesMove.batch_fitness(solution, instance))
+
+    solution = make_solution(['A', 'C', 'B', 'E', 'D'])
+    for strategy in ('first', 'best'):
+        selection = neighborhood.strategy_factory(strategy)
+        batch_cost, batch_candidate = neighborhood.select_from_move(selection, ArraySwapCitiesMove, solution, tsp_instance)
+        cost, candidate = neighborhood.select_from_move(selection, ListedSwapCitiesMove, solution, tsp_instance)
+        assert batch_cost == cost
+        assert batch_candidate == candidate
+
+
+def test_example_numpy_batch_fitness():
+    pytest.importorskip('numpy')
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'examples', 'tsp', 'definition.py')
+    spec = importlib.util.spec_from_file_location('example_tsp_definition', path)
+    example = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(example)
+
+    rng = random.Random(12345)
+    cities = ['c{}'.format(i) for i in range(12)]
+    instance = example.TSPInstance('random', {a: {b: rng.randint(1, 50) for b in cities if b != a} for a in cities}, cities[0])
+    solution = example.TSPSolution(initial_city=cities[0])
+    solution.cities = [cities[0]] + rng.sample(cities[1:], len(cities) - 1)
+
+    fitness = [c.fitness(solution, instance) for c in example.SwapCitiesMove.make_neighborhood(solution, instance)]
+    assert list(example.SwapCitiesMove.batch_fitness(solution, instance)) == fitness
+    # Arrays are built once per instance
+    assert instance.swap_arrays() is instance.swap_arrays()
@@ -0,0 +1,61 @@
+from .definition import *
+from .instances import example_cities, example_initial_city
+import or_testbed.solvers.grasp as base_grasp
+from or_testbed.solvers.pathrelinking import PathRelinking
+from or_testbed.utils.stats import Stats
+import pytest
+import random
+
+tsp_instance = TSPInstance('tsp_example', example_cities, example_initial_city)
+tsp_solution_factory = TSPSolution.as_factory(initial_city=tsp_instance.initial_city)
+
+
+def make_solution(cities):
+    solution = tsp_solution_factory()
+    solution.cities = cities
+    solution.update_objective(tsp_instance)
+    return solution
+
+
+def test_relink():
+    initiating = make_solution(['A', 'B', 'C', 'D', 'E'])
+    guiding = make_solution(['A', 'E', 'D', 'C', 'B'])
+    relinking = PathRelinking(tsp_instance, SwapCitiesMove)
+    stats = Stats()
+    result = relinking.relink(initiating, guiding, stats)
+
+    # Intermediate solutions are evaluated incrementally, and neither end of the path is returned
+    assert result.objective == result.calculate_objective(tsp_instance)
+    assert result.fingerprint() not in (initiating.fingerprint(), guiding.fingerprint())
+    assert result.is_feasible(tsp_instance)
+    assert initiating.cities == ['A', 'B', 'C', 'D', 'E']
+    assert 0 < stats.counters['relink_steps'] <= initiating.distance_to(guiding)
+    assert stats.counters['relinks'] == 1
+
+    # Neighbors have nothing in between
+    assert relinking.relink(initiating, make_solution(['A', 'C', 'B', 'D', 'E'])) is None
+
+    with pytest.raises(ValueError):
+        PathRelinking(tsp_instance, TSPGraspMove)
+    assert TSPGraspMove.relink_neighborhood(initiating, guiding, tsp_instance) == []
+
+
+def test_grasp_multistart_relinking():
+    tsp_grasp_factory = base_grasp.GraspConstruct.as_factory(instance=tsp_instance, alpha=1.0, solution_factory=tsp_solution_factory, grasp_move=TSPGraspMove, debug=False)
+    tasks = []
+    for workers in (1, 2):
+        tsp_multistart = base_grasp.MultiStartGraspConstruct(iters=6, inner_grasp_factory=tsp_grasp_factory, debug=False)
+        tsp_multistart.rng = random.Random(4)
+        tsp_multistart.workers = workers
+        tsp_multistart.instrument = True
+        tsp_multistart.relinking = PathRelinking(tsp_instance, SwapCitiesMove, pool_size=3)
+        tasks.append(tsp_multistart.solve())
+
+        assert 0 < len(tsp_multistart.elite) <= 3
+        assert tasks[-1].stats.counters['relinks'] > 0
+
+    plain = base_grasp.MultiStartGraspConstruct(iters=6, inner_grasp_factory=tsp_grasp_factory, debug=False)
+    plain.rng = random.Random(4)
+    plain_task = plain.solve()
+    assert tasks[0].solution.objective <= plain_task.solution.objective
+    assert tasks[0].solution.objective == tasks[1].solution.objective
@@ -0,0 +1,108 @@
+from .definition import *
+from .instances import example_cities, example_initial_city
+import or_testbed.solvers.grasp as base_grasp
+import or_testbed.solvers.simanneal as base_simanneal
+from or_testbed.service import ExecutionService, ResultCache
+from or_testbed.service import client
+import asyncio
+import json
+import os
+import time
+
+
+def example_instance():
+    return TSPInstance('tsp_example', example_cities, example_initial_city)
+
+
+def build_simanneal(instance, seed, max_temp=10):
+    initial_sol = base_grasp.GraspConstruct(instance, alpha=0.0, solution_factory=TSPSolution.as_factory(initial_city=instance.initial_city),
+                                            grasp_move=TSPGraspMove, debug=False, rng=seed).solve().solution
+    return base_simanneal.SimAnneal(instance, initial_sol, [SwapCitiesMove], [1], max_temp, 0.1, 0.9, debug=False, instrument=True, rng=seed)
+
+
+def build_crash(instance, seed):
+    os._exit(1)
+
+
+def build_slow(instance, seed):
+    time.sleep(0.5)
+    return build_simanneal(instance, seed)
+
+
+job = {'builder': 'test.tsp.test_service:build_simanneal', 'instance': {'loader': 'test.tsp.test_service:example_instance'}, 'seed': 3}
+builders = ['test.tsp.test_service:build_simanneal', 'test.tsp.test_service:build_crash', 'test.tsp.test_service:build_slow']
+loaders = ['test.tsp.test_service:example_instance']
+
+
+def test_execution_service(tmp_path):
+    expected = build_simanneal(example_instance(), 3).solve()
+    path = str(tmp_path / 'service.sock')
+
+    async def run():
+        service = ExecutionService(workers=1, cache=ResultCache(path=str(tmp_path)), builders=builders, loaders=loaders, debug=False)
+        await service.start()
+        server = await service.listen(path)
+        try:
+            events = [event async for event in client.submit(job, path=path)]
+            assert [event['event'] for event in events[:3]] == ['accepted', 'queued', 'running']
+            assert events[-1]['event'] == 'result' and not events[-1]['cached']
+            progress = [event['objective'] for event in events if event['event'] == 'progress']
+            assert progress == sorted(progress, reverse=True)
+
+            # Same job, from the cache
+            cached = [event async for event in client.submit(job, path=path)]
+            assert [event['event'] for event in cached] == ['accepted', 'result'] and cached[-1]['cached']
+            assert cached[-1]['solution'] == events[-1]['solution']
+
+            # Identical jobs submitted together run once. A crashed worker fails the jobs running on the pool, which is started again
+            crash = service.submit(dict(job, builder='test.tsp.test_service:build_crash'))
+            first, second = service.submit(dict(job, seed=4)), service.submit(dict(job, seed=4))
+            assert first is second
+            assert (await service.result(crash.id))['event'] == 'failed'
+            assert (await service.result(first.id))['event'] == 'result'
+
+            [status] = [event async for event in client.request({'op': 'status'}, path=path)]
+            assert status['jobs'] == {'queued': 0, 'running': 0, 'done': 3, 'failed': 1}
+            [error] = [event async for event in client.request({'op': 'result', 'id': 'missing'}, path=path)]
+            assert error['event'] == 'error'
+
+            # Only registered builders and loaders can be used
+            for spec in (dict(job, builder='os:system'), dict(job, instance={'loader': 'os:system', 'args': ['true']})):
+                [error] = [event async for event in client.submit(spec, path=path)]
+                assert error['event'] == 'error' and 'not registered' in error['message']
+
+            # Malformed jobs and requests get an error
+            for spec in (dict(job, instance={'args': 5}), dict(job, instance={'kwargs': [1]}), dict(job, params=[1])):
+                [error] = [event async for event in client.submit(spec, path=path)]
+                assert error['event'] == 'error' and error['message'].startswith('ValueError')
+            [error] = [event async for event in client.request({'op': 'result', 'id': [1]}, path=path)]
+            assert error['event'] == 'error'
+
+            # Lines that are not JSON requests close the connection
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'POST / HTTP/1.1\r\n' + json.dumps({'op': 'status'}).encode('utf-8') + b'\n')
+            assert await reader.read() == b''
+            writer.close()
+            return events[-1]
+        finally:
+            server.close()
+            await server.wait_closed()
+            await service.close()
+
+    result = asyncio.run(run())
+    assert result['objective'] == expected.solution.objective
+    assert result['solution']['cities'] == expected.solution.cities
+
+
+def test_execution_service_close():
+    async def run():
+        service = ExecutionService(workers=1, builders=builders, loaders=loaders, debug=False)
+        await service.start()
+        running = service.submit(dict(job, builder='test.tsp.test_service:build_slow'))
+        queued = service.submit(dict(job, seed=4))
+        await asyncio.sleep(0.1)
+        await service.close()
+        return [await asyncio.wait_for(service.result(j.id), 1) for j in (running, queued)]
+
+    for event in asyncio.run(run()):
+        assert event['event'] == 'failed' and event['error'] == 'service shutting down'
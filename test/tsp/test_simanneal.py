@@ -2,7 +2,15 @@ from .definition import *
 from .instances import example_cities, example_initial_city
 import or_testbed.solvers.simanneal as base_simanneal
 import or_testbed.solvers.grasp as base_grasp
+from or_testbed.solvers.base.stopping import StoppingCriteria
+from or_testbed.utils.checkpoint import Checkpointer
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import multiprocessing
+import multiprocessing.connection
 import random
+import threading
+import time
 import pytest
 
 tsp_instance = TSPInstance('tsp_example', example_cities, example_initial_city)
@@ -20,6 +28,38 @@ def compute_grasp_solution():
     return task.solution
 
 
+class GatedSwapCitiesMove(SwapCitiesMove):
+    """
+        Swap move that waits for the gate of the instance, so runs can be held in the middle of a step.
+    """
+
+    @staticmethod
+    def sample_candidate(solution, instance, rng):
+        instance.gate.wait()
+        return SwapCitiesMove.sample_candidate(solution, instance, rng)
+
+
+def gated_instance(manager):
+    instance = TSPInstance('tsp_example', example_cities, example_initial_city)
+    instance.gate = manager.Event()
+    return instance
+
+
+class GatedSimAnneal:
+    """
+        Factory of simulated annealing starts that wait for a gate before running, recording every start.
+    """
+
+    def __init__(self, gate, started):
+        self.gate = gate
+        self.started = started
+
+    def __call__(self):
+        self.started.append(None)
+        self.gate.wait()
+        return base_simanneal.SimAnneal(tsp_instance, compute_grasp_solution(), [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False)
+
+
 def test_simanneal():
     initial_sol = compute_grasp_solution()
 
@@ -40,3 +80,267 @@ def test_multistart_simanneal():
     task = ms_simanneal.solve()
     assert task.is_feasible is True
     assert task.solution.objective == 17
+
+
+def test_instrumented_simanneal():
+    initial_sol = compute_grasp_solution()
+
+    tsp_moves = [SwapCitiesMove]
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(instance=tsp_instance, initial_solution=initial_sol, available_movs=tsp_moves, movs_weight=[1], max_temp=10, min_temp=1, alpha=0.9, debug=False, instrument=True)
+
+    task = simanneal_factory().solve()
+    counters = task.stats.counters
+    assert counters['iterations'] == 22
+    assert counters['fitness_evaluations'] == counters['iterations']
+    assert counters['moves_applied'] == counters['moves_accepted']
+    assert task.stats.timings['solve'] == task.time
+
+    ms_simanneal = base_simanneal.MultiStartSimAnneal(10, simanneal_factory, debug=False)
+    ms_simanneal.instrument = True
+    ms_task = ms_simanneal.solve()
+    assert ms_task.stats.counters['starts'] == 10
+    assert ms_task.stats.counters['iterations'] == 10 * 22
+    assert 'multistart' in ms_task.stats.timings
+
+
+def test_not_instrumented_simanneal():
+    initial_sol = compute_grasp_solution()
+    tsp_simanneal = base_simanneal.SimAnneal(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.1, 0.9, debug=False)
+    assert tsp_simanneal.solve().stats is None
+
+
+def test_simanneal_debug_log(capsys):
+    initial_sol = compute_grasp_solution()
+    tsp_simanneal = base_simanneal.SimAnneal(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.1, 0.9, debug=False)
+    # Logger changes made after building the solver are honoured
+    tsp_simanneal.logger.debug = True
+    capsys.readouterr()
+    tsp_simanneal.solve()
+    assert 'Move accepted' in capsys.readouterr().out
+
+
+def test_simanneal_checkpoint(tmp_path):
+    initial_sol = compute_grasp_solution()
+    path = str(tmp_path / 'simanneal.ckpt')
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False, instrument=True)
+
+    random.seed(1)
+    uninterrupted = simanneal_factory().solve()
+
+    random.seed(1)
+    with pytest.raises(Killed):
+        simanneal_factory(checkpoint=KillingCheckpointer(path, iterations=40, saves=2)).solve()
+    random.seed(2)
+    resumed = simanneal_factory(checkpoint=Checkpointer(path, interval=None, iterations=40)).solve()
+
+    assert resumed.solution.cities == uninterrupted.solution.cities
+    assert resumed.stats.counters == uninterrupted.stats.counters
+    assert not (tmp_path / 'simanneal.ckpt').exists()
+
+
+def test_simanneal_rng():
+    initial_sol = compute_grasp_solution()
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False, instrument=True)
+
+    state = random.getstate()
+    first = simanneal_factory(rng=7).solve()
+    assert random.getstate() == state
+    random.seed(1)
+    second = simanneal_factory(rng=random.Random(7)).solve()
+    assert first.solution.cities == second.solution.cities
+    assert first.stats.counters == second.stats.counters
+
+
+def test_multistart_simanneal_rng():
+    initial_sol = compute_grasp_solution()
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False)
+
+    serial = base_simanneal.MultiStartSimAnneal(6, simanneal_factory, debug=False)
+    serial.rng = random.Random(3)
+    state = random.getstate()
+    serial_task = serial.solve()
+    # Seeded starts leave the random module alone
+    assert random.getstate() == state
+    parallel = base_simanneal.MultiStartSimAnneal(6, simanneal_factory, debug=False)
+    parallel.rng = random.Random(3)
+    parallel.workers = 2
+    parallel_task = parallel.solve()
+    assert serial.start_seeds == parallel.start_seeds
+    assert serial_task.solution.cities == parallel_task.solution.cities
+
+    # Every start can be replayed alone
+    replays = [simanneal_factory(rng=seed).solve().solution for seed in serial.start_seeds]
+    assert min(solution.objective for solution in replays) == serial_task.solution.objective
+
+
+def test_parallel_tempering():
+    initial_sol = compute_grasp_solution()
+    temperatures = base_simanneal.ParallelTempering.geometric_temperatures(10, 0.1, 4)
+    assert temperatures[0] == pytest.approx(0.1) and temperatures[-1] == pytest.approx(10)
+
+    tasks = []
+    for workers in (1, 2):
+        tsp_tempering = base_simanneal.ParallelTempering(tsp_instance, initial_sol, [SwapCitiesMove], [1], temperatures, rounds=20, steps=5, workers=workers, debug=False,
+                                                         instrument=True, rng=3)
+        tasks.append(tsp_tempering.solve())
+
+    assert tasks[0].is_feasible is True
+    assert tasks[0].solution.objective == 17
+    assert tasks[0].solution.cities == tasks[1].solution.cities
+    assert tasks[0].stats.counters == tasks[1].stats.counters
+    assert tasks[0].stats.counters['iterations'] == 4 * 20 * 5
+    # Two pairs of temperatures in even rounds, one in odd rounds
+    assert tasks[0].stats.counters['exchange_attempts'] == 30
+    assert initial_sol.objective == 34
+
+    stopping = StoppingCriteria(stagnation=3)
+    tsp_tempering = base_simanneal.ParallelTempering(tsp_instance, initial_sol, [SwapCitiesMove], [1], temperatures, rounds=1000, steps=5, debug=False, stopping=stopping)
+    task = tsp_tempering.solve()
+    assert stopping.reason == 'stagnation'
+    assert task.is_feasible is True
+
+
+def test_parallel_tempering_async_cancel():
+    initial_sol = compute_grasp_solution()
+    temperatures = base_simanneal.ParallelTempering.geometric_temperatures(10, 0.1, 4)
+    with multiprocessing.Manager() as manager:
+        instance = gated_instance(manager)
+        tsp_tempering = base_simanneal.ParallelTempering(instance, initial_sol, [GatedSwapCitiesMove], [1], temperatures, rounds=20, steps=5, workers=2, debug=False)
+        others = set(multiprocessing.active_children())
+        # Opens the gate if cancelling blocks, so the test fails instead of hanging
+        timer = threading.Timer(30, instance.gate.set)
+        timer.start()
+
+        async def run():
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0)
+
+            ticking = asyncio.ensure_future(ticker())
+            cancelled = asyncio.ensure_future(tsp_tempering.solve_async(yield_every=1))
+            # Replicas are held at the gate in the first round, which the loop does not wait for
+            await asyncio.sleep(0.1)
+            workers = set(multiprocessing.active_children()) - others
+            seen = len(ticks)
+            await asyncio.sleep(0)
+            assert len(ticks) > seen
+            cancelled.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            ticking.cancel()
+            return workers
+
+        try:
+            workers = asyncio.run(run())
+            assert not instance.gate.is_set()
+            # Workers in the middle of a round are terminated instead of waited for
+            assert len(workers) == 2
+            for worker in workers:
+                assert multiprocessing.connection.wait([worker.sentinel], 10)
+        finally:
+            timer.cancel()
+            instance.gate.set()
+
+
+def test_simanneal_async():
+    initial_sol = compute_grasp_solution()
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False, instrument=True)
+    expected = [simanneal_factory(rng=seed).solve() for seed in (7, 8)]
+
+    async def run():
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(None)
+                await asyncio.sleep(0)
+
+        ticking = asyncio.ensure_future(ticker())
+        # Interleaved runs return the same as they do alone
+        tasks = await asyncio.gather(*(simanneal_factory(rng=seed).solve_async(yield_every=5) for seed in (7, 8)))
+        assert len(ticks) > 10
+        ticking.cancel()
+
+        late = await simanneal_factory(rng=7).solve_async(deadline=time.time())
+        with ThreadPoolExecutor(1) as executor:
+            offloaded = await simanneal_factory(rng=7).solve_async(executor=executor)
+
+        cancelled = asyncio.ensure_future(simanneal_factory(rng=7).solve_async(yield_every=1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return tasks, late, offloaded
+
+    tasks, late, offloaded = asyncio.run(run())
+    for task, alone in zip(tasks, expected):
+        assert task.solution.cities == alone.solution.cities
+        assert task.stats.counters == alone.stats.counters
+    assert late.stats.counters['iterations'] == 1
+    assert offloaded.solution.cities == expected[0].solution.cities
+
+
+def test_multistart_simanneal_async():
+    initial_sol = compute_grasp_solution()
+    simanneal_factory = base_simanneal.SimAnneal.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], 10, 0.01, 0.95, debug=False)
+
+    tasks = []
+    for workers in (1, 2):
+        multistart = base_simanneal.MultiStartSimAnneal(6, simanneal_factory, debug=False)
+        multistart.rng = random.Random(3)
+        multistart.workers = workers
+        tasks.append(asyncio.run(multistart.solve_async(yield_every=10)))
+    multistart.workers = 1
+    multistart.rng = random.Random(3)
+    expected = multistart.solve()
+    assert tasks[0].solution.cities == tasks[1].solution.cities == expected.solution.cities
+
+
+def test_multistart_simanneal_async_cancel():
+    with multiprocessing.Manager() as manager:
+        gate, started = manager.Event(), manager.list()
+        multistart = base_simanneal.MultiStartSimAnneal(4, GatedSimAnneal(gate, started), debug=False)
+        multistart.workers = 2
+        others = set(multiprocessing.active_children())
+        # Opens the gate if cancelling blocks, so the test fails instead of hanging
+        timer = threading.Timer(30, gate.set)
+        timer.start()
+
+        async def run():
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(None)
+                    await asyncio.sleep(0)
+
+            ticking = asyncio.ensure_future(ticker())
+            cancelled = asyncio.ensure_future(multistart.solve_async(yield_every=1))
+            # Both workers are held at the gate, while the loop keeps running
+            while len(started) < 2:
+                await asyncio.sleep(0.01)
+            seen = len(ticks)
+            await asyncio.sleep(0)
+            assert len(ticks) > seen
+            cancelled.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            ticking.cancel()
+            return set(multiprocessing.active_children()) - others
+
+        try:
+            workers = asyncio.run(run())
+            # Cancelling does not wait for the starts running in the workers
+            assert not gate.is_set()
+            gate.set()
+            # Workers finish those starts and exit, the starts that were not running are cancelled
+            assert workers
+            for worker in workers:
+                assert multiprocessing.connection.wait([worker.sentinel], 10)
+            assert len(started) == 2
+        finally:
+            timer.cancel()
+            gate.set()
@@ -1,6 +1,9 @@
 from .definition import *
 from .instances import example_cities, example_initial_city
 import or_testbed.solvers.tabusearch as base_tabu
+from or_testbed.solvers.tabusearch.tabulist import TabuList
+from or_testbed.solvers.base.stopping import StoppingCriteria
+from or_testbed.utils.checkpoint import Checkpointer
 import or_testbed.solvers.grasp as base_grasp
 import random
 import pytest
@@ -40,3 +43,118 @@ def test_multistart_tabu():
     task = ms_tabu.solve()
     assert task.is_feasible is True
     assert task.solution.objective == 17
+
+
+def test_tabu_list():
+    length_based = TabuList(maxlen=2)
+    for city1, city2 in [('B', 'C'), ('B', 'C'), ('D', 'E')]:
+        length_based.append(SwapCitiesCandidate(city1, city2))
+    assert SwapCitiesCandidate('B', 'C') in length_based
+    length_based.append(SwapCitiesCandidate('C', 'D'))
+    assert SwapCitiesCandidate('B', 'C') not in length_based
+    assert length_based.index(SwapCitiesCandidate('C', 'D')) == 1
+
+    iteration_based = TabuList(tenure=2)
+    iteration_based.tick(0)
+    iteration_based.append(SwapCitiesCandidate('B', 'C'))
+    for iteration in range(1, 3):
+        iteration_based.tick(iteration)
+        iteration_based.append(SwapCitiesCandidate('D', str(iteration)))
+        assert SwapCitiesCandidate('B', 'C') in iteration_based
+    iteration_based.tick(3)
+    assert SwapCitiesCandidate('B', 'C') not in iteration_based
+    assert len(iteration_based) == 2
+
+    for no_memory in (TabuList(maxlen=0), TabuList(tenure=0)):
+        no_memory.tick(0)
+        no_memory.append(SwapCitiesCandidate('B', 'C'))
+        assert SwapCitiesCandidate('B', 'C') not in no_memory
+        assert len(no_memory) == 0
+
+
+def test_tabu_tenure():
+    initial_sol = compute_grasp_solution()
+
+    tsp_moves = [SwapCitiesMove]
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], iters=10, tabu_tenure=3, candidate_selection='best')
+    task = tsp_tabu.solve()
+    assert task.is_feasible is True
+    assert task.solution.objective == 17
+
+
+def test_instrumented_tabu():
+    initial_sol = compute_grasp_solution()
+
+    tsp_moves = [SwapCitiesMove]
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], tabulen=10, iters=10, candidate_selection='best', debug=False, instrument=True)
+    task = tsp_tabu.solve()
+    # Stats stay out of the tuple
+    solution, feasible, time = task
+    assert solution is task.solution
+    counters = task.stats.counters
+    assert counters['iterations'] == 10
+    assert counters['neighborhoods'] == 10
+    assert counters['fitness_evaluations'] == 10 * 6
+    assert counters['moves_applied'] + counters.get('tabu_hits', 0) == 10
+
+
+def test_tabu_stopping():
+    initial_sol = compute_grasp_solution()
+
+    tsp_moves = [SwapCitiesMove]
+    improvements = []
+    stopping = StoppingCriteria(stagnation=3)
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], iters=1000, candidate_selection='best', debug=False, instrument=True, stopping=stopping,
+                                    on_improvement=lambda solution, elapsed: improvements.append(solution.objective))
+    task = tsp_tabu.solve()
+    assert stopping.reason == 'stagnation'
+    assert task.stats.counters['iterations'] < 1000
+    assert improvements == sorted(improvements, reverse=True)
+    assert improvements[-1] == task.solution.objective
+
+    stopping = StoppingCriteria(max_evaluations=30)
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], iters=1000, candidate_selection='best', debug=False, stopping=stopping)
+    task = tsp_tabu.solve()
+    assert stopping.reason == 'max_evaluations'
+    assert task.stats.counters['fitness_evaluations'] == 30
+
+    stopping = StoppingCriteria(target=initial_sol.objective)
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], iters=1000, debug=False, stopping=stopping)
+    tsp_tabu.solve()
+    assert stopping.reason == 'target'
+
+
+def test_tabu_improvements():
+    initial_sol = compute_grasp_solution()
+
+    tsp_moves = [SwapCitiesMove]
+    tsp_tabu = base_tabu.TabuSearch(tsp_instance, initial_sol, tsp_moves, [1], iters=10, debug=False)
+    improvements = tsp_tabu.improvements()
+    objectives = []
+    with pytest.raises(StopIteration) as stop:
+        while True:
+            solution, elapsed = next(improvements)
+            objectives.append(solution.objective)
+    assert objectives[-1] == stop.value.value.solution.objective == 17
+    assert tsp_tabu.stopping is None and tsp_tabu.on_improvement is None
+
+
+def test_tabu_checkpoint(tmp_path):
+    initial_sol = compute_grasp_solution()
+    path = str(tmp_path / 'tabu.ckpt')
+    tabu_factory = base_tabu.TabuSearch.as_factory(tsp_instance, initial_sol, [SwapCitiesMove], [1], iters=40, tabu_tenure=3, debug=False, instrument=True)
+
+    random.seed(1)
+    uninterrupted = tabu_factory().solve()
+
+    random.seed(1)
+    checkpointer = Checkpointer(path, interval=None, iterations=10)
+    # Stops halfway, leaving the last checkpoint behind as if the process was killed
+    checkpointer.clear = lambda: None
+    stopping = StoppingCriteria(max_evaluations=uninterrupted.stats.counters['fitness_evaluations'] // 2)
+    assert tabu_factory(checkpoint=checkpointer, stopping=stopping).solve().stats.counters['iterations'] > 10
+    random.seed(2)
+    resumed = tabu_factory(checkpoint=Checkpointer(path, interval=None, iterations=10)).solve()
+
+    assert resumed.solution.cities == uninterrupted.solution.cities
+    assert resumed.stats.counters == uninterrupted.stats.counters